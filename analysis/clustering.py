@@ -0,0 +1,75 @@
+# analysis/clustering.py
+"""
+Embedding vektörlerini benzerlik eşiğine göre kümeleyen motor.
+
+Tam n×n kosinüs matrisi kurulmaz:
+- Vektörler birim uzunluğa getirilir; kosinüs benzerliği iç çarpım olur.
+- Satırlar block_size'lık bloklar halinde diğer satırlarla çarpılır ve yalnızca eşiği
+  geçen (i < j) çiftler tutulur. Bellek kullanımı block_size × n ile sınırlıdır.
+- Kümeler, bu seyrek kenar listesi üzerinde union-find ile bağlı bileşenler olarak
+  bulunur. Sonuç girdi sırasından bağımsızdır: her küme kendi içinde artan indeks
+  sırasıyla, kümeler de en küçük indekslerine göre sıralı döner.
+"""
+import numpy as np
+
+import config
+
+
+def normalize_rows(embeddings):
+    """Satırları birim uzunluğa getirilmiş float32 kopya döndürür (sıfır vektörler sıfır kalır)."""
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def neighbor_pairs(embeddings, threshold, block_size=None):
+    """
+    Kosinüs benzerliği threshold'a eşit veya büyük olan (i, j), i < j çiftlerini üretir.
+    Her adımda yalnızca block_size × n boyutunda bir skor bloğu bellekte tutulur.
+    """
+    vectors = normalize_rows(embeddings)
+    block_size = block_size or config.CLUSTER_BLOCK_SIZE
+    n = len(vectors)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        # Bloğun satırları yalnızca kendisinden sonraki satırlarla karşılaştırılır (üst üçgen).
+        scores = vectors[start:stop] @ vectors[start:].T
+        rows, cols = np.nonzero(scores >= threshold)
+        cols += start
+        rows += start
+        upper = rows < cols
+        yield rows[upper], cols[upper]
+
+
+def _find(parent, i):
+    # Yol sıkıştırma: kök bulunurken geçilen düğümler doğrudan köke bağlanır.
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:
+        parent[i], i = root, parent[i]
+    return root
+
+
+def find_clusters(embeddings, threshold, block_size=None):
+    """
+    Vektörleri benzerlik eşiğine göre kümeler ve indeks listelerinin listesini döndürür.
+    Eşiği geçen çiftler aynı kümeye girer; bağlantı geçişlidir (a~b ve b~c ise a, b, c
+    aynı kümededir). Her vektör tam olarak bir kümede yer alır.
+    """
+    n = len(embeddings)
+    parent = list(range(n))
+    for rows, cols in neighbor_pairs(embeddings, threshold, block_size):
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            root_i, root_j = _find(parent, i), _find(parent, j)
+            if root_i != root_j:
+                # Küçük indeksli kök tutulur; sonuç birleştirme sırasından bağımsız olur.
+                if root_i < root_j:
+                    parent[root_j] = root_i
+                else:
+                    parent[root_i] = root_j
+
+    clusters = {}
+    for i in range(n):
+        clusters.setdefault(_find(parent, i), []).append(i)
+    return list(clusters.values())
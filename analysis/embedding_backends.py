@@ -0,0 +1,223 @@
+# analysis/embedding_backends.py
+"""
+Başlık embedding modeli için çalıştırma katmanları (backend).
+
+- "torch": sentence-transformers ile tam PyTorch modeli (varsayılan).
+- "onnx":  Aynı modelin ONNX'e aktarılmış (isteğe bağlı int8 nicemlenmiş) hali;
+           onnxruntime ve tokenizers ile çalışır, torch import edilmez.
+
+Seçim config.EMBEDDING_BACKEND ile yapılır. onnxruntime ve onnx isteğe bağlıdır
+(pip install -r requirements-onnx.txt) ve yalnızca ONNX yolunda import edilir. ONNX
+dosyaları bir kez üretilir:
+
+    python -m analysis.embedding_backends export            # model.onnx + model.int8.onnx
+    python -m analysis.embedding_backends export --no-quantize
+
+Her iki katman da SentenceTransformer'ın kullandığımız arayüzünü sağlar:
+encode(texts, batch_size=..., convert_to_numpy=True, show_progress_bar=False) ve
+get_sentence_embedding_dimension(). model_id, vektörleri üreten modeli ve katmanı
+tanımlar; embedding deposu farklı katmanların vektörlerini bu sayede karıştırmaz.
+"""
+import json
+import os
+
+import numpy as np
+
+import config
+
+METADATA_FILE_NAME = "embedding_backend.json"
+
+
+class TorchBackend:
+    """sentence-transformers modelini doğrudan kullanan katman."""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.model_id = model_name
+
+    def get_sentence_embedding_dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False):
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=convert_to_numpy, show_progress_bar=show_progress_bar)
+
+
+class OnnxBackend:
+    """
+    export_onnx() ile üretilmiş ONNX modelini onnxruntime ile çalıştıran katman.
+    Havuzlama (attention mask ile ortalama) sentence-transformers'daki gibi numpy ile yapılır.
+    """
+
+    def __init__(self, model_dir, quantized=True):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, METADATA_FILE_NAME), encoding="utf-8") as f:
+            self.metadata = json.load(f)
+        file_name = "model.int8.onnx" if quantized else "model.onnx"
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if config.EMBEDDING_ONNX_THREADS:
+            options.intra_op_num_threads = config.EMBEDDING_ONNX_THREADS
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, file_name), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.metadata["max_seq_length"])
+        self.tokenizer.no_padding()
+        self.pad_id = self.metadata["pad_token_id"]
+        self.model_id = f"{self.metadata['model_name']}+onnx{'-int8' if quantized else ''}"
+
+    def get_sentence_embedding_dimension(self):
+        return self.metadata["dim"]
+
+    def _encode_batch(self, encodings):
+        length = max(len(encoding.ids) for encoding in encodings)
+        input_ids = np.full((len(encodings), length), self.pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), length), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, :len(encoding.ids)] = encoding.ids
+            attention_mask[row, :len(encoding.ids)] = 1
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        mask = attention_mask[:, :, np.newaxis].astype(np.float32)
+        return (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False):
+        encodings = self.tokenizer.encode_batch(list(texts))
+        # Benzer uzunluktaki metinler aynı gruba girsin diye uzunluğa göre sıralanır (daha az dolgu).
+        order = sorted(range(len(encodings)), key=lambda i: len(encodings[i].ids))
+        embeddings = np.empty((len(encodings), self.metadata["dim"]), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            embeddings[batch] = self._encode_batch([encodings[i] for i in batch])
+        return embeddings
+
+
+def load_embedding_model(model_name=None, backend=None):
+    """
+    config.EMBEDDING_BACKEND'e göre embedding modelini yükler. ONNX dosyaları bulunamazsa
+    uyarı verip torch katmanına döner.
+    """
+    model_name = model_name or config.EMBEDDING_MODEL_NAME
+    backend = backend or config.EMBEDDING_BACKEND
+    if backend in ("onnx", "onnx-int8"):
+        model_dir = str(config.EMBEDDING_ONNX_DIR)
+        try:
+            model = OnnxBackend(model_dir, quantized=backend == "onnx-int8")
+        except Exception as e:
+            print(f"⚠️ ONNX embedding modeli yüklenemedi ({e}). 'python -m analysis.embedding_backends export' "
+                  f"ile üretilebilir; torch katmanı kullanılıyor.")
+        else:
+            if model.metadata["model_name"] == model_name:
+                print(f"✅ Embedding modeli ONNX ile yüklendi: {model.model_id}")
+                return model
+            print(f"⚠️ {model_dir} içindeki ONNX modeli {model.metadata['model_name']} için üretilmiş; torch katmanı kullanılıyor.")
+    elif backend != "torch":
+        print(f"⚠️ Bilinmeyen embedding katmanı: {backend}. torch kullanılıyor.")
+    return TorchBackend(model_name)
+
+
+def _write_metadata(target_dir, metadata):
+    path = os.path.join(target_dir, METADATA_FILE_NAME)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=4)
+    os.replace(f"{path}.tmp", path)
+
+
+def export_onnx(model_name=None, target_dir=None, quantize=True, opset=17):
+    """
+    sentence-transformers modelinin transformer gövdesini ONNX'e aktarır ve tokenizer'ı
+    yanına kaydeder. quantize=True ise ağırlıkları int8 olan model.int8.onnx da üretilir.
+    torch, sentence-transformers, onnxruntime ve onnx gerektirir (yalnızca bu adımda).
+
+    Meta veri dosyası yalnızca tamamlanan adımları yansıtır: önceki bir aktarımın meta
+    verisi ve int8 modeli baştan silinir; int8 adımı başarısız olursa yarım dosya kalmaz
+    ve "onnx" katmanı kullanılabilir durumda kalır.
+    """
+    import inspect
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model_name = model_name or config.EMBEDDING_MODEL_NAME
+    target_dir = str(target_dir or config.EMBEDDING_ONNX_DIR)
+    os.makedirs(target_dir, exist_ok=True)
+    quantized_path = os.path.join(target_dir, "model.int8.onnx")
+    for stale_path in (os.path.join(target_dir, METADATA_FILE_NAME), quantized_path):
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    tokenizer.save_pretrained(target_dir)
+
+    sample = tokenizer(["Örnek başlık", "İkinci örnek haber başlığı"], padding=True, return_tensors="pt")
+    input_names = ["input_ids", "attention_mask"]
+    if "token_type_ids" in sample:
+        input_names.append("token_type_ids")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    # Yeni torch sürümlerinde varsayılan dinamo aktarıcısı onnxscript ister; TorchScript
+    # tabanlı aktarıcı sabitlenir (eski sürümlerde bu parametre yoktur).
+    export_options = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    model_path = os.path.join(target_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            **export_options,
+        )
+    print(f"💾 ONNX modeli kaydedildi: {model_path}")
+
+    metadata = {
+        "model_name": model_name,
+        "dim": st_model.get_sentence_embedding_dimension(),
+        "max_seq_length": st_model.max_seq_length,
+        "pad_token_id": tokenizer.pad_token_id,
+        "quantized": False,
+    }
+    _write_metadata(target_dir, metadata)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        tmp_path = f"{quantized_path}.tmp"
+        try:
+            quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QInt8)
+            os.replace(tmp_path, quantized_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        metadata["quantized"] = True
+        _write_metadata(target_dir, metadata)
+        print(f"💾 int8 nicemlenmiş model kaydedildi: {quantized_path}")
+    return target_dir
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Embedding modelini ONNX'e aktarır (ve int8'e nicemler).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="ONNX (ve int8) model dosyalarını üret")
+    export_parser.add_argument("--model", default=None, help="Varsayılan: config.EMBEDDING_MODEL_NAME")
+    export_parser.add_argument("--target-dir", default=None, help="Varsayılan: config.EMBEDDING_ONNX_DIR")
+    export_parser.add_argument("--no-quantize", action="store_true", help="int8 nicemlenmiş modeli üretme")
+    args = parser.parse_args()
+    export_onnx(args.model, args.target_dir, quantize=not args.no_quantize)
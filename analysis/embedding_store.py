@@ -0,0 +1,193 @@
+# analysis/embedding_store.py
+"""
+Haber başlıklarının embedding vektörlerini çalışmalar arasında saklayan depo.
+
+Başlıklar büyük ölçüde bir önceki çalışmada da görüldüğü için her başlık bir kez
+kodlanır; sonraki çalışmalarda vektörü diskten okunur.
+
+- Anahtar, model adı + normalize edilmiş başlığın SHA-1 özetidir (içerik adresli).
+- Her model için ayrı bir klasörde iki dosya tutulur:
+    vectors.f32: satır satır float32 vektörler (np.memmap ile okunur)
+    keys.bin:    her satırın 20 baytlık anahtarı, vektörlerle aynı sırada
+  Yeni satırlar iki dosyanın sonuna eklenir. Geçerli satır sayısı, iki dosyadaki tam
+  satır sayısının küçüğüdür; yarıda kalan bir yazmanın artıkları (fazladan vektörler
+  veya 20 bayta tamamlanmamış anahtar) bir sonraki eklemeden önce iki dosyadan da kesilir.
+- Satır sayısı config.EMBEDDING_STORE_MAX_ROWS'u aşarsa, o an istenen başlıklar ve en
+  yeni satırlar tutularak dosyalar yeniden yazılır.
+
+Dosyalar cache_manager.CACHE_DIR altındadır; aynı modelin deposuna yazan süreçler
+cache_manager.key_lock ile sıraya girer.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import unicodedata
+
+import numpy as np
+
+import config
+from cache_manager import CACHE_DIR, key_lock
+
+EMBEDDING_DIR = os.path.join(CACHE_DIR, "embeddings")
+_KEY_SIZE = 20  # SHA-1
+_DTYPE = np.float32
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_title(title):
+    """Başlığı Unicode (NFKC) ve boşluk bakımından normalize eder; kodlanan metin de budur."""
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFKC", title or "")).strip()
+
+
+def title_key(model_name, title):
+    """Model adı ve normalize edilmiş başlıktan 20 baytlık anahtarı üretir."""
+    return hashlib.sha1(f"{model_name}\0{normalize_title(title)}".encode("utf-8")).digest()
+
+
+class EmbeddingStore:
+    """Bir modelin başlık vektörlerini tutan, sonuna eklenebilen memmap deposu."""
+
+    def __init__(self, model_name, dim, directory=None, max_rows=None):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_rows = max_rows or config.EMBEDDING_STORE_MAX_ROWS
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = directory or os.path.join(EMBEDDING_DIR, f"{slug}-{dim}")
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.keys_path = os.path.join(self.directory, "keys.bin")
+        self._lock_name = f"embeddings:{slug}-{dim}"
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Anahtar indeksini ve vektör dosyasının memmap görünümünü (yeniden) açar."""
+        try:
+            with open(self.keys_path, "rb") as f:
+                raw_keys = f.read()
+        except FileNotFoundError:
+            raw_keys = b""
+        row_bytes = self.dim * np.dtype(_DTYPE).itemsize
+        vector_rows = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        count = min(len(raw_keys) // _KEY_SIZE, vector_rows)
+
+        self.index = {raw_keys[i * _KEY_SIZE:(i + 1) * _KEY_SIZE]: i for i in range(count)}
+        self.count = count
+        if count:
+            self.vectors = np.memmap(self.vectors_path, dtype=_DTYPE, mode="r", shape=(count, self.dim))
+        else:
+            self.vectors = np.empty((0, self.dim), dtype=_DTYPE)
+
+    def lookup(self, keys):
+        """Her anahtarın satır numarasını döndürür; depoda olmayanlar için -1."""
+        return np.fromiter((self.index.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+
+    def append(self, keys, vectors):
+        """Yeni (anahtar, vektör) çiftlerini deponun sonuna ekler ve indeksi günceller."""
+        vectors = np.ascontiguousarray(vectors, dtype=_DTYPE)
+        with key_lock(self._lock_name):
+            # Kilit beklenirken başka bir süreç satır eklemiş olabilir.
+            self._load()
+            fresh, seen = [], set(self.index)
+            for i, key in enumerate(keys):
+                if key not in seen:
+                    fresh.append(i)
+                    seen.add(key)
+            if fresh:
+                self._truncate_partial_rows()
+                with open(self.vectors_path, "ab") as f:
+                    f.write(vectors[fresh].tobytes())
+                with open(self.keys_path, "ab") as f:
+                    f.write(b"".join(keys[i] for i in fresh))
+            self._load()
+
+    def _truncate_partial_rows(self):
+        # Yarıda kalmış bir yazmadan artakalan vektör ve anahtar baytları, yeni satırların
+        # kaymaması için iki dosyadan da atılır.
+        row_bytes = self.dim * np.dtype(_DTYPE).itemsize
+        for path, size in ((self.vectors_path, self.count * row_bytes), (self.keys_path, self.count * _KEY_SIZE)):
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                os.truncate(path, size)
+
+    def compact(self, keep_keys=()):
+        """
+        Satır sayısı max_rows'u aşıyorsa keep_keys'teki ve en yeni satırları tutarak
+        dosyaları yeniden yazar.
+        """
+        if self.count <= self.max_rows:
+            return
+        with key_lock(self._lock_name):
+            self._load()
+            if self.count <= self.max_rows:
+                return
+            keep = {self.index[key] for key in keep_keys if key in self.index}
+            for row in range(self.count - 1, -1, -1):
+                if len(keep) >= self.max_rows:
+                    break
+                keep.add(row)
+            rows = np.array(sorted(keep), dtype=np.int64)
+            keys_by_row = {row: key for key, row in self.index.items()}
+
+            for path, payload in (
+                (self.vectors_path, np.asarray(self.vectors[rows]).tobytes()),
+                (self.keys_path, b"".join(keys_by_row[row] for row in rows)),
+            ):
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            removed = self.count - len(rows)
+            self._load()
+            print(f"🧹 Embedding deposu küçültüldü: {removed} satır silindi, {self.count} satır kaldı.")
+
+
+def encode_titles(model, model_name, titles, store=None, batch_size=None):
+    """
+    Başlıkların vektörlerini (len(titles), dim) float32 matrisi olarak döndürür.
+    Yalnızca depoda olmayan başlıklar modelle (batch_size'lık gruplar halinde) kodlanır.
+    """
+    if store is None:
+        store = EmbeddingStore(model_name, model.get_sentence_embedding_dimension())
+    keys = [title_key(model_name, title) for title in titles]
+    rows = store.lookup(keys)
+
+    missing = np.flatnonzero(rows < 0)
+    if missing.size:
+        # Aynı başlık listede birden çok kez geçiyorsa bir kez kodlanır.
+        unique_positions = {}
+        for position in missing:
+            unique_positions.setdefault(keys[position], position)
+        positions = list(unique_positions.values())
+        print(f"🧮 {len(positions)} yeni başlık kodlanıyor ({len(titles) - missing.size} başlık depodan okundu)...")
+        new_vectors = model.encode(
+            [normalize_title(titles[position]) for position in positions],
+            batch_size=batch_size or config.EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        try:
+            store.append([keys[position] for position in positions], new_vectors)
+        except TimeoutError as e:
+            # Depo başka bir süreçte kilitliyse yeni vektörler bu çalışmada saklanmadan kullanılır.
+            print(f"⚠️ {e}; yeni vektörler depoya yazılmadı.")
+            return _combine(store, rows, keys, dict(zip((keys[position] for position in positions), new_vectors)))
+        rows = store.lookup(keys)
+    else:
+        print(f"🧮 Tüm başlıkların ({len(titles)}) vektörü depodan okundu.")
+
+    # Satırlar memmap'ten tek seferde, doğrudan sonuç matrisine toplanır.
+    embeddings = np.empty((len(titles), store.dim), dtype=_DTYPE)
+    np.take(store.vectors, rows, axis=0, out=embeddings)
+    try:
+        store.compact(keep_keys=keys)
+    except TimeoutError as e:
+        print(f"⚠️ {e}; embedding deposu bu çalışmada küçültülmedi.")
+    return embeddings
+
+
+def _combine(store, rows, keys, new_vectors):
+    """Depodaki satırlarla depoya yazılamamış yeni vektörleri ({anahtar: vektör}) tek matriste birleştirir."""
+    embeddings = np.empty((len(keys), store.dim), dtype=_DTYPE)
+    for position, (row, key) in enumerate(zip(rows, keys)):
+        embeddings[position] = store.vectors[row] if row >= 0 else new_vectors[key]
+    return embeddings
@@ -0,0 +1,172 @@
+# analysis/story_clusters.py
+"""
+Haber gruplarını çalışmalar arasında kalıcı "hikâyeler" olarak izler.
+
+Her hikâye şunları saklar:
+- Kalıcı kimlik (id). Gruba yeni başlık katılsa da değişmez. Kimlik, kurucu haberin
+  anahtarı ve oluşturulma anından türetilir; durum kaybolsa (sürüm değişikliği, okuma
+  hatası) bile eski bir hikâyenin kimliği (ve önbellekteki analizi) yeniden kullanılmaz.
+- Merkez vektör (centroid): üyelerin birim vektörlerinin ortalaması, birim uzunlukta
+  (her önbellek düzeninde ve JSON dışa aktarımında saklanabilsin diye float listesi).
+- Üyeler ({bağlantı: son_görülme}) ve ilk/son güncellenme zamanı.
+- Revizyon (revision) ve revizyon anındaki toplam üye sayısı. Hikâyeye son revizyondan beri
+  yeterince yeni haber katıldığında (config.STORY_CLUSTER_POLICY) revizyon artar.
+  Aşağı akıştaki analizler (id, revizyon) ile anahtarlanır; tek bir yeni başlık mevcut
+  analizi geçersiz kılmaz.
+
+Her çalışmada haberler önce kendi aralarında kümelenir (analysis.clustering). Her grup,
+üyelerinden biri zaten bir hikâyeye aitse o hikâyeye; değilse merkez vektörü eşiği geçen
+en yakın hikâyeye atanır. Eşleşmeyen gruplar yeni hikâye açar. retention_hours boyunca
+yeni haber görülmeyen hikâyeler silinir.
+
+Durum cache_manager üzerinden tek bir kayıt (STATE_NAME) olarak saklanır.
+"""
+import hashlib
+import math
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+import config
+from analysis.clustering import find_clusters, normalize_rows
+from cache_manager import key_lock, load_entry, save_entry
+
+STATE_NAME = "story_clusters.json"
+# Saklanan durumun biçim sürümü. Farklı sürümdeki kayıtlar yok sayılır.
+# (2: merkez vektör float listesi, kimlikler sayaç yerine özetten türetilir.)
+STATE_VERSION = 2
+
+
+def _empty_state():
+    return {'version': STATE_VERSION, 'stories': {}}
+
+
+def load_state():
+    """Hikâye durumunu döndürür: {'version', 'stories': {id: hikâye}}."""
+    entry = load_entry(STATE_NAME, bypass_memory=True)
+    data = entry.get('data') if entry else None
+    if not isinstance(data, dict) or data.get('version') != STATE_VERSION:
+        return _empty_state()
+    # Kayıt bellek katmanıyla paylaşılabileceği için değiştirilecek kapsayıcılar kopyalanır.
+    stories = {story_id: dict(story, members=dict(story['members'])) for story_id, story in data['stories'].items()}
+    return {'version': STATE_VERSION, 'stories': stories}
+
+
+def save_state(state):
+    try:
+        save_entry(STATE_NAME, state)
+    except Exception as e:
+        print(f"❌ Hikâye kümeleri kaydedilemedi: {e}")
+
+
+def member_key(news):
+    """Haberin hikâye üyeliğindeki anahtarı (bağlantı, yoksa başlık)."""
+    return news.get('link') or news['title']
+
+
+def _story_id(founding_key, created_at):
+    """Kurucu haber ve oluşturulma anından, durum kaybında da tekrarlanmayan bir kimlik üretir."""
+    return hashlib.sha1(f"{founding_key}\0{created_at.isoformat()}".encode('utf-8')).hexdigest()[:12]
+
+
+def _centroid(story):
+    return np.asarray(story['centroid'], dtype=np.float32)
+
+
+def _needs_revision(story, policy):
+    added = story['size'] - story['revision_size']
+    return added >= max(policy['revision_min_new'], math.ceil(story['revision_size'] * policy['revision_growth']))
+
+
+def _match_story(state, group_keys, group_vector, threshold):
+    """Grubun ait olduğu hikâyenin id'sini döndürür; yoksa None."""
+    owners = Counter(
+        story_id for story_id, story in state['stories'].items()
+        for key in group_keys if key in story['members']
+    )
+    if owners:
+        # Üyelerin çoğunun ait olduğu hikâye; eşitlikte daha eski olan.
+        stories = state['stories']
+        return min(owners, key=lambda story_id: (-owners[story_id], stories[story_id]['created_at'], story_id))
+    best_id, best_score = None, threshold
+    for story_id, story in state['stories'].items():
+        score = float(_centroid(story) @ group_vector)
+        if score >= best_score:
+            best_id, best_score = story_id, score
+    return best_id
+
+
+def assign_stories(news_list, embeddings, similarity_threshold, now=None):
+    """
+    Haberleri kalıcı hikâyelere atar ve durumu kaydeder.
+
+    Returns:
+        list: [{'id': str, 'revision': int, 'items': [haber, ...]}, ...]. Bu çalışmada
+              haberi olan her hikâye bir kez yer alır; sıra, hikâyenin bu çalışmadaki ilk
+              haberinin news_list'teki sırasıdır.
+    """
+    now = now or datetime.now(timezone.utc)
+    policy = config.STORY_CLUSTER_POLICY
+    vectors = normalize_rows(embeddings)
+
+    with key_lock(STATE_NAME):
+        state = load_state()
+        stories = state['stories']
+        assigned = {}  # hikâye id'si -> bu çalışmadaki haber indeksleri
+        created = 0
+
+        for cluster in find_clusters(vectors, similarity_threshold):
+            keys = [member_key(news_list[index]) for index in cluster]
+            group_vector = normalize_rows(vectors[cluster].mean(axis=0, keepdims=True))[0]
+            story_id = _match_story(state, keys, group_vector, similarity_threshold)
+            if story_id is None:
+                story_id = _story_id(keys[0], now)
+                if story_id in stories:
+                    # Aynı haber listede iki kez geçtiyse ikinci grubun kimliği ayrışsın.
+                    story_id = _story_id(f"{keys[0]}\0{cluster[0]}", now)
+                created += 1
+                stories[story_id] = {
+                    'centroid': group_vector.tolist(),
+                    'size': 0,
+                    'members': {},
+                    'label': news_list[cluster[0]]['title'],
+                    'created_at': now,
+                    'updated_at': now,
+                    'revision': 1,
+                    'revision_size': len(cluster),
+                }
+            story = stories[story_id]
+
+            new_indices = [index for index, key in zip(cluster, keys) if key not in story['members']]
+            if new_indices:
+                # Merkez, yalnızca yeni üyelerle ağırlıklı ortalama olarak güncellenir.
+                total = _centroid(story) * story['size'] + vectors[new_indices].sum(axis=0)
+                story['centroid'] = normalize_rows(total[np.newaxis])[0].tolist()
+                story['size'] += len(new_indices)
+                story['updated_at'] = now
+            for key in keys:
+                story['members'][key] = now
+            assigned.setdefault(story_id, []).extend(cluster)
+
+        revised = 0
+        for story_id in assigned:
+            story = stories[story_id]
+            if _needs_revision(story, policy):
+                story['revision'] += 1
+                story['revision_size'] = story['size']
+                revised += 1
+
+        cutoff = now - timedelta(hours=policy['retention_hours'])
+        expired = [story_id for story_id, story in stories.items() if story['updated_at'] < cutoff]
+        for story_id in expired:
+            del stories[story_id]
+        for story in stories.values():
+            story['members'] = {key: seen for key, seen in story['members'].items() if seen >= cutoff}
+        save_state(state)
+
+    print(f"🧵 {len(assigned)} hikâye ({created} yeni, {revised} revize edildi, {len(expired)} eski hikâye silindi).")
+    return [
+        {'id': story_id, 'revision': stories[story_id]['revision'], 'items': [news_list[index] for index in sorted(indices)]}
+        for story_id, indices in sorted(assigned.items(), key=lambda item: min(item[1]))
+    ]
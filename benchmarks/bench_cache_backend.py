@@ -0,0 +1,136 @@
+# benchmarks/bench_cache_backend.py
+"""
+Önbellek disk katmanı karşılaştırması: anahtar başına JSON dosyası (FileBackend, eski düzen)
+ile tek SQLite veritabanı (SqliteBackend), ayrıca bellek içi LRU katmanının etkisi.
+İkinci bölüm, tarihli bir haber listesinin kodlama maliyetini (girintili JSON, sıkı JSON,
+msgpack, msgpack + zstd) karşılaştırır.
+
+Geçici bir klasörde, gerçek kayıtlara benzeyen (haber listesi, analiz metni) sentetik
+veriyle çalışır; projenin cache/ klasörüne dokunmaz.
+
+    python benchmarks/bench_cache_backend.py --keys 300 --rounds 5
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cache_manager  # noqa: E402
+from cache_manager import FileBackend, LruCache, SqliteBackend  # noqa: E402
+
+
+def make_payload(index):
+    """Tipik bir önbellek kaydına benzeyen veri: 30 haberlik bir liste veya bir analiz metni."""
+    if index % 3 == 0:
+        return f"Analiz {index}: " + "Uzun bir yapay zeka analizi paragrafı. " * 40
+    return [
+        {
+            "title": f"Haber başlığı {index}-{i}",
+            "link": f"https://example.com/haber/{index}/{i}",
+            "summary": "Kısa haber özeti, birkaç cümle uzunluğunda. " * 4,
+            "source": "Örnek Kaynak",
+        }
+        for i in range(30)
+    ]
+
+
+def bench(label, backend, names, rounds, memory=None):
+    entries = {name: {"timestamp": datetime.now(), "data": make_payload(i), "validators": {}} for i, name in enumerate(names)}
+
+    started = time.perf_counter()
+    for name, entry in entries.items():
+        backend.save(name, entry)
+    write_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            entry = memory.get(name) if memory else None
+            if entry is None:
+                entry = backend.load(name)
+                if memory:
+                    memory.put(name, entry)
+    read_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    print(f"⏱️  {label:<32} yazma: {write_ms:8.1f} ms   okuma/tur: {read_ms:8.1f} ms   ({len(names)} anahtar)")
+
+
+def make_news_list(count):
+    """RSS motorunun ürettiğine benzeyen, datetime alanlı haber listesi."""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "source": "Örnek Kaynak",
+            "title": f"Haber başlığı {i}",
+            "link": f"https://example.com/haber/{i}",
+            "summary": "Kısa haber özeti, birkaç cümle uzunluğunda. " * 4,
+            "pub_date": "Sat, 18 Oct 2026 08:00:00 +0000",
+            "pub_date_parsed": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def bench_codecs(items, rounds):
+    def json_encode(value, **kwargs):
+        return json.dumps(value, ensure_ascii=False, default=cache_manager._json_default, **kwargs).encode("utf-8")
+
+    def json_decode(raw):
+        return json.loads(raw, object_hook=cache_manager._json_object_hook)
+
+    def msgpack_only(value):
+        return cache_manager._MSGPACK_MAGIC + cache_manager.msgpack.packb(value, default=cache_manager._msgpack_default, use_bin_type=True)
+
+    codecs = {
+        "JSON (indent=4, eski)": (lambda value: json_encode(value, indent=4), json_decode),
+        "JSON (sıkı)": (lambda value: json_encode(value, separators=(",", ":")), json_decode),
+        "msgpack": (msgpack_only, cache_manager.decode_value),
+    }
+    if cache_manager.zstandard is not None:
+        codecs["msgpack + zstd"] = (cache_manager.encode_value, cache_manager.decode_value)
+
+    print(f"\n--- Kodlama ({len(items)} haberlik liste, {rounds} tekrar) ---")
+    for label, (encode, decode) in codecs.items():
+        started = time.perf_counter()
+        for _ in range(rounds):
+            raw = encode(items)
+        encode_ms = (time.perf_counter() - started) * 1000 / rounds
+        started = time.perf_counter()
+        for _ in range(rounds):
+            decoded = decode(raw)
+        decode_ms = (time.perf_counter() - started) * 1000 / rounds
+        assert decoded == items, f"{label} değeri geri okuyamadı"
+        print(f"⏱️  {label:<24} boyut: {len(raw) / 1024:7.1f} KB   yazma: {encode_ms:6.2f} ms   okuma: {decode_ms:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--news", type=int, default=500, help="Kodlama karşılaştırmasındaki haber sayısı")
+    args = parser.parse_args()
+
+    names = [f"analysis_{i:05d}.json" for i in range(args.keys)]
+    with tempfile.TemporaryDirectory() as tmp:
+        file_dir = Path(tmp) / "files"
+        file_dir.mkdir()
+        bench("Dosya başına JSON (eski)", FileBackend(str(file_dir)), names, args.rounds)
+
+        sqlite_backend = SqliteBackend(str(Path(tmp) / "cache.sqlite3"))
+        bench("SQLite (WAL)", sqlite_backend, names, args.rounds)
+        bench("LRU + SQLite (WAL)", sqlite_backend, names, args.rounds, memory=LruCache(args.keys))
+        sqlite_backend.close()
+
+        file_count = len(list(file_dir.iterdir()))
+        print(f"\nℹ️ Dosya düzeni {file_count} dosya, SQLite düzeni tek veritabanı dosyası kullandı.")
+
+    bench_codecs(make_news_list(args.news), args.rounds * 4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# benchmarks/bench_embedding_backends.py
+"""
+Embedding katmanlarının karşılaştırması: torch (sentence-transformers), onnx ve onnx-int8.
+
+Her katman ayrı bir alt süreçte çalıştırılır; böylece yükleme süresi ve bellek tepe
+değeri (max RSS) katmanlar arasında karışmaz. Ardından her katmanın ürettiği başlık
+vektörlerinin kosinüs benzerlik matrisi torch katmanınınkiyle karşılaştırılır
+(en büyük mutlak fark ve benzerlik eşiğini geçen çiftlerdeki uyum). torch kurulu
+değilse ilk çalışan katman referans alınır.
+
+Başlıklar, bench_rss_parse.py'nin kaydettiği akışlardan (benchmarks/feeds) veya satır
+başına bir başlık içeren bir dosyadan okunur. ONNX dosyaları önceden üretilmelidir:
+
+    python -m analysis.embedding_backends export
+    python benchmarks/bench_embedding_backends.py --repeat 3
+    python benchmarks/bench_embedding_backends.py --titles basliklar.txt --backends torch onnx-int8
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+
+DEFAULT_FEEDS_DIR = Path(__file__).resolve().parent / "feeds"
+
+
+def load_titles(titles_file, feeds_dir):
+    """Başlıkları dosyadan veya kaydedilmiş akışlardan (tekilleştirerek) okur."""
+    if titles_file:
+        return [line.strip() for line in titles_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    from data_fetchers import rss_engine
+
+    titles = []
+    for path in sorted(feeds_dir.glob("*.xml")):
+        try:
+            titles.extend(item["title"] for _, item in rss_engine.parse_feed(path.read_bytes()))
+        except ValueError:
+            continue
+    return list(dict.fromkeys(title for title in titles if title))
+
+
+def run_worker(backend, titles_path, output_path, batch_size, repeat):
+    """Alt süreç: katmanı yükler, başlıkları repeat kez kodlar, ölçümleri stdout'a JSON yazar."""
+    titles = json.loads(Path(titles_path).read_text(encoding="utf-8"))
+    started = time.perf_counter()
+    from analysis.embedding_backends import load_embedding_model
+
+    model = load_embedding_model(backend=backend)
+    load_seconds = time.perf_counter() - started
+
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        embeddings = model.encode(titles, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+        durations.append(time.perf_counter() - started)
+    np.save(output_path, np.asarray(embeddings, dtype=np.float32))
+
+    print(json.dumps({
+        "model_id": model.model_id,
+        "load_seconds": load_seconds,
+        "encode_seconds": min(durations),
+        # Linux'ta ru_maxrss kilobayt cinsindendir.
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def cosine_matrix(embeddings):
+    vectors = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    return vectors @ vectors.T
+
+
+def compare_scores(reference, candidate, threshold):
+    """İki katmanın benzerlik matrislerini karşılaştırır: en büyük fark ve eşik üstü çift uyumu."""
+    upper = np.triu_indices(len(reference), k=1)
+    ref_scores, cand_scores = cosine_matrix(reference)[upper], cosine_matrix(candidate)[upper]
+    ref_pairs, cand_pairs = ref_scores >= threshold, cand_scores >= threshold
+    union = np.count_nonzero(ref_pairs | cand_pairs)
+    return {
+        "max_abs_diff": float(np.abs(ref_scores - cand_scores).max()) if len(ref_scores) else 0.0,
+        "mean_abs_diff": float(np.abs(ref_scores - cand_scores).mean()) if len(ref_scores) else 0.0,
+        "pairs_reference": int(np.count_nonzero(ref_pairs)),
+        "pairs_agree": int(np.count_nonzero(ref_pairs & cand_pairs)),
+        "pairs_jaccard": float(np.count_nonzero(ref_pairs & cand_pairs) / union) if union else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=Path, help="Satır başına bir başlık içeren dosya")
+    parser.add_argument("--feeds-dir", type=Path, default=DEFAULT_FEEDS_DIR)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--batch-size", type=int, default=config.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.80)
+    parser.add_argument("--worker", nargs=2, metavar=("TITLES_JSON", "OUTPUT_NPY"), help=argparse.SUPPRESS)
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.backend, args.worker[0], args.worker[1], args.batch_size, args.repeat)
+        return
+
+    titles = load_titles(args.titles, args.feeds_dir)
+    if not titles:
+        print("❌ Başlık bulunamadı. --titles verin veya önce bench_rss_parse.py --download ile akışları indirin.")
+        return
+    print(f"ℹ️ {len(titles)} başlık, grup boyutu {args.batch_size}, {args.repeat} tekrar.\n")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        titles_path = Path(tmp_dir) / "titles.json"
+        titles_path.write_text(json.dumps(titles, ensure_ascii=False), encoding="utf-8")
+        for backend in args.backends:
+            output_path = Path(tmp_dir) / f"{backend}.npy"
+            completed = subprocess.run(
+                [sys.executable, __file__, "--backend", backend, "--worker", str(titles_path), str(output_path),
+                 "--batch-size", str(args.batch_size), "--repeat", str(args.repeat)],
+                capture_output=True, text=True,
+            )
+            if completed.returncode != 0:
+                print(f"❌ {backend}: {completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'hata'}")
+                continue
+            stats = json.loads(completed.stdout.strip().splitlines()[-1])
+            if stats["model_id"] in (result["model_id"] for result in results.values()):
+                print(f"⚠️ {backend}: ONNX dosyaları bulunamadı, {stats['model_id']} yüklendi; atlanıyor.")
+                continue
+            stats["embeddings"] = np.load(output_path)
+            results[backend] = stats
+            print(f"⏱️  {backend:<10} yükleme: {stats['load_seconds']:6.2f} sn  kodlama: {stats['encode_seconds']:6.2f} sn  "
+                  f"({len(titles) / stats['encode_seconds']:7.0f} başlık/sn)  bellek: {stats['max_rss_mb']:6.0f} MB")
+
+    if len(results) < 2:
+        return
+    # Referans torch katmanıdır; torch çalıştırılamadıysa ilk başarılı katman kullanılır.
+    reference = "torch" if "torch" in results else next(iter(results))
+    print(f"\n--- {reference} ile Benzerlik Uyumu (eşik {args.threshold}) ---")
+    for backend, stats in results.items():
+        if backend == reference:
+            continue
+        parity = compare_scores(results[reference]["embeddings"], stats["embeddings"], args.threshold)
+        print(f"{'✅' if parity['pairs_jaccard'] >= 0.95 else '⚠️'} {backend}: en büyük fark {parity['max_abs_diff']:.4f}, "
+              f"ortalama {parity['mean_abs_diff']:.4f} | eşik üstü çiftler {parity['pairs_agree']}/{parity['pairs_reference']} "
+              f"(Jaccard {parity['pairs_jaccard']:.3f})")
+
+
+if __name__ == "__main__":
+    main()
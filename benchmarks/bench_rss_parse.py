@@ -0,0 +1,133 @@
+# benchmarks/bench_rss_parse.py
+"""
+RSS ayrıştırma karşılaştırması: feedparser + BeautifulSoup (api_fetchers.fetch_rss_feed'in
+kullandığı yol) ile lxml iterparse + regex (rss_engine.parse_feed).
+
+Kaydedilmiş akış dosyaları üzerinde çalışır; ağ süresi ölçüme girmez. Önce akışları indirin:
+
+    python benchmarks/bench_rss_parse.py --download
+    python benchmarks/bench_rss_parse.py --repeat 20
+
+Her motor için toplam süre ve girdi başına süre yazdırılır, ardından iki motorun
+çıktıları (guid, başlık, bağlantı, özet, tarih) karşılaştırılır.
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from data_fetchers import api_fetchers, http_client, rss_engine  # noqa: E402
+
+DEFAULT_FEEDS_DIR = Path(__file__).resolve().parent / "feeds"
+
+
+def download_feeds(feeds_dir):
+    """config.RSS_FEEDS'teki akışları feeds_dir altına kaydeder."""
+    feeds_dir.mkdir(parents=True, exist_ok=True)
+    for urls in config.RSS_FEEDS.values():
+        for url in urls:
+            try:
+                response = http_client.get(url)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"⚠️ İndirilemedi ({url}): {e}")
+                continue
+            target = feeds_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.xml"
+            target.write_bytes(response.content)
+            print(f"💾 {url} -> {target.name} ({len(response.content) / 1024:.0f} KB)")
+
+
+def _parse_with_feedparser(content):
+    return api_fetchers._parse_rss_feed(content)
+
+
+def _parse_with_engine(content):
+    return rss_engine.parse_feed(content)
+
+
+ENGINES = {
+    "feedparser + BeautifulSoup": _parse_with_feedparser,
+    "lxml iterparse + regex": _parse_with_engine,
+}
+
+
+def run_engine(parse, documents, repeat):
+    """Tüm belgeleri repeat kez ayrıştırır; (toplam süre, girdi sayısı, son çıktılar) döndürür."""
+    outputs = {}
+    entry_count = 0
+    started = time.perf_counter()
+    # Ayrıştırıcıların akış başına yazdırdığı satırlar ölçümü kirletmesin.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            entry_count = 0
+            for name, content in documents.items():
+                try:
+                    outputs[name] = parse(content)
+                except Exception as e:
+                    outputs[name] = e
+                    continue
+                entry_count += len(outputs[name])
+    return time.perf_counter() - started, entry_count, outputs
+
+
+def compare_outputs(reference, candidate):
+    """İki motorun çıktılarındaki alan uyuşmazlıklarını sayar."""
+    mismatches = {"guid": 0, "title": 0, "link": 0, "summary": 0, "pub_date_parsed": 0}
+    total = 0
+    for name, ref_entries in reference.items():
+        cand_entries = candidate.get(name)
+        if isinstance(ref_entries, Exception) or isinstance(cand_entries, Exception):
+            print(f"⚠️ {name}: bir motor hata verdi ({ref_entries if isinstance(ref_entries, Exception) else cand_entries})")
+            continue
+        if len(ref_entries) != len(cand_entries):
+            print(f"⚠️ {name}: girdi sayısı farklı ({len(ref_entries)} / {len(cand_entries)})")
+        for (ref_guid, ref_item), (cand_guid, cand_item) in zip(ref_entries, cand_entries):
+            total += 1
+            mismatches["guid"] += ref_guid != cand_guid
+            for field in ("title", "link", "summary"):
+                mismatches[field] += ref_item[field] != cand_item[field]
+            if ref_item["pub_date"] != "Tarih yok":
+                mismatches["pub_date_parsed"] += ref_item["pub_date_parsed"] != cand_item["pub_date_parsed"]
+    return total, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("feeds_dir", nargs="?", type=Path, default=DEFAULT_FEEDS_DIR)
+    parser.add_argument("--download", action="store_true", help="Akışları config.RSS_FEEDS'ten indirip kaydet.")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.download:
+        download_feeds(args.feeds_dir)
+
+    documents = {path.name: path.read_bytes() for path in sorted(args.feeds_dir.glob("*.xml"))}
+    if not documents:
+        print(f"❌ {args.feeds_dir} altında akış dosyası yok. Önce --download ile indirin.")
+        return
+    size_kb = sum(len(content) for content in documents.values()) / 1024
+    print(f"ℹ️ {len(documents)} akış ({size_kb:.0f} KB), {args.repeat} tekrar.\n")
+
+    results = {}
+    for label, parse in ENGINES.items():
+        elapsed, entry_count, outputs = run_engine(parse, documents, args.repeat)
+        results[label] = outputs
+        per_run_ms = elapsed / args.repeat * 1000
+        per_entry_us = elapsed / max(entry_count * args.repeat, 1) * 1e6
+        print(f"⏱️  {label:<28} {per_run_ms:8.1f} ms/çalışma  {per_entry_us:7.1f} µs/girdi  ({entry_count} girdi)")
+
+    reference, candidate = results.values()
+    total, mismatches = compare_outputs(reference, candidate)
+    print(f"\n--- Çıktı Karşılaştırması ({total} girdi) ---")
+    for field, count in mismatches.items():
+        print(f"{'✅' if count == 0 else '⚠️'} {field}: {count} farklı")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,991 @@
 # cache_manager.py
+"""
+Önbellek katmanı.
 
+Kayıtlar iki katmanda tutulur:
+- Bellek içi LRU katmanı: aynı süreçte tekrar okunan kayıtlar diske gitmeden döner.
+- Disk katmanı (backend): config.CACHE_BACKEND ile seçilir.
+    "sqlite": Tüm kayıtlar tek bir SQLite veritabanında (WAL modu) tutulur.
+    "file":   Eski düzen; her anahtar CACHE_DIR altında ayrı bir JSON dosyasıdır.
+
+SQLite kullanılırken CACHE_DIR altında kalmış eski JSON dosyaları ilk açılışta
+veritabanına aktarılır ve silinir.
+
+Aynı anahtarı yenilemek isteyen iş parçacıkları ve süreçler anahtar başına bir kilitte
+sıraya girer: yalnızca ilki veriyi çeker, diğerleri kilidi aldığında onun yazdığı sonucu
+kullanır. Dosya düzeninde yazma işlemleri geçici dosya + yeniden adlandırma ile atomiktir.
+
+SQLite'taki değerler msgpack ile ikili olarak (büyük değerler zstandard kuruluysa ayrıca
+sıkıştırılarak) saklanır; datetime, date ve set gibi tipler olduğu gibi geri okunur. Dosya
+düzeni ve export_json() ile alınan hata ayıklama çıktısı aynı tipleri etiketli JSON ile yazar.
+
+Her kaydın son okunma zamanı ve (get_cached_data ile yazılanlarda) kullanım süresinin
+dolduğu an saklanır. sweep() çalışma sonunda süresi dolmuş, uzun süredir okunmamış veya
+boyut/sayı sınırını aşan kayıtları config.CACHE_EVICTION politikasına göre siler.
+
+get_cached_data anahtar başına isabet/ıska/bayat sayaçları, çekme süreleri ve yazılan
+boyutu toplar; report_cache_metrics() bunları çalışma sonunda METRICS_DIR altına yazar.
+
+Not: Bellek katmanı kayıtları kopyalamadan döndürür; dönen veri yerinde değiştirilmemelidir.
+"""
+import fnmatch
+import hashlib
 import json
 import os
-from datetime import datetime, timedelta
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import msgpack
+
+try:
+    import fcntl  # Yalnızca POSIX; Windows'ta süreçler arası kilit atlanır.
+except ImportError:
+    fcntl = None
+
+try:
+    import zstandard  # İsteğe bağlı; kurulu değilse değerler sıkıştırılmadan yazılır.
+except ImportError:
+    zstandard = None
+
+import config
 
 CACHE_DIR = "cache" # Önbellek dosyalarını saklamak için bir klasör.
+SQLITE_FILE_NAME = "cache.sqlite3"
+LOCK_DIR = os.path.join(CACHE_DIR, "locks")
+METRICS_DIR = os.path.join(CACHE_DIR, "metrics")
+
+# Koşullu istek yapan bir fetch fonksiyonu, sunucu 304 (Not Modified) döndürdüğünde
+# bu değeri döndürür; önbellekteki veri değişmeden yeniden kullanılır.
+NOT_MODIFIED = object()
 
 # Cache klasörünün var olduğundan emin ol
 if not os.path.exists(CACHE_DIR):
     os.makedirs(CACHE_DIR)
 
-def get_cached_data(cache_file_name, fetch_function, expiry_minutes=15):
+
+# --- Kodlayıcılar (codec) ---
+# İkili değerler 4 baytlık bir başlıkla başlar; başlığı olmayan değerler eski JSON metnidir.
+_MSGPACK_MAGIC = b"BGM1"  # msgpack
+_ZSTD_MAGIC = b"BGZ1"     # zstandard ile sıkıştırılmış msgpack
+
+# msgpack ExtType kodları ve etiketli JSON anahtarları
+_EXT_DATETIME, _EXT_DATE, _EXT_SET = 1, 2, 3
+_JSON_TAGS = {"__datetime__": datetime.fromisoformat, "__date__": date.fromisoformat, "__set__": set}
+
+
+def _msgpack_default(obj):
+    # datetime, date'in alt sınıfı olduğu için önce kontrol edilir.
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode("ascii"))
+    if isinstance(obj, date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode("ascii"))
+    if isinstance(obj, (set, frozenset)):
+        return msgpack.ExtType(_EXT_SET, msgpack.packb(list(obj), default=_msgpack_default, use_bin_type=True))
+    raise TypeError(f"Önbelleğe yazılamayan tip: {type(obj).__name__}")
+
+
+def _msgpack_ext_hook(code, payload):
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(payload.decode("ascii"))
+    if code == _EXT_DATE:
+        return date.fromisoformat(payload.decode("ascii"))
+    if code == _EXT_SET:
+        return set(msgpack.unpackb(payload, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False))
+    return msgpack.ExtType(code, payload)
+
+
+def encode_value(value):
+    """Değeri ikili önbellek biçimine (msgpack, gerekirse zstd) çevirir."""
+    body = msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
+    if zstandard is not None and len(body) >= config.CACHE_COMPRESS_MIN_BYTES:
+        return _ZSTD_MAGIC + zstandard.compress(body, config.CACHE_COMPRESS_LEVEL)
+    return _MSGPACK_MAGIC + body
+
+
+def decode_value(raw):
+    """encode_value'nun tersi. Başlıksız değerler eski sürümün JSON metni olarak okunur."""
+    if isinstance(raw, str):
+        return json.loads(raw)
+    raw = bytes(raw)
+    magic, body = raw[:4], raw[4:]
+    if magic == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("Kayıt zstd ile sıkıştırılmış ama zstandard paketi kurulu değil")
+        body, magic = zstandard.decompress(body), _MSGPACK_MAGIC
+    if magic == _MSGPACK_MAGIC:
+        return msgpack.unpackb(body, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _json_default(obj):
+    """datetime/date/set değerlerini etiketli JSON nesnelerine çevirir ({"__datetime__": "..."})."""
+    if isinstance(obj, datetime):
+        return {"__datetime__": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"__date__": obj.isoformat()}
+    if isinstance(obj, (set, frozenset)):
+        return {"__set__": list(obj)}
+    raise TypeError(f"Önbelleğe yazılamayan tip: {type(obj).__name__}")
+
+
+def _json_object_hook(obj):
+    if len(obj) == 1:
+        tag, value = next(iter(obj.items()))
+        if tag in _JSON_TAGS:
+            return _JSON_TAGS[tag](value)
+    return obj
+
+
+class FileBackend:
+    """Her anahtarı CACHE_DIR altında ayrı, okunabilir bir JSON dosyası olarak saklar."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def load(self, name):
+        cache_path = self._path(name)
+        if not os.path.exists(cache_path):
+            return None
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f, object_hook=_json_object_hook)
+        entry['timestamp'] = datetime.fromisoformat(entry['timestamp'])
+        entry.setdefault('validators', {})
+        entry.setdefault('expires_at', None)
+        return entry
+
+    def save(self, name, entry):
+        payload = {
+            'timestamp': entry['timestamp'].isoformat(),
+            'data': entry['data'],
+        }
+        if entry['validators']:
+            payload['validators'] = entry['validators']
+        if entry.get('expires_at'):
+            payload['expires_at'] = entry['expires_at']
+        # Okuyucular yarım yazılmış bir dosya görmesin diye önce geçici dosyaya yazılır,
+        # ardından tek adımda (os.replace) yerine taşınır.
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, indent=4, default=_json_default)
+            os.replace(tmp_path, self._path(name))
+            return os.path.getsize(self._path(name))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, name):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def names(self):
+        return sorted(file_name for file_name in os.listdir(self.cache_dir) if file_name.endswith('.json'))
+
+    def touch_many(self, accesses):
+        # Son erişim zamanı dosyanın değiştirilme zamanında tutulur.
+        for name, accessed_at in accesses.items():
+            try:
+                os.utime(self._path(name), (accessed_at.timestamp(), accessed_at.timestamp()))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        """Her kayıt için {'name', 'size', 'timestamp', 'last_access', 'expires_at'} döndürür."""
+        records = []
+        for name in self.names():
+            try:
+                stat = os.stat(self._path(name))
+                entry = self.load(name)
+            except (OSError, json.JSONDecodeError, KeyError, ValueError):
+                continue
+            if entry is None:
+                continue
+            records.append({
+                'name': name,
+                'size': stat.st_size,
+                'timestamp': entry['timestamp'],
+                'last_access': datetime.fromtimestamp(stat.st_mtime),
+                'expires_at': entry['expires_at'],
+            })
+        return records
+
+    def compact(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SqliteBackend:
+    """Tüm kayıtları tek bir SQLite veritabanında (WAL modu) saklar."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, SQLITE_FILE_NAME)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " name TEXT PRIMARY KEY,"
+                " timestamp TEXT NOT NULL,"
+                " data BLOB NOT NULL,"
+                " validators TEXT,"
+                " size INTEGER,"
+                " last_access TEXT,"
+                " expires_at TEXT)"
+            )
+            # Eski şemayla oluşturulmuş veritabanlarına tahliye (eviction) sütunları eklenir.
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            for column, column_type in (("size", "INTEGER"), ("last_access", "TEXT"), ("expires_at", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE entries ADD COLUMN {column} {column_type}")
+
+    def _connect(self):
+        # Her iş parçacığı kendi bağlantısını kullanır; WAL modunda okuyucular yazarı beklemez.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def load(self, name):
+        row = self._connect().execute(
+            "SELECT timestamp, data, validators, expires_at FROM entries WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        timestamp, data, validators, expires_at = row
+        return {
+            'timestamp': datetime.fromisoformat(timestamp),
+            'data': decode_value(data),
+            'validators': json.loads(validators) if validators else {},
+            'expires_at': datetime.fromisoformat(expires_at) if expires_at else None,
+        }
+
+    def save(self, name, entry):
+        data = encode_value(entry['data'])
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (name, timestamp, data, validators, size, last_access, expires_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name,
+                    entry['timestamp'].isoformat(),
+                    data,
+                    json.dumps(entry['validators']) if entry['validators'] else None,
+                    len(data),
+                    entry['timestamp'].isoformat(),
+                    entry['expires_at'].isoformat() if entry.get('expires_at') else None,
+                ),
+            )
+        return len(data)
+
+    def delete(self, name):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+
+    def names(self):
+        return [row[0] for row in self._connect().execute("SELECT name FROM entries ORDER BY name")]
+
+    def touch_many(self, accesses):
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE entries SET last_access = ? WHERE name = ?",
+                [(accessed_at.isoformat(), name) for name, accessed_at in accesses.items()],
+            )
+
+    def stats(self):
+        """Her kayıt için {'name', 'size', 'timestamp', 'last_access', 'expires_at'} döndürür."""
+        rows = self._connect().execute(
+            "SELECT name, COALESCE(size, length(data)), timestamp, COALESCE(last_access, timestamp), expires_at FROM entries"
+        )
+        return [
+            {
+                'name': name,
+                'size': size,
+                'timestamp': datetime.fromisoformat(timestamp),
+                'last_access': datetime.fromisoformat(last_access),
+                'expires_at': datetime.fromisoformat(expires_at) if expires_at else None,
+            }
+            for name, size, timestamp, last_access, expires_at in rows
+        ]
+
+    def compact(self):
+        # Silinen kayıtların sayfaları dosyadan geri alınır.
+        self._connect().execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    # WAL içeriği ana dosyaya aktarılır; önbellek klasörü tek dosya olarak taşınabilir.
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except sqlite3.Error:
+                    pass
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class LruCache:
+    """İş parçacığı güvenli, en fazla max_entries kayıt tutan bellek içi LRU katmanı."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+            return entry
+
+    def put(self, name, entry):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[name] = entry
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, name):
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_memory = LruCache(config.CACHE_MEMORY_ENTRIES)
+
+# Okunan kayıtların son erişim zamanları bellekte toplanır ve tek seferde diske yazılır.
+_accesses = {}
+_accesses_lock = threading.Lock()
+
+
+def _import_legacy_files(backend):
+    """CACHE_DIR altındaki eski dosya başına kayıt düzenini SQLite veritabanına aktarır."""
+    legacy = FileBackend(CACHE_DIR)
+    imported = 0
+    for name in legacy.names():
+        try:
+            entry = legacy.load(name)
+        except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
+            print(f"⚠️ Eski önbellek dosyası aktarılamadı ({name}): {e}")
+            continue
+        if entry is not None and backend.load(name) is None:
+            backend.save(name, entry)
+            imported += 1
+        legacy.delete(name)
+    if imported:
+        print(f"ℹ️ {imported} eski önbellek dosyası SQLite'a aktarıldı.")
+
+
+def get_backend():
+    """Disk katmanını (ilk çağrıda config.CACHE_BACKEND'e göre oluşturarak) döndürür."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if config.CACHE_BACKEND == "sqlite":
+                    backend = SqliteBackend()
+                    _import_legacy_files(backend)
+                else:
+                    backend = FileBackend(CACHE_DIR)
+                _backend = backend
+    return _backend
+
+
+def _record_access(cache_file_name):
+    with _accesses_lock:
+        _accesses[cache_file_name] = datetime.now()
+
+
+def _flush_accesses(backend):
+    with _accesses_lock:
+        accesses = dict(_accesses)
+        _accesses.clear()
+    if accesses:
+        try:
+            backend.touch_many(accesses)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Önbellek erişim zamanları yazılamadı: {e}")
+
+
+def close():
+    """Erişim zamanlarını yazar, disk katmanının bağlantılarını kapatır ve bellek katmanını boşaltır."""
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _flush_accesses(_backend)
+            _backend.close()
+            _backend = None
+    _memory.clear()
+
+
+def load_entry(cache_file_name, bypass_memory=False):
     """
-    Veriyi önbellekten alır veya gerekirse yeniden çeker.
-    Eğer yeniden çekme işlemi başarısız olursa (None dönerse), süresi dolmuş olsa bile
-    önbellekteki son geçerli veriyi döndürür. Boş liste ([]) gibi sonuçları
-    başarılı kabul eder ve önbelleğe kaydeder.
+    Önbellek kaydını ham haliyle okur.
+    Kayıt yoksa veya okunamıyorsa None, aksi halde {'timestamp', 'data', 'validators'} döndürür.
+    bypass_memory=True ise bellek katmanı atlanır (başka bir sürecin yazdığı kaydı görmek için).
+    """
+    entry = None if bypass_memory else _memory.get(cache_file_name)
+    if entry is None:
+        try:
+            entry = get_backend().load(cache_file_name)
+        except (json.JSONDecodeError, KeyError, ValueError, OSError, sqlite3.DatabaseError) as e:
+            print(f"❌ Önbellek okuma hatası: {e}. Veri yeniden çekilecek.")
+            return None
+        if entry is not None:
+            _memory.put(cache_file_name, entry)
+    if entry is not None:
+        _record_access(cache_file_name)
+    return entry
+
+def save_entry(cache_file_name, data, validators=None, keep_minutes=None):
+    """
+    Veriyi (ve varsa ETag/Last-Modified doğrulayıcılarını) önbelleğe yazar.
+    keep_minutes verilirse kayıt bu süre dolduktan sonra sweep() ile silinebilir.
+    Diske yazılan boyutu (bayt) döndürür.
+    """
+    now = datetime.now()
+    entry = {
+        'timestamp': now,
+        'data': data,
+        'validators': dict(validators or {}),
+        'expires_at': now + timedelta(minutes=keep_minutes) if keep_minutes is not None else None,
+    }
+    size = get_backend().save(cache_file_name, entry)
+    _memory.put(cache_file_name, entry)
+    return size
+
+def get_validators(cache_file_name):
+    """Kayıtla birlikte saklanan doğrulayıcıları ({'etag': ..., 'last_modified': ...}) döndürür."""
+    entry = load_entry(cache_file_name)
+    return dict(entry['validators']) if entry else {}
+
+# --- Ölçümler ---
+# get_cached_data her anahtar için sayaçlar ve çekme süreleri tutar. report_cache_metrics()
+# çalışma sonunda bunları özetler, METRICS_DIR altına makinece okunabilir bir rapor yazar ve
+# son config.CACHE_METRICS_HISTORY_RUNS çalışmanın geçmişini saklar.
+#   requests: get_cached_data çağrısı      hits: taze kayıt döndü
+#   stale_served: bayat kayıt hemen döndü (stale-while-revalidate)
+#   misses: veri çekmek gerekti            refreshed_by_other: kilit beklenirken başkası yeniledi
+#   background_refreshes: arka plan yenilemesi   not_modified: sunucu 304 döndürdü
+#   failures: çekme veri döndürmedi        stale_fallbacks: çekme başarısız, bayat kayıt döndü
+#   lock_timeouts: anahtarın kilidi alınamadı, veri çekilmedi
+_METRIC_COUNTERS = (
+    "requests", "hits", "stale_served", "misses", "refreshed_by_other",
+    "background_refreshes", "not_modified", "failures", "stale_fallbacks", "lock_timeouts",
+)
+_metrics = {}
+_metrics_lock = threading.Lock()
+_run_started_at = datetime.now()
+
+
+def _key_metrics(cache_file_name):
+    # _metrics_lock tutulurken çağrılmalıdır.
+    if cache_file_name not in _metrics:
+        _metrics[cache_file_name] = {
+            **{counter: 0 for counter in _METRIC_COUNTERS},
+            'fetches': 0,
+            'fetch_seconds': 0.0,
+            'max_fetch_seconds': 0.0,
+            'bytes': None,
+            'expiry_minutes': None,
+        }
+    return _metrics[cache_file_name]
+
+
+def _count(cache_file_name, counter, expiry_minutes=None):
+    with _metrics_lock:
+        metrics = _key_metrics(cache_file_name)
+        metrics[counter] += 1
+        if expiry_minutes is not None:
+            metrics['expiry_minutes'] = expiry_minutes
+
+
+def _record_fetch(cache_file_name, seconds, size=None):
+    with _metrics_lock:
+        metrics = _key_metrics(cache_file_name)
+        metrics['fetches'] += 1
+        metrics['fetch_seconds'] += seconds
+        metrics['max_fetch_seconds'] = max(metrics['max_fetch_seconds'], seconds)
+        if size is not None:
+            metrics['bytes'] = size
+
+
+def _write_metrics(report):
+    """Çalışma raporunu yazar ve geçmiş dosyasına ekler (son CACHE_METRICS_HISTORY_RUNS satır tutulur)."""
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    line = json.dumps(report, ensure_ascii=False, sort_keys=True)
+    history_path = os.path.join(METRICS_DIR, "history.jsonl")
+    try:
+        with open(history_path, encoding='utf-8') as f:
+            history = [previous for previous in f.read().splitlines() if previous.strip()]
+    except FileNotFoundError:
+        history = []
+    history = (history + [line])[-config.CACHE_METRICS_HISTORY_RUNS:]
+
+    for file_name, text in (("last_run.json", json.dumps(report, ensure_ascii=False, indent=4)),
+                            ("history.jsonl", "\n".join(history) + "\n")):
+        fd, tmp_path = tempfile.mkstemp(dir=METRICS_DIR, prefix=f".{file_name}.", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, os.path.join(METRICS_DIR, file_name))
+
+
+def report_cache_metrics(write=True):
+    """
+    Bu çalışmadaki önbellek ölçümlerini anahtar bazında yazdırır, write=True ise
+    METRICS_DIR/last_run.json'a yazıp METRICS_DIR/history.jsonl'e ekler. Raporu döndürür.
     """
-    cache_path = os.path.join(CACHE_DIR, cache_file_name)
-    stale_data = None 
+    with _metrics_lock:
+        keys = {name: dict(metrics) for name, metrics in _metrics.items()}
+    totals = {counter: sum(metrics[counter] for metrics in keys.values()) for counter in _METRIC_COUNTERS}
+    totals['fetch_seconds'] = round(sum(metrics['fetch_seconds'] for metrics in keys.values()), 3)
+    for metrics in keys.values():
+        metrics['fetch_seconds'] = round(metrics['fetch_seconds'], 3)
+        metrics['max_fetch_seconds'] = round(metrics['max_fetch_seconds'], 3)
+    report = {
+        'run_started_at': _run_started_at.isoformat(timespec='seconds'),
+        'run_finished_at': datetime.now().isoformat(timespec='seconds'),
+        'backend': config.CACHE_BACKEND,
+        'totals': totals,
+        'keys': keys,
+    }
 
-    if os.path.exists(cache_path):
+    if keys:
+        print("\n--- Önbellek Ölçümleri ---")
+        for name, metrics in sorted(keys.items(), key=lambda item: item[1]['fetch_seconds'], reverse=True):
+            size = f"{metrics['bytes'] / 1024:.0f} KB" if metrics['bytes'] is not None else "-"
+            print(f"📊 {name}: {metrics['requests']} istek | taze {metrics['hits']}, bayat {metrics['stale_served']}, "
+                  f"çekme {metrics['misses']}, hata {metrics['failures']}, bayat yedek {metrics['stale_fallbacks']} | "
+                  f"çekme süresi {metrics['fetch_seconds']:.2f} sn | {size}")
+        print(f"📊 Toplam: {totals['requests']} istek, {totals['hits']} taze, {totals['stale_served']} bayat, "
+              f"{totals['misses']} çekme ({totals['fetch_seconds']:.2f} sn), {totals['stale_fallbacks']} bayat yedek")
+    if write:
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            stale_data = cache_data.get('data')
-            cached_time = datetime.fromisoformat(cache_data['timestamp'])
+            _write_metrics(report)
+        except OSError as e:
+            print(f"⚠️ Önbellek ölçümleri yazılamadı: {e}")
+    return report
 
-            if datetime.now() < cached_time + timedelta(minutes=expiry_minutes):
-                print(f"✅ Önbellekten okundu: {cache_file_name} (Taze)")
-                return stale_data
-            else:
-                print(f"⚠️ Önbellek bayatlamış: {cache_file_name}. Yeniden çekilecek.")
-        except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
-            print(f"❌ Önbellek okuma hatası: {e}. Veri yeniden çekilecek.")
-            stale_data = None
 
-    print(f"🔄 Veri yeniden çekiliyor: {cache_file_name}...")
-    new_data = fetch_function()
+def summarize_metrics_history(history_path=None):
+    """
+    Geçmiş dosyasındaki çalışmaları anahtar bazında toplar: taze okuma oranı, ortalama
+    çekme süresi, bayat yedek sayısı. TTL (expiry_minutes) ayarı için kullanılır.
+    """
+    history_path = history_path or os.path.join(METRICS_DIR, "history.jsonl")
+    summary = {}
+    runs = 0
+    with open(history_path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            runs += 1
+            for name, metrics in json.loads(line)['keys'].items():
+                total = summary.setdefault(name, {'runs': 0, 'fetches': 0, 'fetch_seconds': 0.0, 'expiry_minutes': None,
+                                                  **{counter: 0 for counter in _METRIC_COUNTERS}})
+                total['runs'] += 1
+                total['fetches'] += metrics['fetches']
+                total['fetch_seconds'] += metrics['fetch_seconds']
+                if metrics['expiry_minutes'] is not None:
+                    total['expiry_minutes'] = metrics['expiry_minutes']
+                for counter in _METRIC_COUNTERS:
+                    total[counter] += metrics.get(counter, 0)
+
+    print(f"--- Önbellek Geçmişi ({runs} çalışma) ---")
+    for name, total in sorted(summary.items(), key=lambda item: item[1]['fetch_seconds'], reverse=True):
+        hit_ratio = (total['hits'] + total['stale_served']) / total['requests'] if total['requests'] else 0
+        average = total['fetch_seconds'] / total['fetches'] if total['fetches'] else 0
+        print(f"📈 {name}: TTL {total['expiry_minutes']} dk | önbellekten %{hit_ratio * 100:.0f} "
+              f"({total['requests']} istek) | ort. çekme {average:.2f} sn | hata {total['failures']}, "
+              f"bayat yedek {total['stale_fallbacks']}")
+    return summary
+
+
+# --- Anahtar başına kilit ---
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(cache_file_name):
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(cache_file_name, threading.Lock())
+
+
+def _acquire_file_lock(lock_file, deadline):
+    """Dosya kilidini deadline'a kadar almaya çalışır; alınamazsa False döndürür."""
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+
+
+def _lock_path(cache_file_name):
+    return os.path.join(LOCK_DIR, f"{hashlib.sha1(cache_file_name.encode('utf-8')).hexdigest()[:16]}.lock")
+
+
+@contextmanager
+def key_lock(cache_file_name, timeout=None):
+    """
+    Anahtar için hem süreç içi (iş parçacıkları arası) hem süreçler arası (fcntl.flock)
+    bir kilit tutar. timeout (varsayılan config.CACHE_LOCK_TIMEOUT) içinde kilit
+    alınamazsa TimeoutError fırlatılır; takılan bir çekme diğer çalışmaları sonsuza kadar
+    bekletmez, kilitsiz devam edilmediği için de aynı veri iki kez çekilip yazılmaz.
+    """
+    timeout = config.CACHE_LOCK_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    thread_lock = _thread_lock(cache_file_name)
+
+    if not thread_lock.acquire(blocking=False):
+        print(f"⏳ {cache_file_name} başka bir iş parçacığında çekiliyor, sonucu bekleniyor...")
+        if not thread_lock.acquire(timeout=timeout):
+            raise TimeoutError(f"{cache_file_name} kilidi {timeout} sn içinde alınamadı")
+    try:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(LOCK_DIR, exist_ok=True)
+        lock_path = _lock_path(cache_file_name)
+        with open(lock_path, "a") as lock_file:
+            locked = _acquire_file_lock(lock_file, time.monotonic())
+            if not locked:
+                print(f"⏳ {cache_file_name} başka bir süreçte çekiliyor, sonucu bekleniyor...")
+                if not _acquire_file_lock(lock_file, deadline):
+                    raise TimeoutError(f"{cache_file_name} kilidi {timeout} sn içinde alınamadı")
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    finally:
+        thread_lock.release()
+
+
+def _refreshed_by_other(cache_file_name, seen_entry, expiry_minutes):
+    """
+    Kilit beklenirken kaydı başka biri yenilediyse yeni kaydı, aksi halde None döndürür.
+    Kayıt diskten (bellek katmanı atlanarak) yeniden okunur.
+    """
+    entry = load_entry(cache_file_name, bypass_memory=True)
+    if entry is None:
+        return None
+    if seen_entry is not None and entry['timestamp'] <= seen_entry['timestamp']:
+        return None
+    if datetime.now() - entry['timestamp'] >= timedelta(minutes=expiry_minutes):
+        return None
+    _memory.put(cache_file_name, entry)
+    return entry
+
+
+def _fetch_and_store(cache_file_name, fetch_function, conditional, validators, stale_data, keep_minutes):
+    """Veriyi çeker ve önbelleğe yazar. Çekme başarısızsa None döndürür."""
+    started = time.perf_counter()
+    try:
+        new_data = fetch_function(validators) if conditional else fetch_function()
+    except BaseException:
+        _record_fetch(cache_file_name, time.perf_counter() - started)
+        _count(cache_file_name, "failures")
+        raise
+    fetch_seconds = time.perf_counter() - started
+
+    if conditional:
+        if new_data is NOT_MODIFIED:
+            _count(cache_file_name, "not_modified")
+            if stale_data is None:
+                # Doğrulayıcı var ama veri yoksa 304'e güvenilemez; bir sonraki çalışmada tam istek yapılsın.
+                print(f"⚠️ 304 alındı ama önbellekte veri yok: {cache_file_name}")
+                return None
+            print(f"✅ Sunucuda değişiklik yok (304): {cache_file_name}")
+            new_data = stale_data
 
     # DÜZELTME: 'if new_data:' yerine 'if new_data is not None:' kullanılıyor.
     # Bu, boş liste [] veya boş string "" gibi sonuçların geçerli kabul edilmesini sağlar.
+    size = None
     if new_data is not None:
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                payload = {
-                    'timestamp': datetime.now().isoformat(),
-                    'data': new_data
-                }
-                json.dump(payload, f, ensure_ascii=False, indent=4)
+            size = save_entry(cache_file_name, new_data, validators, keep_minutes=keep_minutes)
             print(f"💾 Yeni veri önbelleğe kaydedildi: {cache_file_name}")
-            return new_data
         except Exception as e:
             print(f"❌ Önbellek yazma hatası: {e}")
-            return new_data
-            
+    else:
+        _count(cache_file_name, "failures")
+    _record_fetch(cache_file_name, fetch_seconds, size)
+    return new_data
+
+
+# --- Arka planda yenileme (stale-while-revalidate) ---
+_refresh_executor = None
+_refreshes_in_flight = {}
+_refresh_lock = threading.Lock()
+
+
+def _background_refresh(cache_file_name, fetch_function, conditional, seen_entry, expiry_minutes, keep_minutes):
+    try:
+        with key_lock(cache_file_name):
+            if _refreshed_by_other(cache_file_name, seen_entry, expiry_minutes) is not None:
+                return
+            validators = dict(seen_entry['validators'])
+            _count(cache_file_name, "background_refreshes")
+            if _fetch_and_store(cache_file_name, fetch_function, conditional, validators, seen_entry['data'], keep_minutes) is None:
+                print(f"⚠️ Arka plan yenilemesi veri döndürmedi: {cache_file_name}")
+    except Exception as e:
+        print(f"❌ Arka plan yenilemesi başarısız ({cache_file_name}): {e}")
+    finally:
+        with _refresh_lock:
+            _refreshes_in_flight.pop(cache_file_name, None)
+
+
+def _schedule_refresh(cache_file_name, fetch_function, conditional, seen_entry, expiry_minutes, keep_minutes):
+    """Anahtar için arka planda yenileme başlatır; zaten yenileniyorsa yenisini başlatmaz."""
+    global _refresh_executor
+    with _refresh_lock:
+        if cache_file_name in _refreshes_in_flight:
+            return
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=config.CACHE_REFRESH_WORKERS, thread_name_prefix="cache-refresh")
+        _refreshes_in_flight[cache_file_name] = _refresh_executor.submit(
+            _background_refresh, cache_file_name, fetch_function, conditional, seen_entry, expiry_minutes, keep_minutes
+        )
+
+
+def wait_for_background_refreshes(timeout=None):
+    """
+    Süren arka plan yenilemelerinin bitmesini bekler. Süreç kapanmadan önce çağrılmalıdır;
+    böylece yenilenen veri bir sonraki çalışmada taze olarak okunur.
+    """
+    global _refresh_executor
+    with _refresh_lock:
+        pending = list(_refreshes_in_flight.items())
+        executor, _refresh_executor = _refresh_executor, None
+    if pending:
+        print(f"⏳ {len(pending)} arka plan önbellek yenilemesi bekleniyor: {', '.join(name for name, _ in pending)}")
+        wait([future for _, future in pending], timeout=timeout)
+    if executor is not None:
+        executor.shutdown(wait=timeout is None)
+
+
+def get_cached_data(cache_file_name, fetch_function, expiry_minutes=15, conditional=False, max_stale_minutes=None):
+    """
+    Veriyi önbellekten alır veya gerekirse yeniden çeker.
+    Eğer yeniden çekme işlemi başarısız olursa (None dönerse), süresi dolmuş olsa bile
+    önbellekteki son geçerli veriyi döndürür. Boş liste ([]) gibi sonuçları
+    başarılı kabul eder ve önbelleğe kaydeder.
+
+    conditional=True ise fetch_function, kayıtla saklanan doğrulayıcıların bir kopyasını
+    (dict) argüman olarak alır. Fonksiyon bu sözlüğü yanıttaki yeni doğrulayıcılarla
+    günceller; sunucu 304 döndürürse NOT_MODIFIED döndürür ve önbellekteki veri tazelenmiş
+    sayılır.
+
+    max_stale_minutes verilirse (veya anahtar için config.CACHE_SWR_POLICIES'te tanımlıysa)
+    stale-while-revalidate uygulanır: expiry_minutes dolmuş ama max_stale_minutes dolmamış
+    bir kayıt hemen döndürülür ve arka planda yenilenir. max_stale_minutes da dolmuşsa
+    her zamanki gibi yeni veri beklenir.
+    """
+    if max_stale_minutes is None:
+        max_stale_minutes = config.CACHE_SWR_POLICIES.get(cache_file_name, {}).get("max_stale_minutes")
+    # Kaydın kullanılabilir olduğu en uzun süre; tahliye (sweep) bu süreyi esas alır.
+    keep_minutes = max(expiry_minutes, max_stale_minutes or 0)
+    _count(cache_file_name, "requests", expiry_minutes)
+
+    entry = load_entry(cache_file_name)
+    stale_data = None
+    validators = {}
+
+    if entry is not None:
+        stale_data = entry.get('data')
+        validators = dict(entry['validators'])
+        age = datetime.now() - entry['timestamp']
+        if age < timedelta(minutes=expiry_minutes):
+            print(f"✅ Önbellekten okundu: {cache_file_name} (Taze)")
+            _count(cache_file_name, "hits")
+            return stale_data
+        if max_stale_minutes is not None and stale_data is not None and age < timedelta(minutes=max_stale_minutes):
+            print(f"♻️ Bayat önbellek hemen kullanılıyor, arka planda yenilenecek: {cache_file_name}")
+            _count(cache_file_name, "stale_served")
+            _schedule_refresh(cache_file_name, fetch_function, conditional, entry, expiry_minutes, keep_minutes)
+            return stale_data
+        print(f"⚠️ Önbellek bayatlamış: {cache_file_name}. Yeniden çekilecek.")
+
+    try:
+        with key_lock(cache_file_name):
+            # Kilit beklenirken başka bir iş parçacığı/süreç veriyi yenilediyse onun sonucu kullanılır.
+            refreshed = _refreshed_by_other(cache_file_name, entry, expiry_minutes)
+            if refreshed is not None:
+                print(f"✅ Önbellek başka bir çekme tarafından yenilendi: {cache_file_name}")
+                _count(cache_file_name, "refreshed_by_other")
+                return refreshed['data']
+            print(f"🔄 Veri yeniden çekiliyor: {cache_file_name}...")
+            _count(cache_file_name, "misses")
+            new_data = _fetch_and_store(cache_file_name, fetch_function, conditional, validators, stale_data, keep_minutes)
+    except TimeoutError as e:
+        # Kilit hâlâ başka bir çekmedeyse veri yeniden çekilmez; varsa önbellekteki son veri kullanılır.
+        print(f"⚠️ {e}; veri yeniden çekilmeyecek.")
+        _count(cache_file_name, "lock_timeouts")
+        new_data = None
+    if new_data is not None:
+        return new_data
+
     if stale_data is not None:
         print(f"‼️ API/Çekme hatası! Bayatlamış önbellek kullanılıyor: {cache_file_name}")
+        _count(cache_file_name, "stale_fallbacks")
         return stale_data
 
     print(f"❌ Veri çekilemedi ve önbellekte de veri yok: {cache_file_name}")
-    return None
\ No newline at end of file
+    return None
+
+
+# --- Tahliye (eviction) ---
+# Kilit dosyaları (LOCK_DIR) silinmez: kilidi bekleyen bir süreç silinen dosyanın düğümünü
+# kilitlemeye devam ederken yeni bir süreç aynı yolda yeni dosya açar ve iki süreç de kilidi
+# tuttuğunu sanır. Dosyalar boştur ve sayıları anahtar sayısıyla sınırlıdır.
+
+def sweep(now=None, policy=None):
+    """
+    Önbelleği config.CACHE_EVICTION politikasına göre temizler:
+    1. Süresi (keep_minutes) expired_grace_hours'tan daha önce dolmuş kayıtlar silinir.
+    2. max_idle_days'ten uzun süredir okunmamış kayıtlar silinir.
+    3. Kalan kayıtlar max_entries / max_bytes sınırını aşıyorsa en uzun süredir
+       okunmamış olanlardan (LRU) başlayarak silinir.
+    Silinen kayıt sayısını ve boyutunu nedenlerine göre içeren bir rapor döndürür.
+    """
+    now = now or datetime.now()
+    policy = {**config.CACHE_EVICTION, **(policy or {})}
+    backend = get_backend()
+    _flush_accesses(backend)
+
+    records = backend.stats()
+    report = {'removed': {}, 'removed_entries': 0, 'removed_bytes': 0}
+
+    def evict(record, reason):
+        backend.delete(record['name'])
+        _memory.discard(record['name'])
+        counts = report['removed'].setdefault(reason, {'entries': 0, 'bytes': 0})
+        counts['entries'] += 1
+        counts['bytes'] += record['size']
+        report['removed_entries'] += 1
+        report['removed_bytes'] += record['size']
+
+    expired_before = now - timedelta(hours=policy['expired_grace_hours'])
+    idle_before = now - timedelta(days=policy['max_idle_days'])
+    remaining = []
+    for record in records:
+        if record['expires_at'] is not None and record['expires_at'] < expired_before:
+            evict(record, 'expired')
+        elif record['last_access'] < idle_before:
+            evict(record, 'idle')
+        else:
+            remaining.append(record)
+
+    remaining.sort(key=lambda record: record['last_access'])
+    total_bytes = sum(record['size'] for record in remaining)
+    while remaining and (len(remaining) > policy['max_entries'] or total_bytes > policy['max_bytes']):
+        record = remaining.pop(0)
+        total_bytes -= record['size']
+        evict(record, 'lru')
+
+    if report['removed_bytes'] >= policy['compact_min_bytes']:
+        backend.compact()
+
+    report['remaining_entries'] = len(remaining)
+    report['remaining_bytes'] = total_bytes
+    if report['removed_entries']:
+        reasons = ", ".join(f"{reason}: {counts['entries']}" for reason, counts in report['removed'].items())
+        print(f"🧹 Önbellekten {report['removed_entries']} kayıt silindi ({report['removed_bytes'] / 1024:.0f} KB; {reasons}). "
+              f"Kalan: {len(remaining)} kayıt, {total_bytes / 1024:.0f} KB.")
+    else:
+        print(f"🧹 Önbellekte silinecek kayıt yok. Toplam: {len(remaining)} kayıt, {total_bytes / 1024:.0f} KB.")
+    return report
+
+
+def prune(keep_patterns=None):
+    """
+    Adı keep_patterns'taki (varsayılan: config.CACHE_PERSISTED_KEYS) desenlerden hiçbirine
+    uymayan kayıtları siler ve silinen kayıt sayısını döndürür.
+    """
+    keep_patterns = config.CACHE_PERSISTED_KEYS if keep_patterns is None else keep_patterns
+    backend = get_backend()
+    removed = 0
+    for name in backend.names():
+        if not any(fnmatch.fnmatchcase(name, pattern) for pattern in keep_patterns):
+            backend.delete(name)
+            _memory.discard(name)
+            removed += 1
+    if removed:
+        backend.compact()
+    print(f"🧹 Önbellekte yalnızca kalıcı kayıtlar bırakıldı: {removed} kayıt silindi.")
+    return removed
+
+
+def export_json(target_dir, names=None):
+    """
+    Önbellek kayıtlarını hata ayıklama için okunabilir JSON dosyaları olarak dışa aktarır.
+    names verilmezse tüm kayıtlar aktarılır. datetime gibi tipler etiketli JSON ile yazılır.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    backend = get_backend()
+    exported = 0
+    for name in names or backend.names():
+        entry = backend.load(name)
+        if entry is None:
+            continue
+        file_name = name if name.endswith('.json') else f"{name}.json"
+        payload = {**entry, 'timestamp': entry['timestamp'].isoformat()}
+        with open(os.path.join(target_dir, file_name), 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=4, default=_json_default)
+        exported += 1
+    print(f"💾 {exported} önbellek kaydı JSON olarak dışa aktarıldı: {target_dir}")
+    return exported
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Önbellek kayıtlarını okunabilir JSON olarak dışa aktarır.")
+    parser.add_argument("target_dir", nargs="?", help="JSON dosyalarının yazılacağı klasör")
+    parser.add_argument("names", nargs="*", help="Yalnızca bu anahtarları aktar")
+    parser.add_argument("--metrics", action="store_true", help="Önbellek ölçüm geçmişinin anahtar bazında özetini yazdır")
+    parser.add_argument("--prune", action="store_true", help="config.CACHE_PERSISTED_KEYS dışındaki kayıtları sil")
+    args = parser.parse_args()
+    if args.prune:
+        try:
+            prune()
+        finally:
+            close()
+    elif args.metrics:
+        summarize_metrics_history()
+    elif args.target_dir:
+        export_json(args.target_dir, args.names)
+    else:
+        parser.error("target_dir, --metrics veya --prune gerekli")
@@ -63,6 +63,112 @@ SPOTIFY_PLAYLIST_TRACKS_URL = f"https://api.spotify.com/v1/playlists/{SPOTIFY_PL
 
 
 
+# --- ÖNBELLEK AYARLARI ---
+# Disk katmanı: "sqlite" (tek veritabanı, WAL modu) veya "file" (anahtar başına bir JSON dosyası).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite")
+# Bellek içi LRU katmanında tutulacak en fazla kayıt sayısı (0 ise bellek katmanı kapalıdır).
+CACHE_MEMORY_ENTRIES = 256
+# Bu boyuttan (bayt) büyük önbellek değerleri zstandard kuruluysa sıkıştırılarak yazılır.
+CACHE_COMPRESS_MIN_BYTES = 2048
+CACHE_COMPRESS_LEVEL = 3
+# Stale-while-revalidate: süresi (expiry_minutes) dolmuş ama max_stale_minutes'ı aşmamış kayıtlar
+# beklemeden kullanılır ve arka planda yenilenir. Bu sınırı aşan kayıtlar için yeni veri beklenir.
+CACHE_SWR_POLICIES = {
+    "trends.json": {"max_stale_minutes": 60},
+    "ticketmaster_events.json": {"max_stale_minutes": 240},
+}
+# Arka plan yenilemelerini çalıştıran iş parçacığı sayısı.
+CACHE_REFRESH_WORKERS = 4
+# Aynı anahtarı başka bir iş parçacığı/süreç çekerken en fazla bekleme süresi (saniye).
+CACHE_LOCK_TIMEOUT = 300
+# Çalışma sonunda uygulanan önbellek temizliği (cache_manager.sweep):
+# expired_grace_hours: Süresi dolan kayıtlar, hata durumunda bayat veri olarak kullanılabilsin diye
+#                      bu kadar saat daha tutulur.
+# max_idle_days: Bu kadar gün okunmamış kayıtlar silinir (örn. artık çekilmeyen akışlar).
+# max_entries / max_bytes: Sınır aşılırsa en uzun süredir okunmamış kayıtlardan başlanarak silinir.
+# compact_min_bytes: En az bu kadar veri silindiyse veritabanı dosyası küçültülür (VACUUM).
+CACHE_EVICTION = {
+    "expired_grace_hours": 24,
+    "max_idle_days": 14,
+    "max_entries": 2000,
+    "max_bytes": 50 * 1024 * 1024,
+    "compact_min_bytes": 1024 * 1024,
+}
+# cache/metrics/history.jsonl'de tutulan çalışma sayısı (3 saatte bir çalışmada ~1 ay).
+CACHE_METRICS_HISTORY_RUNS = 200
+# CI çalışmaları arasında taşınan kayıtlar (fnmatch desenleri). İş akışı çalışma sonunda
+# `python cache_manager.py --prune` ile diğer kayıtları siler; böylece yalnızca koşullu
+# isteklerin ihtiyaç duyduğu RSS akış durumu ve doğrulayıcılı kayıtlar korunur, Gemini
+# çıktıları ve kazıyıcı sonuçları her çalışmada yeniden üretilir.
+CACHE_PERSISTED_KEYS = ("feed_*.json", "movies.json")
+
+
+# --- HABER ANALİZİ AYARLARI ---
+# Başlıkları gruplamak için kullanılan çok dilli embedding modeli.
+EMBEDDING_MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+# Modelin çalıştırılacağı katman: "torch" (sentence-transformers), "onnx" veya "onnx-int8"
+# (onnxruntime; requirements-onnx.txt ile kurulur, dosyalar 'python -m analysis.embedding_backends
+# export' ile üretilir). ONNX katmanı yüklenemezse torch kullanılır.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_DIR = Path(__file__).resolve().parent / ".models" / EMBEDDING_MODEL_NAME
+# onnxruntime iş parçacığı sayısı (0: onnxruntime'ın varsayılanı, tüm çekirdekler).
+EMBEDDING_ONNX_THREADS = int(os.getenv("EMBEDDING_ONNX_THREADS", "0"))
+# Yeni başlıklar modele bu büyüklükte gruplar halinde verilir.
+EMBEDDING_BATCH_SIZE = 64
+# Diskteki başlık vektörü deposunda tutulacak en fazla satır (384 boyutta ~1.5 KB/satır).
+EMBEDDING_STORE_MAX_ROWS = 20000
+# Başlık kümelemede skor matrisi bu kadar satırlık bloklar halinde hesaplanır
+# (bellek: blok × başlık sayısı × 4 bayt).
+CLUSTER_BLOCK_SIZE = 1024
+# Kalıcı hikâye kümeleri (analysis.story_clusters):
+# revision_min_new / revision_growth: Hikâyeye son revizyondan beri en az revision_min_new ve
+#     revizyondaki üye sayısının revision_growth katı kadar yeni haber katılınca revizyon artar
+#     ve hikâyenin analizi yeniden üretilir.
+# retention_hours: Bu süre boyunca yeni haber görülmeyen hikâyeler (ve hikâyeden düşen
+#     haberler) silinir.
+STORY_CLUSTER_POLICY = {
+    "revision_min_new": 2,
+    "revision_growth": 0.5,
+    "retention_hours": 48,
+}
+# Hikâye analizlerinin önbellek süresi (dakika). Anahtar revizyonu içerdiğinden bu süre
+# yalnızca aynı revizyonun analizinin ne kadar süre yeniden kullanılacağını belirler.
+STORY_ANALYSIS_CACHE_MINUTES = 180
+
+
+# --- HTTP İSTEMCİ AYARLARI ---
+# Tüm API ve düz HTTP isteklerinde kullanılan varsayılan zaman aşımları (saniye).
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 15
+# Paylaşılan HTTP istemcilerinin varsayılan User-Agent'ı. Haber sitelerinin CDN'leri
+# "python-requests" / "python-httpx" gibi kütüphane kimliklerine sıklıkla 403 döndürür.
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+# Bağlantı hatası, 429 ve 5xx yanıtlarında yapılacak en fazla yeniden deneme sayısı
+# ve artan bekleme katsayısı (0.5 -> 0.5 sn, 1 sn, 2 sn ...).
+HTTP_RETRY_TOTAL = 2
+HTTP_RETRY_BACKOFF = 0.5
+# Bağlantı havuzu: kaç farklı sunucu için havuz tutulacağı ve sunucu başına en fazla bağlantı.
+HTTP_POOL_CONNECTIONS = 20
+HTTP_POOL_MAXSIZE = 10
+# Asenkron fetcher'larda aynı sunucuya aynı anda gönderilebilecek en fazla istek sayısı.
+HTTP_MAX_CONCURRENCY_PER_HOST = 6
+# urllib3'ün deneysel HTTP/2 desteği (urllib3>=2.3 ve h2 paketi gerekir).
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "0") == "1"
+
+
+# --- RSS AKIŞ DURUMU ---
+# Akıştan düşen girdilerin işlenmiş haliyle indekste tutulacağı süre (saat).
+RSS_RETENTION_HOURS = 72
+# Tek bir akışın indirilip ayrıştırılması için tanınan toplam süre (saniye, yeniden denemeler dahil).
+RSS_FEED_TIMEOUT = 20
+# Akışların yoklama aralığı, yayın sıklığından öğrenilir ve bu sınırlar (dakika) içinde tutulur.
+# Sık yayın yapan akışlar en kısa aralıkla, sessiz akışlar en uzun aralığa kadar seyrek yoklanır.
+RSS_POLL_DEFAULTS = {"min_minutes": 30, "max_minutes": 720}
+RSS_POLL_POLICIES = {
+    "https://www.sanattanyansimalar.com/rss.xml": {"max_minutes": 1440},
+}
+
+
 # 📌 KATEGORİLERE GÖRE RSS ADRESLERİ
 RSS_FEEDS = {
     "Gündem": [
@@ -107,6 +213,69 @@ SPORT_LEAGUES_CONFIG = [
     ("basketbol/turkiye/super-lig", "Süper Lig (Basketbol)")
     ]
 
+# Fikstürler lig bazında ayrı ayrı önbelleğe alınır. Süreler dakika cinsindendir;
+# "matchdays" ligin genellikle maç oynanan günleridir (datetime.weekday(): 0=Pazartesi).
+# Maç günlerinde fikstür daha sık değiştiği için "matchday_ttl" kullanılır.
+SPORT_LEAGUE_CACHE_DEFAULTS = {"ttl": 120, "matchday_ttl": 30, "matchdays": ()}
+SPORT_LEAGUE_CACHE_POLICIES = {
+    "Premier League": {"matchdays": (5, 6)},
+    "La Liga": {"matchdays": (4, 5, 6)},
+    "Süper Lig": {"matchdays": (4, 5, 6, 0)},
+    "Şampiyonlar Ligi": {"matchdays": (1, 2)},
+    "Süper Lig (Basketbol)": {"matchdays": (5, 6), "ttl": 180},
+}
+
+
+# --- TARAYICI HAVUZU AYARLARI ---
+# Selenium kazıyıcılarının aynı anda kullanabileceği en fazla Chrome örneği sayısı.
+# Her örnek ayrı bir süreç olduğu için bellek kullanımı bu sayıyla artar.
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+# Havuzdan sürücü almak için en fazla bekleme süresi (saniye). Süre dolarsa kazıyıcı
+# başarısız sayılır ve önbellekteki son veri kullanılır.
+BROWSER_CHECKOUT_TIMEOUT = 300
+
+# Chrome ana sürümü. undetected_chromedriver bu sürüme uygun chromedriver'ı indirip yamalar.
+# CHROME ESKİ SÜRÜME GERİ DÖNMEK GEREKİRSE (örn. 137) burası değiştirilebilir.
+CHROME_VERSION_MAIN = 145
+
+# Kalıcı tarayıcı durumu: yamalı chromedriver dosyası ve her havuz çalışanı için ayrı
+# bir Chrome profili (çerezler, site önbelleği). Kapatmak için BROWSER_PERSISTENT_PROFILE=0.
+BROWSER_PERSISTENT_PROFILE = os.getenv("BROWSER_PERSISTENT_PROFILE", "1") == "1"
+BROWSER_STATE_DIR = Path(__file__).resolve().parent / ".browser"
+CHROME_PROFILE_DIR = BROWSER_STATE_DIR / "profiles"
+CHROMEDRIVER_CACHE_DIR = BROWSER_STATE_DIR / "chromedriver"
+
+# Kazıyıcılar yalnızca DOM metnini ve birkaç src niteliğini okuduğu için, sayfa
+# DOMContentLoaded olayında hazır kabul edilir (bekleme işini WebDriverWait yapar).
+BROWSER_PAGE_LOAD_STRATEGY = "eager"
+
+# Tarayıcıda engellenebilecek kaynak türleri ve bunlara karşılık gelen URL kalıpları.
+# Kalıplar Chrome DevTools'un Network.setBlockedURLs komutuna verilir ('*' joker karakterdir).
+# Uzantı kalıpları ("*.png" gibi) sorgu parametreli adresleri de kapsayacak şekilde genişletilir.
+BROWSER_BLOCK_PATTERNS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg"],
+    "trackers": [
+        "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+        "*googlesyndication.com*", "*adservice.google.*", "*facebook.net*",
+        "*connect.facebook.*", "*hotjar.com*", "*criteo.*", "*scorecardresearch.com*",
+        "*taboola.com*", "*outbrain.com*", "*yandex.ru/metrika*", "*mc.yandex.*",
+        "*adform.net*", "*quantserve.com*",
+    ],
+}
+
+# Hangi kazıyıcının hangi kaynak türlerini engelleyeceği (fonksiyon adına göre).
+# Resimleri engellemek yalnızca resim baytlarının indirilmesini durdurur; img etiketlerinin
+# src/data-src nitelikleri DOM'da kalır. Zorlu PSM veya kitap kapakları için URL'ler
+# okunamaz hale gelirse ilgili satırdan "images" çıkarılabilir.
+SCRAPER_BLOCK_PROFILES = {
+    "fetch_books": ("images", "fonts", "media", "trackers"),
+    "fetch_istanbul_events": ("images", "fonts", "media", "trackers"),
+    "get_daily_ratings": ("images", "fonts", "media", "trackers"),
+    "get_flashscore_sport_fixtures": ("images", "fonts", "media", "trackers"),
+}
+
 
 # --- WEB SCRAPING SEÇİCİLERİ (SELECTORS) ---
 
@@ -130,6 +299,10 @@ ZORLU_CATEGORY_SELECTOR = "div.event-list-card-item-header"
 # --- TIAK Reytingleri ---
 # Not: TIAK sitesi sık sık değiştiği için bu seçiciler güncelliğini yitirebilir.
 TIAK_URL = "https://tiak.com.tr/tablolar"
+# #tablo içeriği sayfaya AJAX ile yükleniyor. Tarayıcının ağ (network) sekmesinde bu isteğin
+# adresi tespit edilirse buraya yazılabilir; böylece reytingler tarayıcı açılmadan düz HTTP
+# ile okunur. None ise HTTP yolu atlanır ve doğrudan Selenium kullanılır.
+TIAK_TABLE_AJAX_URL = os.getenv("TIAK_TABLE_AJAX_URL") or None
 # TIAK_GUNLUK_BUTON_XPATH = "//button[@data-bs-target='#gunluk']" # Günlük sekmesinin yeni XPATH'i
 # TIAK_TABLE_CONTAINER_ID = "gunluk" # Tablonun içinde bulunduğu div'in yeni ID'si
 
@@ -2,8 +2,15 @@
 """
 API'ler üzerinden veri çeken fonksiyonları içerir.
 (OpenWeatherMap, TMDB, ExchangeRate, RSS, Spotify vb.)
+
+API kaynakları asenkrondur (`*_async`, httpx) ve http_client'ın paylaşılan olay döngüsünde
+çalışır; fetch_all_async hepsini tek seferde eşzamanlı çeker. Senkron koddan tek bir kaynak
+gerekirse http_client.run_async(...) ile çağrılır. RSS akışlarının asenkron okuması
+rss_engine modülündedir; buradaki fetch_rss_feed feedparser tabanlı senkron sürümdür.
 """
+import asyncio
 import requests
+import httpx
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone, timedelta
 import feedparser
@@ -14,8 +21,43 @@ import json
 
 # Ana dizindeki config dosyasını import ediyoruz
 import config
+from cache_manager import NOT_MODIFIED
+from data_fetchers import feed_store, http_client
+
+def _parse_weather(data, limit):
+    """OpenWeatherMap tahmin yanıtını (saat, sıcaklık, açıklama, ikon, css sınıfı) listesine dönüştürür."""
+    if "list" not in data:
+        print(f"⚠️ Hava durumu verisi alınamadı (API yanıtı eksik): {data.get('message', 'Detay yok')}")
+        return []
 
-def get_hourly_weather(limit=8):
+    hourly_forecast = []
+    for forecast_item in data["list"]:
+        if len(hourly_forecast) >= limit:
+            break
+        try:
+            utc_dt = datetime.fromtimestamp(forecast_item["dt"], tz=timezone.utc)
+            local_dt = utc_dt + timedelta(hours=config.TIME_OFFSET_HOURS)
+            time_str = local_dt.strftime("%H:%M")
+            temp = forecast_item["main"]["temp"]
+            description = forecast_item["weather"][0]["description"].capitalize()
+            icon_code = forecast_item["weather"][0].get("icon")
+            icon_url = f"https://openweathermap.org/img/wn/{icon_code}@2x.png" if icon_code else "https://via.placeholder.com/50"
+
+            weather_class = "default-weather"
+            desc_lower = description.lower()
+            if any(s in desc_lower for s in ["açık", "güneşli", "clear"]): weather_class = "sunny"
+            elif any(s in desc_lower for s in ["yağmur", "sağanak", "rain", "shower"]): weather_class = "rainy"
+            elif any(s in desc_lower for s in ["kar", "snow"]): weather_class = "snowy"
+            elif any(s in desc_lower for s in ["bulut", "kapalı", "cloud"]): weather_class = "cloudy"
+
+            hourly_forecast.append((time_str, temp, description, icon_url, weather_class))
+        except (KeyError, IndexError) as e_item:
+            print(f"⚠️ Hava durumu tahmini öğesi ayrıştırılamadı: {e_item} - {forecast_item}")
+            continue
+    print(f"✅ {config.WEATHER_CITY} için {len(hourly_forecast)} saatlik hava durumu tahmini çekildi.")
+    return hourly_forecast
+
+async def get_hourly_weather_async(limit=8):
     """OpenWeatherMap API'den saatlik hava durumu tahminlerini çeker."""
     if not config.OPENWEATHER_API_KEY:
         print("⚠️ OpenWeatherMap API anahtarı bulunamadı.")
@@ -23,192 +65,217 @@ def get_hourly_weather(limit=8):
 
     print(f"ℹ️ {config.WEATHER_CITY} için hava durumu çekiliyor...")
     try:
-        # URL ve diğer ayarlar config dosyasından alınır
-        response = requests.get(config.OPENWEATHER_FORECAST_URL, timeout=10)
+        response = await http_client.async_get(config.OPENWEATHER_FORECAST_URL)
         response.raise_for_status()
-        data = response.json()
-
-        if "list" not in data:
-            print(f"⚠️ Hava durumu verisi alınamadı (API yanıtı eksik): {data.get('message', 'Detay yok')}")
-            return []
-
-        hourly_forecast = []
-        for forecast_item in data["list"]:
-            if len(hourly_forecast) >= limit:
-                break
-            try:
-                utc_dt = datetime.fromtimestamp(forecast_item["dt"], tz=timezone.utc)
-                local_dt = utc_dt + timedelta(hours=config.TIME_OFFSET_HOURS)
-                time_str = local_dt.strftime("%H:%M")
-                temp = forecast_item["main"]["temp"]
-                description = forecast_item["weather"][0]["description"].capitalize()
-                icon_code = forecast_item["weather"][0].get("icon")
-                icon_url = f"https://openweathermap.org/img/wn/{icon_code}@2x.png" if icon_code else "https://via.placeholder.com/50"
-
-                weather_class = "default-weather"
-                desc_lower = description.lower()
-                if any(s in desc_lower for s in ["açık", "güneşli", "clear"]): weather_class = "sunny"
-                elif any(s in desc_lower for s in ["yağmur", "sağanak", "rain", "shower"]): weather_class = "rainy"
-                elif any(s in desc_lower for s in ["kar", "snow"]): weather_class = "snowy"
-                elif any(s in desc_lower for s in ["bulut", "kapalı", "cloud"]): weather_class = "cloudy"
-
-                hourly_forecast.append((time_str, temp, description, icon_url, weather_class))
-            except (KeyError, IndexError) as e_item:
-                print(f"⚠️ Hava durumu tahmini öğesi ayrıştırılamadı: {e_item} - {forecast_item}")
-                continue
-        print(f"✅ {config.WEATHER_CITY} için {len(hourly_forecast)} saatlik hava durumu tahmini çekildi.")
-        return hourly_forecast
-    except requests.exceptions.RequestException as e:
+        return _parse_weather(response.json(), limit)
+    except httpx.HTTPError as e:
         print(f"⚠️ OpenWeatherMap API Hatası: {e}")
         return []
-    except (KeyError, TypeError):
+    except (KeyError, TypeError, ValueError):
         print("⚠️ OpenWeatherMap API yanıt formatı beklenmedik.")
         return []
 
-def fetch_movies(limit=10):
-    """TMDB API'den vizyondaki filmleri çeker."""
+def _parse_movies(data, limit):
+    movies = data.get("results", [])
+    print(f"✅ TMDB'den {len(movies[:limit])} film çekildi.")
+    return movies[:limit]
+
+async def fetch_movies_async(limit=10, validators=None):
+    """
+    TMDB API'den vizyondaki filmleri çeker.
+    validators verilirse (bkz. cache_manager.get_cached_data(conditional=True)) koşullu istek
+    yapılır; liste değişmemişse NOT_MODIFIED döner.
+    İstek veya yanıt hatalıysa None döner: önbellekteki son liste kullanılır ve doğrulayıcılar
+    boş bir listeyle birlikte kaydedilmez (aksi halde sonraki 304'ler boş listeyi yaşatırdı).
+    """
     if not config.TMDB_API_KEY:
         print("⚠️ TMDB API anahtarı bulunamadı.")
         return []
-        
+
     print("ℹ️ Vizyondaki filmler (TMDB) çekiliyor...")
     try:
-        response = requests.get(config.TMDB_API_URL, timeout=10)
+        response = await http_client.async_get(config.TMDB_API_URL, headers=http_client.conditional_headers(validators or {}))
+        if response.status_code == 304:
+            return NOT_MODIFIED
         response.raise_for_status()
-        data = response.json()
-        movies = data.get("results", [])
-        print(f"✅ TMDB'den {len(movies[:limit])} film çekildi.")
-        return movies[:limit]
-    except requests.exceptions.RequestException as e:
+        movies = _parse_movies(response.json(), limit)
+        if validators is not None:
+            http_client.update_validators(validators, response)
+        return movies
+    except httpx.HTTPError as e:
         print(f"⚠️ TMDB API isteği başarısız oldu: {e}")
-        return []
-    except KeyError:
+        return None
+    except (KeyError, ValueError, AttributeError):
         print("⚠️ TMDB API yanıt formatı beklenmedik.")
-        return []
+        return None
+
+def _parse_exchange_rates(data):
+    """USD bazlı kur yanıtından USD/EUR/GBP - TRY kurlarını hesaplar."""
+    rates = data.get("rates", {})
+    usd_to_try = rates.get("TRY")
+    if not usd_to_try:
+        print("⚠️ Döviz kuru verisi alınamadı veya TRY kuru eksik.")
+        return {}
 
-def get_exchange_rates():
+    eur_to_usd = rates.get("EUR", 0)
+    gbp_to_usd = rates.get("GBP", 0)
+
+    currency_rates = {
+        "USDTRY": round(usd_to_try, 2),
+        "EURTRY": round(usd_to_try / eur_to_usd, 2) if eur_to_usd else "N/A",
+        "GBPTRY": round(usd_to_try / gbp_to_usd, 2) if gbp_to_usd else "N/A",
+    }
+    print(f"✅ Döviz kurları çekildi: {currency_rates}")
+    return currency_rates
+
+async def get_exchange_rates_async():
     """USD bazlı temel döviz kurlarını çeker."""
     print("ℹ️ Döviz kurları çekiliyor...")
     try:
-        response = requests.get(config.EXCHANGE_RATE_API_URL, timeout=10)
+        response = await http_client.async_get(config.EXCHANGE_RATE_API_URL)
         response.raise_for_status()
-        data = response.json()
-
-        rates = data.get("rates", {})
-        usd_to_try = rates.get("TRY")
-        if not usd_to_try:
-            print("⚠️ Döviz kuru verisi alınamadı veya TRY kuru eksik.")
-            return {}
-
-        eur_to_usd = rates.get("EUR", 0)
-        gbp_to_usd = rates.get("GBP", 0)
-
-        currency_rates = {
-            "USDTRY": round(usd_to_try, 2),
-            "EURTRY": round(usd_to_try / eur_to_usd, 2) if eur_to_usd else "N/A",
-            "GBPTRY": round(usd_to_try / gbp_to_usd, 2) if gbp_to_usd else "N/A",
-        }
-        print(f"✅ Döviz kurları çekildi: {currency_rates}")
-        return currency_rates
-    except requests.exceptions.RequestException as e:
+        return _parse_exchange_rates(response.json())
+    except httpx.HTTPError as e:
         print(f"⚠️ Döviz kuru API hatası: {e}")
         return {}
-    except (KeyError, TypeError):
+    except (KeyError, TypeError, ValueError):
         print("⚠️ Döviz kuru API yanıt formatı beklenmedik.")
         return {}
 
+def _entry_guid(entry):
+    """Girdiyi çalışmalar arasında tanımlayan anahtar: guid/id, yoksa bağlantı, o da yoksa başlık."""
+    return entry.get('id') or entry.get('link') or entry.get('title', '')
+
+def _parse_rss_feed(content, content_type="", known_items=None):
+    """
+    İndirilmiş RSS/Atom baytlarını [(guid, haber), ...] listesine dönüştürür ve tarihleri parse eder.
+    known_items ({guid: haber}) içindeki girdiler yeniden temizlenmez, saklanan haliyle kullanılır.
+    """
+    known_items = known_items or {}
+    # Sunucu içerik türü bildirmediyse başlık geçilmez; boş değer feedparser'da bozo'ya yol açar.
+    feed = feedparser.parse(content, response_headers={"content-type": content_type} if content_type else None)
+    if feed.bozo:
+        # bozo=1 ise feed düzgün parse edilememiştir.
+        raise Exception(f"RSS formatı bozuk - {feed.bozo_exception}")
+
+    source_name = feed.feed.title
+    parsed_entries = []
+    new_count = 0
+    for entry in feed.entries:
+        guid = _entry_guid(entry)
+        if guid in known_items:
+            parsed_entries.append((guid, known_items[guid]))
+            continue
+
+        # Tarih bilgisini parse etmeye çalış
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            # feedparser'ın parse ettiği time.struct_time'ı datetime nesnesine çevir
+            parsed_date = datetime.fromtimestamp(time.mktime(entry.published_parsed), tz=timezone.utc)
+        else:
+            # Eğer tarih bilgisi yoksa, şu anki zamanı UTC olarak kullan
+            parsed_date = datetime.now(timezone.utc)
+
+        summary_soup = BeautifulSoup(entry.summary, 'html.parser')
+        summary = summary_soup.get_text(separator=' ', strip=True)
+
+        parsed_entries.append((guid, {
+            'source': source_name,
+            'title': entry.title,
+            'link': entry.link,
+            'summary': summary,
+            'pub_date': entry.get('published', 'Tarih yok'),
+            'pub_date_parsed': parsed_date  # SIRALAMA İÇİN GEREKLİ ANAHTAR
+        }))
+        new_count += 1
+    print(f"✅ {source_name}: {len(parsed_entries)} girdi ({new_count} yeni).")
+    return parsed_entries
+
 def fetch_rss_feed(url):
-    """Verilen RSS URL'sinden haberleri çeker ve tarihleri parse eder."""
+    """
+    Verilen RSS URL'sinden haberleri çeker ve tarihleri parse eder.
+    Önceki çalışmadan kalan ETag / Last-Modified ile koşullu istek yapılır; akış
+    değişmemişse (304) saklanan haberler döndürülür. Akışın yayın sıklığına göre
+    planlanan yoklama vakti gelmemişse hiç istek yapılmaz.
+    """
     try:
+        state = feed_store.load_feed_state(url)
+        cached_items = feed_store.items_if_not_due(url, state)
+        if cached_items is not None:
+            return cached_items
+
         print(f"📰 RSS okunuyor: {url}")
-        feed = feedparser.parse(url)
-        if feed.bozo:
-            # bozo=1 ise feed düzgün parse edilememiştir.
-            raise Exception(f"RSS formatı bozuk - {feed.bozo_exception}")
-
-        source_name = feed.feed.title
-        news_items = []
-        for entry in feed.entries:
-            # Tarih bilgisini parse etmeye çalış
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                # feedparser'ın parse ettiği time.struct_time'ı datetime nesnesine çevir
-                parsed_date = datetime.fromtimestamp(time.mktime(entry.published_parsed), tz=timezone.utc)
-            else:
-                # Eğer tarih bilgisi yoksa, şu anki zamanı UTC olarak kullan
-                parsed_date = datetime.now(timezone.utc)
-
-            summary_soup = BeautifulSoup(entry.summary, 'html.parser')
-            summary = summary_soup.get_text(separator=' ', strip=True)
-
-            news_items.append({
-                'source': source_name,
-                'title': entry.title,
-                'link': entry.link,
-                'summary': summary,
-                'pub_date': entry.get('published', 'Tarih yok'),
-                'pub_date_parsed': parsed_date  # SIRALAMA İÇİN GEREKLİ ANAHTAR
-            })
-        return news_items
+        # Akış, zaman aşımı ve yeniden deneme içeren paylaşılan istemciyle indirilir;
+        # feedparser yalnızca gelen baytları ayrıştırır.
+        response = http_client.get(url, headers=feed_store.request_headers(state))
+        if response.status_code == 304:
+            return feed_store.reuse_unchanged(url, state)
+        response.raise_for_status()
+        parsed_entries = _parse_rss_feed(response.content, response.headers.get("content-type", ""), feed_store.known_items(state))
+        return feed_store.store_response(url, state, parsed_entries, response)
     except Exception as e:
         print(f"❌ RSS okuma hatası ({url}): {e}")
         return None
 
-def get_spotify_token():
+async def get_spotify_token_async():
     """Spotify API için erişim token'ı alır veya yeniler."""
     if not all([config.SPOTIFY_CLIENT_ID, config.SPOTIFY_CLIENT_SECRET, config.SPOTIFY_REFRESH_TOKEN]):
         print("⚠️ Spotify API kimlik bilgileri (.env dosyasında) eksik.")
         return None
 
     try:
-        response = requests.post(config.SPOTIFY_TOKEN_URL, data={
+        response = await http_client.async_post(config.SPOTIFY_TOKEN_URL, data={
             "grant_type": "refresh_token",
             "refresh_token": config.SPOTIFY_REFRESH_TOKEN,
         }, auth=(config.SPOTIFY_CLIENT_ID, config.SPOTIFY_CLIENT_SECRET))
 
         response.raise_for_status()
-        new_token = response.json()["access_token"]
-        return new_token
-    except requests.exceptions.RequestException as e:
+        return response.json()["access_token"]
+    except httpx.HTTPError as e:
         print(f"⚠️ Spotify token yenileme hatası: {e}")
         return None
-    except KeyError:
+    except (KeyError, ValueError):
         print("⚠️ Spotify API yanıtında 'access_token' bulunamadı.")
         return None
 
-def get_new_turkish_rap_tracks_embed(limit=10):
+def get_spotify_token():
+    """get_spotify_token_async'i paylaşılan olay döngüsünde çalıştıran senkron sarmalayıcı."""
+    return http_client.run_async(get_spotify_token_async())
+
+def _parse_spotify_tracks(items, limit):
+    """Çalma listesi öğelerinden gömülebilir (embed) parça bilgilerini çıkarır."""
+    rap_tracks = []
+    for item in items:
+        if len(rap_tracks) >= limit:
+            break
+        track = item.get("track")
+        if not track or not track.get("id"):
+            continue
+
+        name = track.get("name", "Bilinmeyen Şarkı")
+        artists = ", ".join([a.get("name", "Bilinmeyen Sanatçı") for a in track.get("artists", [])])
+        track_id = track["id"]
+        embed_url = f"https://open.spotify.com/embed/track/{track_id}"
+        rap_tracks.append({"artist": artists, "title": name, "embed_url": embed_url})
+
+    print(f"✅ Spotify'dan {len(rap_tracks)} parça çekildi.")
+    return rap_tracks
+
+async def get_new_turkish_rap_tracks_embed_async(limit=10):
     """Belirli bir Spotify çalma listesinden parçaları çeker."""
     print("ℹ️ Spotify parça listesi çekiliyor...")
-    token = get_spotify_token()
+    token = await get_spotify_token_async()
     if not token:
         return []
 
     headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.get(config.SPOTIFY_PLAYLIST_TRACKS_URL, headers=headers)
+        response = await http_client.async_get(config.SPOTIFY_PLAYLIST_TRACKS_URL, headers=headers)
         response.raise_for_status()
-        items = response.json().get("items", [])
-
-        rap_tracks = []
-        for item in items:
-            if len(rap_tracks) >= limit:
-                break
-            track = item.get("track")
-            if not track or not track.get("id"):
-                continue
-
-            name = track.get("name", "Bilinmeyen Şarkı")
-            artists = ", ".join([a.get("name", "Bilinmeyen Sanatçı") for a in track.get("artists", [])])
-            track_id = track["id"]
-            embed_url = f"https://open.spotify.com/embed/track/{track_id}"
-            rap_tracks.append({"artist": artists, "title": name, "embed_url": embed_url})
-
-        print(f"✅ Spotify'dan {len(rap_tracks)} parça çekildi.")
-        return rap_tracks
-
-    except requests.exceptions.RequestException as e:
+        return _parse_spotify_tracks(response.json().get("items", []), limit)
+    except httpx.HTTPError as e:
         print(f"⚠️ Spotify API parça çekme hatası: {e}")
         return []
-    except KeyError:
+    except (KeyError, ValueError):
         print("⚠️ Spotify API yanıt formatı beklenmedik.")
         return []
     
@@ -230,7 +297,7 @@ def get_popular_artists_from_spotify(playlist_id, limit=50):
     params = {'limit': limit, 'fields': 'items(track(artists(name)))'} # Sadece ihtiyacımız olan veriyi çekiyoruz
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = http_client.get(url, headers=headers, params=params)
         response.raise_for_status()
         items = response.json().get("items", [])
 
@@ -255,68 +322,58 @@ def get_popular_artists_from_spotify(playlist_id, limit=50):
 
 
 
-def fetch_ticketmaster_events(limit=10, city=None, get_popular_and_sort_by_date=False):
-    """
-    Ticketmaster API'sini hibrit bir strateji ile kullanır.
-    Popülerliği belirlemek için MEKAN BÜYÜKLÜĞÜ ve BİLET FİYATINI baz alan gelişmiş bir puanlama sistemi kullanır.
-    Benzer isimli etkinlikleri akıllı bir şekilde gruplayarak tekrarları engeller.
-    """
-    if not config.TICKETMASTER_API_KEY:
-        print("⚠️ Ticketmaster API anahtarı bulunamadı.")
-        return []
-
-    print("ℹ️ Ticketmaster etkinlikleri çekiliyor (Nihai Strateji v3)...")
-    base_url = "https://app.ticketmaster.com/discovery/v2/events.json"
-    all_fetched_events = {} # Tekrarları normalleştirilmiş isme göre temizlemek için {normalized_name: event_data}
+TICKETMASTER_EVENTS_URL = "https://app.ticketmaster.com/discovery/v2/events.json"
 
-    def normalize_event_name(name):
-        """Etkinlik ismini basitleştirerek benzer etkinlikleri gruplamayı sağlar."""
-        name_lower = name.lower()
-        # "Headbangers Weekend - Cuma" gibi ekleri temizle
-        if ":" in name_lower:
-            name_lower = name_lower.split(":")[0]
-        if "-" in name_lower:
-            name_lower = name_lower.split("-")[0]
-        # Genel temizlik
-        return name_lower.strip()
-
-    def search_and_add(params):
-        try:
-            response = requests.get(base_url, params=params, timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-                if "_embedded" in data:
-                    for event in data["_embedded"]["events"]:
-                        event_name = event.get('name')
-                        if not event_name: continue
-                        
-                        # ANAHTAR DÜZELTME: Normalleştirilmiş ismi anahtar olarak kullan.
-                        normalized_name = normalize_event_name(event_name)
-                        if normalized_name not in all_fetched_events:
-                            all_fetched_events[normalized_name] = event
-        except requests.exceptions.RequestException as e:
-            print(f"⚠️ Arama hatası: {e}")
+def _normalize_event_name(name):
+    """Etkinlik ismini basitleştirerek benzer etkinlikleri gruplamayı sağlar."""
+    name_lower = name.lower()
+    # "Headbangers Weekend - Cuma" gibi ekleri temizle
+    if ":" in name_lower:
+        name_lower = name_lower.split(":")[0]
+    if "-" in name_lower:
+        name_lower = name_lower.split("-")[0]
+    # Genel temizlik
+    return name_lower.strip()
 
+def _ticketmaster_queries(city, get_popular_and_sort_by_date):
+    """Yapılacak Ticketmaster aramalarının parametrelerini, birleştirme sırasıyla döndürür."""
     # Adım 1: Genel Popülerlik Çağrısı
-    print("➡️ Adım 1: Genel popüler etkinlikler çekiliyor...")
+    print("➡️ Adım 1: Genel popüler etkinlikler aranacak...")
     general_params = {
         'apikey': config.TICKETMASTER_API_KEY, 'countryCode': 'TR',
         'size': 200, 'sort': 'relevance,desc', 'classificationName': 'Music'
     }
     if city: general_params['city'] = city
-    search_and_add(general_params)
+    queries = [general_params]
 
     # Adım 2: Kritik anahtar kelimeleri arama
-    guaranteed_keywords = {'Justin Timberlake', 'Metallica', 'Black Eyed Peas'}
+    guaranteed_keywords = ['Black Eyed Peas', 'Justin Timberlake', 'Metallica']
     if get_popular_and_sort_by_date and guaranteed_keywords:
-        print(f"➡️ Adım 2: {len(guaranteed_keywords)} garanti anahtar kelime aranıyor...")
+        print(f"➡️ Adım 2: {len(guaranteed_keywords)} garanti anahtar kelime aranacak...")
         for keyword in guaranteed_keywords:
             keyword_params = {'apikey': config.TICKETMASTER_API_KEY, 'countryCode': 'TR', 'keyword': keyword, 'size': 5}
             if city: keyword_params['city'] = city
-            search_and_add(keyword_params)
+            queries.append(keyword_params)
+    return queries
 
+def _merge_ticketmaster_results(pages):
+    """Arama sonuçlarını sırayla birleştirir; normalleştirilmiş ismi aynı olan etkinliklerden ilki tutulur."""
+    all_fetched_events = {} # Tekrarları normalleştirilmiş isme göre temizlemek için {normalized_name: event_data}
+    for data in pages:
+        if not data or "_embedded" not in data:
+            continue
+        for event in data["_embedded"]["events"]:
+            event_name = event.get('name')
+            if not event_name: continue
+
+            # ANAHTAR DÜZELTME: Normalleştirilmiş ismi anahtar olarak kullan.
+            normalized_name = _normalize_event_name(event_name)
+            if normalized_name not in all_fetched_events:
+                all_fetched_events[normalized_name] = event
+    return list(all_fetched_events.values())
+
+def _rank_and_format_ticketmaster_events(final_event_list, limit, get_popular_and_sort_by_date):
     # Adım 3: Gelişmiş Popülerlik Puanlaması ve Sıralama
-    final_event_list = list(all_fetched_events.values())
     if get_popular_and_sort_by_date:
         print(f"➡️ Adım 3: {len(final_event_list)} benzersiz etkinlik için gelişmiş popülerlik analizi yapılıyor...")
         for event in final_event_list:
@@ -362,4 +419,62 @@ def fetch_ticketmaster_events(limit=10, city=None, get_popular_and_sort_by_date=
         })
     
     print(f"✅ Sonuç: {len(formatted_events)} popüler etkinlik başarıyla listelendi.")
-    return formatted_events
\ No newline at end of file
+    return formatted_events
+
+async def fetch_ticketmaster_events_async(limit=10, city=None, get_popular_and_sort_by_date=False):
+    """
+    Ticketmaster API'sini hibrit bir strateji ile kullanır.
+    Popülerliği belirlemek için MEKAN BÜYÜKLÜĞÜ ve BİLET FİYATINI baz alan gelişmiş bir puanlama sistemi kullanır.
+    Benzer isimli etkinlikleri akıllı bir şekilde gruplayarak tekrarları engeller.
+    Genel arama ve anahtar kelime aramaları eşzamanlı yapılır; sonuçlar sorgu sırasıyla birleştirilir.
+    """
+    if not config.TICKETMASTER_API_KEY:
+        print("⚠️ Ticketmaster API anahtarı bulunamadı.")
+        return []
+
+    print("ℹ️ Ticketmaster etkinlikleri çekiliyor (Nihai Strateji v3)...")
+
+    async def search(params):
+        try:
+            response = await http_client.async_get(TICKETMASTER_EVENTS_URL, params=params)
+            if response.status_code == 200:
+                return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"⚠️ Arama hatası: {e}")
+        return None
+
+    queries = _ticketmaster_queries(city, get_popular_and_sort_by_date)
+    pages = await asyncio.gather(*(search(params) for params in queries))
+    final_event_list = _merge_ticketmaster_results(pages)
+    return _rank_and_format_ticketmaster_events(final_event_list, limit, get_popular_and_sort_by_date)
+
+async def fetch_all_async(sources, cached=None):
+    """
+    API kaynaklarını paylaşılan olay döngüsünde eşzamanlı çeker.
+
+    Args:
+        sources (dict): {ad: coroutine fonksiyonu}. Koşullu kaynakların fonksiyonu
+                        doğrulayıcı sözlüğünü (validators) argüman olarak alır.
+        cached (callable): Verilirse her kaynak cached(ad, fetch) üzerinden çağrılır
+                           (ör. cache_manager.get_cached_data ile). fetch, coroutine'i bu
+                           döngüde çalıştırıp sonucunu bekleyen senkron fonksiyondur; cached
+                           senkron olduğu için ayrı bir iş parçacığında çalıştırılır.
+
+    Returns:
+        dict: {ad: sonuç}. Hata veren kaynağın sonucu None olur; diğerleri etkilenmez.
+    """
+    async def run(name, coroutine_function):
+        if cached is None:
+            return await coroutine_function()
+        fetch = lambda *args: http_client.run_async(coroutine_function(*args))
+        return await asyncio.to_thread(cached, name, fetch)
+
+    names = list(sources)
+    results = await asyncio.gather(*(run(name, sources[name]) for name in names), return_exceptions=True)
+    output = {}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            print(f"❌ {name} API verisi alınamadı: {result}")
+            result = None
+        output[name] = result
+    return output
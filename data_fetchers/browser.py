@@ -0,0 +1,415 @@
+# data_fetchers/browser.py
+"""
+Selenium tabanlı kazıyıcıların kullandığı Chrome WebDriver'larını kurar ve
+sınırlı bir havuz (pool) üzerinden ödünç verir.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from functools import partial
+
+import undetected_chromedriver as uc
+from selenium.common.exceptions import SessionNotCreatedException
+
+# Ana dizindeki config dosyasını import ediyoruz
+import config
+
+# undetected_chromedriver, sürücü dosyasını indirip yamalarken hep aynı dosyaya yazar.
+# Bu adım (ve saklanan sürücünün değiştirilmesi) sırayla yapılır; hazır bir sürücüyle
+# Chrome'un açılması ise kilit dışında, paralel yürür.
+_setup_lock = threading.Lock()
+
+# Kalıcı profil klasörlerinden hangilerinin bu süreçte kullanımda olduğu.
+# Chrome aynı profil klasörünü iki tarayıcının aynı anda açmasına izin vermez.
+_profile_slots_in_use = set()
+_profile_lock = threading.Lock()
+
+_DRIVER_BINARY_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+_DRIVER_STAMP_FILE = "stamp.json"
+
+
+def _build_chrome_options():
+    """Her tarayıcı için yeni bir ChromeOptions nesnesi oluşturur (uc aynı nesnenin tekrar kullanılmasına izin vermez)."""
+    chrome_options = uc.ChromeOptions()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.page_load_strategy = config.BROWSER_PAGE_LOAD_STRATEGY
+    return chrome_options
+
+
+def _read_driver_stamp():
+    stamp_path = config.CHROMEDRIVER_CACHE_DIR / _DRIVER_STAMP_FILE
+    try:
+        with open(stamp_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _cached_driver_path():
+    """Önceki bir çalışmada yamalanıp saklanan chromedriver'ın yolunu, sürüm damgası uyuyorsa döndürür."""
+    driver_path = config.CHROMEDRIVER_CACHE_DIR / _DRIVER_BINARY_NAME
+    stamp = _read_driver_stamp()
+    if stamp.get("version_main") != config.CHROME_VERSION_MAIN or not driver_path.exists():
+        return None
+    return str(driver_path)
+
+
+def _invalidate_driver_cache():
+    for file_name in (_DRIVER_BINARY_NAME, _DRIVER_STAMP_FILE):
+        try:
+            (config.CHROMEDRIVER_CACHE_DIR / file_name).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _store_patched_driver(patcher):
+    """
+    uc'nin indirip yamaladığı chromedriver'ı sürüm damgasıyla birlikte kalıcı klasöre kopyalar
+    ve kopyanın yolunu döndürür. Kopyalanamazsa uc'nin yamaladığı dosyanın yolu döner.
+    """
+    source_path = patcher.executable_path
+    try:
+        config.CHROMEDRIVER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        target_path = config.CHROMEDRIVER_CACHE_DIR / _DRIVER_BINARY_NAME
+        shutil.copy2(source_path, target_path)
+        stamp = {
+            "version_main": config.CHROME_VERSION_MAIN,
+            "chromedriver_version": str(getattr(patcher, "version_full", "") or ""),
+        }
+        with open(config.CHROMEDRIVER_CACHE_DIR / _DRIVER_STAMP_FILE, "w", encoding="utf-8") as f:
+            json.dump(stamp, f, ensure_ascii=False, indent=4)
+        print(f"💾 Yamalı chromedriver sonraki çalışmalar için saklandı: {target_path}")
+        return str(target_path)
+    except Exception as e:
+        print(f"⚠️ Yamalı chromedriver saklanamadı: {e}")
+        return source_path
+
+
+def _prepare_driver_binary():
+    """
+    Kullanılacak yamalı chromedriver'ın yolunu döndürür. Saklanan sürücü yoksa (veya
+    CHROME_VERSION_MAIN değiştiyse) uc ile indirilip yamalanır ve saklanır.
+    _setup_lock altında çağrılır.
+    """
+    driver_path = _cached_driver_path()
+    if driver_path:
+        return driver_path
+    # GitHub Actions ortamında belirli bir sürüm belirtmek stabiliteyi artırabilir (config.CHROME_VERSION_MAIN).
+    patcher = uc.Patcher(version_main=config.CHROME_VERSION_MAIN)
+    patcher.auto()
+    return _store_patched_driver(patcher)
+
+
+def _file_identity(path):
+    try:
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns
+    except OSError:
+        return None
+
+
+def _invalidate_driver_cache_if_unchanged(identity):
+    """Saklanan sürücü, başarısız başlatmada kullanılan dosyaysa siler (başka bir iş parçacığı yenilemediyse)."""
+    if _file_identity(config.CHROMEDRIVER_CACHE_DIR / _DRIVER_BINARY_NAME) == identity:
+        _invalidate_driver_cache()
+
+
+def _is_profile_locked_by_live_process(profile_dir):
+    """Profil klasörü, hâlâ çalışan başka bir Chrome süreci tarafından kilitlenmiş mi?"""
+    lock_path = profile_dir / "SingletonLock"
+    if not os.path.lexists(lock_path):
+        return False
+    try:
+        # Linux'ta kilit, "makine-adı-pid" hedefli bir sembolik bağlantıdır.
+        pid = int(os.readlink(lock_path).rsplit("-", 1)[1])
+        os.kill(pid, 0)
+        return True
+    except (OSError, ValueError, IndexError):
+        # Süreç yoksa kilit bayattır; Chrome açılışta kendisi temizler.
+        return False
+
+
+def _acquire_profile_dir(slots):
+    """Bu süreçte ve başka bir süreçte kullanılmayan kalıcı bir profil klasörü ayırır (ilk `slots` klasör arasından)."""
+    for slot in range(slots):
+        profile_dir = config.CHROME_PROFILE_DIR / f"worker_{slot}"
+        if slot in _profile_slots_in_use or _is_profile_locked_by_live_process(profile_dir):
+            continue
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        _profile_slots_in_use.add(slot)
+        return slot, str(profile_dir)
+    # Tüm kalıcı profiller doluysa (örn. çakışan iki çalışma) geçici bir profil kullanılır.
+    return None, None
+
+
+def _start_chrome(driver_path, user_data_dir):
+    return uc.Chrome(
+        options=_build_chrome_options(),
+        version_main=config.CHROME_VERSION_MAIN,
+        driver_executable_path=driver_path,
+        user_data_dir=user_data_dir,
+    )
+
+
+def _is_version_mismatch(error):
+    """chromedriver'ın tarayıcı sürümünü desteklemediği için oturum açamadığı hata mı?"""
+    return isinstance(error, SessionNotCreatedException) and "version" in str(error).lower()
+
+
+def setup_driver(profile_slots=None):
+    """
+    Paylaşılan ve tespit edilemeyen Selenium WebDriver'ı kurar.
+
+    config.BROWSER_PERSISTENT_PROFILE açıksa daha önce yamalanmış chromedriver dosyası
+    yeniden kullanılır (her çalışmada indirme/yama yapılmaz) ve tarayıcı kalıcı bir
+    profil klasörüyle açılır; böylece çerez onayları ve site önbelleği çalışmalar
+    arasında korunur. profile_slots, kullanılabilecek profil klasörü sayısıdır (sürücüyü
+    isteyen havuzun boyutu; varsayılan config.BROWSER_POOL_SIZE).
+    """
+    print("ℹ️ Undetected Chrome WebDriver kuruluyor...")
+    persistent = config.BROWSER_PERSISTENT_PROFILE
+    profile_slot, user_data_dir = None, None
+    try:
+        if not persistent:
+            # uc sürücüyü Chrome(...) içinde ortak dosyaya indirip yamaladığı için açılış sırayla yapılır.
+            with _setup_lock:
+                driver = _start_chrome(None, None)
+        else:
+            with _profile_lock:
+                profile_slot, user_data_dir = _acquire_profile_dir(profile_slots or config.BROWSER_POOL_SIZE)
+            with _setup_lock:
+                driver_path = _prepare_driver_binary()
+            driver_identity = _file_identity(driver_path)
+            try:
+                driver = _start_chrome(driver_path, user_data_dir)
+            except Exception as e:
+                if not _is_version_mismatch(e):
+                    raise
+                # Saklanan sürücü artık tarayıcıyla uyumlu değilse baştan indirilip yamalanır.
+                # Diğer hatalar (kilitli profil, Chrome çökmesi) sürücüden kaynaklanmaz.
+                print(f"⚠️ Saklanan chromedriver ile başlatılamadı ({e}), yeniden indirilecek.")
+                with _setup_lock:
+                    _invalidate_driver_cache_if_unchanged(driver_identity)
+                    driver_path = _prepare_driver_binary()
+                driver_identity = _file_identity(driver_path)
+                driver = _start_chrome(driver_path, user_data_dir)
+
+            browser_major = str(driver.capabilities.get("browserVersion", "")).split(".")[0]
+            if browser_major != str(config.CHROME_VERSION_MAIN):
+                # Kurulu Chrome güncellenmiş; bir sonraki çalışmada uygun sürücü yeniden çözülür.
+                print(f"⚠️ Chrome ana sürümü ({browser_major}) beklenen sürümden ({config.CHROME_VERSION_MAIN}) farklı. Saklanan chromedriver geçersiz sayıldı.")
+                with _setup_lock:
+                    _invalidate_driver_cache_if_unchanged(driver_identity)
+    except Exception as e:
+        with _profile_lock:
+            _profile_slots_in_use.discard(profile_slot)
+        print(f"❌ Undetected Chrome WebDriver başlatılamadı: {e}")
+        traceback.print_exc()
+        return None
+
+    driver.profile_slot = profile_slot
+
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    print("✅ Undetected Chrome WebDriver başarıyla başlatıldı.")
+    return driver
+
+
+def quit_driver(driver):
+    """Tarayıcıyı kapatır ve kullandığı kalıcı profil klasörünü serbest bırakır."""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    with _profile_lock:
+        _profile_slots_in_use.discard(getattr(driver, "profile_slot", None))
+
+
+def apply_block_profile(driver, resource_types):
+    """
+    Tarayıcının verilen kaynak türlerini (resim, font, medya, izleyici) indirmesini engeller.
+    Boş bir liste verilirse önceki engeller kaldırılır. Ayar, sürücü oturumu boyunca
+    tüm sayfa geçişlerinde geçerli kalır.
+    """
+    patterns = []
+    for resource_type in resource_types or ():
+        for pattern in config.BROWSER_BLOCK_PATTERNS.get(resource_type, []):
+            patterns.append(pattern)
+            if pattern.startswith("*."):
+                patterns.append(pattern + "?*") # "kapak.jpg?v=3" gibi adresler
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        print(f"⚠️ Kaynak engelleme profili uygulanamadı: {e}")
+
+
+def _is_driver_alive(driver):
+    """Tarayıcı oturumunun hâlâ komut kabul edip etmediğini kontrol eder."""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+class LazyDriver:
+    """
+    Tarayıcıyı ilk gerçek kullanımda başlatan sürücü tutamacı (handle).
+
+    Kazıyıcıya normal bir WebDriver gibi verilir. Herhangi bir özniteliğine ilk kez
+    erişildiğinde havuzdan bir sürücü alınır ve varsa kaynak engelleme profili
+    uygulanır; hiç erişilmezse Chrome hiç başlatılmaz.
+    """
+
+    def __init__(self, pool, block_profile=()):
+        self._pool = pool
+        self._block_profile = block_profile
+        self._driver = None
+        self.failed = False
+
+    @property
+    def started(self):
+        return self._driver is not None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            try:
+                driver = self._pool.checkout()
+            except (RuntimeError, TimeoutError):
+                self.failed = True
+                raise
+            # Havuzdaki sürücüler farklı kazıyıcılar arasında paylaşıldığı için
+            # profil her ödünç alımda yeniden uygulanır.
+            apply_block_profile(driver, self._block_profile)
+            self._driver = driver
+        return getattr(self._driver, name)
+
+    def release(self):
+        """Başlatılmış bir sürücü varsa havuza iade eder."""
+        if self._driver is not None:
+            driver, self._driver = self._driver, None
+            self._pool.checkin(driver)
+
+
+class DriverPool:
+    """
+    En fazla `size` adet Chrome örneğini yöneten havuz.
+
+    Kazıyıcılar `checkout()` ile bir sürücü alır ve işi bitince `checkin()` ile geri
+    verir. Sürücüler ancak ilk kez istendiklerinde başlatılır; hiç istenmezse
+    (tüm önbellek kayıtları tazeyse) Chrome hiç açılmaz. Geri verilen sürücü yanıt
+    vermiyorsa (çökmüşse) kapatılır ve yerine bir sonraki `checkout()` çağrısında
+    yenisi başlatılır; çalışmanın geri kalanı etkilenmez.
+    """
+
+    def __init__(self, size=None, factory=None):
+        self.size = size or config.BROWSER_POOL_SIZE
+        # Her sürücü, havuzun boyutu kadar kalıcı profil klasörü arasından birini kullanır.
+        self._factory = factory or partial(setup_driver, profile_slots=self.size)
+        self._condition = threading.Condition()
+        self._idle = []
+        self._drivers = set()
+        self._created = 0
+
+    def checkout(self, timeout=None):
+        """
+        Boştaki bir sürücüyü verir; yoksa ve sınır dolmadıysa yenisini başlatır.
+        timeout saniye (varsayılan config.BROWSER_CHECKOUT_TIMEOUT) içinde sürücü
+        alınamazsa TimeoutError fırlatılır.
+        """
+        if timeout is None:
+            timeout = config.BROWSER_CHECKOUT_TIMEOUT
+        deadline = time.time() + timeout
+        with self._condition:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError("Havuzda boşta WebDriver bulunamadı.")
+                self._condition.wait(remaining)
+
+        driver = self._factory()
+        with self._condition:
+            if driver is None:
+                # Başlatma sürerken close() sayacı sıfırlamış olabilir.
+                self._created = max(self._created - 1, 0)
+                self._condition.notify()
+                raise RuntimeError("WebDriver başlatılamadı.")
+            self._drivers.add(driver)
+        return driver
+
+    def checkin(self, driver, broken=False):
+        """Sürücüyü havuza iade eder. Çökmüş sürücüler kapatılıp havuzdan çıkarılır."""
+        if broken or not _is_driver_alive(driver):
+            print("⚠️ Yanıt vermeyen WebDriver kapatılıyor, yerine yenisi başlatılacak.")
+            self._discard(driver)
+            return
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def _discard(self, driver):
+        quit_driver(driver)
+        with self._condition:
+            # close() sayacı sıfırlamış ve sürücüyü zaten çıkarmış olabilir; sayaç yalnızca
+            # sürücü hâlâ havuzdaysa azaltılır (aksi halde sayaç eksiye düşer ve sınır aşılır).
+            if driver in self._drivers:
+                self._drivers.discard(driver)
+                self._created -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def driver(self):
+        """`with pool.driver() as driver:` şeklinde ödünç alıp otomatik iade etmeyi sağlar."""
+        driver = self.checkout()
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    @contextmanager
+    def lazy(self, block_profile=()):
+        """Tarayıcıyı yalnızca gerçekten kullanılırsa başlatan bir LazyDriver verir."""
+        handle = LazyDriver(self, block_profile)
+        try:
+            yield handle
+        finally:
+            handle.release()
+
+    def run(self, scraper, *args, **kwargs):
+        """
+        Kazıyıcıyı tembel (lazy) bir sürücü tutamacıyla çalıştırır. Kazıyıcının kaynak
+        engelleme profili config.SCRAPER_BLOCK_PROFILES'tan fonksiyon adına göre seçilir.
+        Sürücü başlatılamazsa None döndürür; böylece önbellekteki son veri kullanılabilir.
+        """
+        block_profile = config.SCRAPER_BLOCK_PROFILES.get(scraper.__name__, ())
+        with self.lazy(block_profile) as driver:
+            result = scraper(driver, *args, **kwargs)
+        if driver.failed:
+            print(f"❌ {scraper.__name__} için WebDriver başlatılamadı, sonuç önbelleğe yazılmayacak.")
+            return None
+        return result
+
+    def close(self):
+        """Havuzdaki tüm sürücüleri kapatır."""
+        with self._condition:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+            self._idle.clear()
+            self._created = 0
+        for driver in drivers:
+            quit_driver(driver)
+        if drivers:
+            print(f"✅ {len(drivers)} adet WebDriver kapatıldı.")
@@ -0,0 +1,169 @@
+# data_fetchers/feed_store.py
+"""
+RSS akışlarının çalışmalar arasında korunan durumunu saklar.
+
+Her akış için şunlar tutulur:
+- Sunucunun verdiği ETag / Last-Modified doğrulayıcıları. Bir sonraki çalışmada koşullu
+  istek yapılır; sunucu 304 döndürdüğünde akış yeniden indirilip ayrıştırılmaz.
+- İşlenmiş girdilerin indeksi ({guid: haber}). Akışta zaten görülmüş girdiler yeniden
+  temizlenmez; yalnızca yeni girdilerin özeti ve tarihi işlenir.
+- Akışın son görülen girdi sırası (latest). 304 yanıtında haberler bu sırayla döndürülür.
+- Yoklama takvimi (poll). Girdilerin yayın tarihlerinden akışın ortalama yayın aralığı
+  öğrenilir ve bir sonraki yoklama bu aralık kadar sonraya planlanır. Aralık akışa özel
+  en kısa/en uzun sınırlar içinde tutulur (config.RSS_POLL_DEFAULTS / RSS_POLL_POLICIES);
+  vakti gelmemiş akışlar için istek yapılmaz, saklanan haberler kullanılır.
+
+Akıştan düşen girdiler config.RSS_RETENTION_HOURS boyunca indekste kalır, sonra silinir.
+Kayıtlar cache_manager üzerinden, akış URL'sinden türetilen bir isimle saklanır.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+import config
+from cache_manager import load_entry, save_entry
+from data_fetchers import http_client
+
+# Saklanan durumun biçim sürümü. Farklı sürümdeki kayıtlar yok sayılır ve akış baştan çekilir.
+# (2: datetime alanları önbellek codec'i ile doğrudan saklanır.)
+STATE_VERSION = 2
+
+
+def _feed_cache_name(url):
+    return f"feed_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def _empty_state():
+    return {'validators': {}, 'entries': {}, 'latest': [], 'poll': {}}
+
+
+def load_feed_state(url):
+    """Akışın saklanan durumunu döndürür: {'validators': {...}, 'entries': {...}, 'latest': [...], 'poll': {...}}."""
+    entry = load_entry(_feed_cache_name(url))
+    data = entry.get('data') if entry else None
+    if not isinstance(data, dict) or data.get('version') != STATE_VERSION:
+        return _empty_state()
+    # Kayıt bellek katmanıyla paylaşıldığı için kapsayıcılar kopyalanır; kayıtların kendisi değiştirilmez.
+    entries = dict(data['entries'])
+    latest = [guid for guid in data['latest'] if guid in entries]
+    return {'validators': dict(entry['validators']), 'entries': entries, 'latest': latest, 'poll': dict(data['poll'])}
+
+
+def save_feed_state(url, state):
+    """Akışın durumunu diske yazar."""
+    try:
+        data = {
+            'version': STATE_VERSION,
+            'url': url,
+            'latest': list(state['latest']),
+            'poll': dict(state['poll']),
+            'entries': dict(state['entries']),
+        }
+        save_entry(_feed_cache_name(url), data, state['validators'])
+    except Exception as e:
+        print(f"❌ Akış durumu kaydedilemedi ({url}): {e}")
+
+
+def request_headers(state):
+    """
+    Akış için koşullu istek başlıklarını döndürür. Saklanan haber yoksa doğrulayıcılar
+    gönderilmez; aksi halde 304 yanıtında kullanılacak veri olmazdı.
+    """
+    return http_client.conditional_headers(state['validators']) if state['latest'] else {}
+
+
+def known_items(state):
+    """Daha önce işlenmiş girdileri {guid: haber} olarak döndürür."""
+    return {guid: record['item'] for guid, record in state['entries'].items()}
+
+
+def latest_items(state):
+    """Akışın son görülen haberlerini akıştaki sırasıyla döndürür."""
+    return [state['entries'][guid]['item'] for guid in state['latest']]
+
+
+def record_entries(state, parsed_entries, now=None):
+    """
+    Akışın yeni ayrıştırılmış girdilerini ([(guid, haber), ...]) indekse işler, saklama
+    süresi dolan girdileri siler ve haberleri akıştaki sırasıyla döndürür.
+    """
+    now = now or datetime.now(timezone.utc)
+    latest, current = [], set()
+    for guid, item in parsed_entries:
+        if guid in current:
+            continue  # Aynı girdi akışta iki kez geçiyorsa ilki kullanılır.
+        state['entries'][guid] = {'item': item, 'last_seen': now}
+        latest.append(guid)
+        current.add(guid)
+    state['latest'] = latest
+
+    cutoff = now - timedelta(hours=config.RSS_RETENTION_HOURS)
+    expired = [guid for guid, record in state['entries'].items() if guid not in current and record['last_seen'] < cutoff]
+    for guid in expired:
+        del state['entries'][guid]
+    return latest_items(state)
+
+
+def _publish_interval_minutes(state, sample_size=10):
+    """Akıştaki en yeni girdilerin yayın tarihlerinden ortalama yayın aralığını (dakika) hesaplar."""
+    # Tarihi olmayan girdilere ayrıştırma anı yazıldığı için hesaba katılmaz.
+    dates = sorted(
+        (item['pub_date_parsed'] for item in latest_items(state) if item.get('pub_date') != 'Tarih yok'),
+        reverse=True,
+    )[:sample_size]
+    if len(dates) < 2:
+        return None
+    return (dates[0] - dates[-1]).total_seconds() / 60 / (len(dates) - 1)
+
+
+def schedule_next_poll(url, state, now=None):
+    """Akışın yayın sıklığına göre bir sonraki yoklama zamanını belirler ve state['poll']'a yazar."""
+    now = now or datetime.now(timezone.utc)
+    policy = {**config.RSS_POLL_DEFAULTS, **config.RSS_POLL_POLICIES.get(url, {})}
+    publish_interval = _publish_interval_minutes(state)
+    if publish_interval is None:
+        # Yayın sıklığı öğrenilemiyorsa tazelikten ödün vermemek için en kısa aralık kullanılır.
+        interval = policy['min_minutes']
+    else:
+        interval = min(max(publish_interval, policy['min_minutes']), policy['max_minutes'])
+
+    state['poll'] = {
+        'min_minutes': policy['min_minutes'],
+        'max_minutes': policy['max_minutes'],
+        'publish_interval_minutes': round(publish_interval, 1) if publish_interval is not None else None,
+        'interval_minutes': round(interval, 1),
+        'next_poll_at': now + timedelta(minutes=interval),
+    }
+
+
+def is_due(state, now=None):
+    """Akışın yoklama vakti geldiyse (veya saklanan haber yoksa) True döndürür."""
+    next_poll_at = state['poll'].get('next_poll_at')
+    if not state['latest'] or next_poll_at is None:
+        return True
+    return (now or datetime.now(timezone.utc)) >= next_poll_at
+
+
+def store_response(url, state, parsed_entries, response):
+    """Ayrıştırılan girdileri indekse işler, yanıtın doğrulayıcılarını saklar ve haberleri döndürür."""
+    items = record_entries(state, parsed_entries)
+    http_client.update_validators(state['validators'], response)
+    schedule_next_poll(url, state)
+    save_feed_state(url, state)
+    return items
+
+
+def reuse_unchanged(url, state):
+    """Akış değişmemişse (304) bir sonraki yoklamayı planlar ve saklanan haberleri döndürür."""
+    print(f"✅ RSS değişmemiş (304), önceki haberler kullanılıyor: {url}")
+    schedule_next_poll(url, state)
+    save_feed_state(url, state)
+    return latest_items(state)
+
+
+def items_if_not_due(url, state):
+    """Yoklama vakti gelmemişse saklanan haberleri, aksi halde None döndürür."""
+    if is_due(state):
+        return None
+    next_poll_at = state['poll']['next_poll_at'] + timedelta(hours=config.TIME_OFFSET_HOURS)
+    print(f"⏭️ RSS yoklama vakti gelmedi ({url}), sonraki yoklama: {next_poll_at.strftime('%H:%M')}")
+    return latest_items(state)
@@ -0,0 +1,238 @@
+# data_fetchers/http_client.py
+"""
+API çağrılarının ve düz HTTP kazıyıcılarının ortak kullandığı HTTP istemcisi.
+
+Tek bir requests.Session üzerinden çalışır; böylece aynı sunucuya yapılan istekler
+havuzlanmış (keep-alive) bağlantıları yeniden kullanır. Tüm isteklere varsayılan
+bağlantı/okuma zaman aşımları uygulanır, geçici hatalarda (bağlantı hatası, 429, 5xx)
+artan beklemeli yeniden deneme yapılır. Yeniden deneme yalnızca tekrarlanması güvenli
+(idempotent) yöntemlerde yapılır; POST istekleri (ör. Spotify token) tek sefer gönderilir. gzip/deflate her zaman, brotli ise `brotli`
+paketi kuruluysa otomatik olarak çözülür.
+
+Asenkron fetcher'lar (api_fetchers.*_async) için ayrıca tek bir httpx.AsyncClient ve onu
+çalıştıran arka plan olay döngüsü vardır. Farklı iş parçacıklarından run_async ile gönderilen
+tüm coroutine'ler bu döngüde eşzamanlı çalışır; aynı sunucuya aynı anda açılan istek sayısı
+HTTP_MAX_CONCURRENCY_PER_HOST ile sınırlanır.
+"""
+import asyncio
+import importlib.util
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Ana dizindeki config dosyasını import ediyoruz
+import config
+
+DEFAULT_TIMEOUT = (config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# urllib3'ün varsayılan idempotent yöntem kümesi (GET, HEAD, PUT, DELETE, OPTIONS, TRACE).
+RETRY_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+_session = None
+_session_lock = threading.Lock()
+
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+_async_client = None
+_host_semaphores = {}
+
+
+def _enable_http2():
+    """urllib3'ün deneysel HTTP/2 desteğini (urllib3>=2.3 ve h2 paketi gerekir) açmayı dener."""
+    try:
+        import urllib3.http2
+        urllib3.http2.inject_into_urllib3()
+        print("ℹ️ HTTP/2 desteği etkinleştirildi.")
+    except (ImportError, AttributeError) as e:
+        print(f"⚠️ HTTP/2 etkinleştirilemedi, HTTP/1.1 kullanılacak: {e}")
+
+
+def _build_session():
+    retry = Retry(
+        total=config.HTTP_RETRY_TOTAL,
+        backoff_factor=config.HTTP_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Son yanıt döndürülür; hata kontrolü raise_for_status ile yapılır.
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    # İsteğe özel headers verilirse o kullanılır; verilmezse tarayıcı benzeri kimlik gönderilir.
+    session.headers["User-Agent"] = config.HTTP_USER_AGENT
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Paylaşılan oturumu (ilk çağrıda oluşturarak) döndürür."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                if config.HTTP2_ENABLED:
+                    _enable_http2()
+                _session = _build_session()
+    return _session
+
+
+def request(method, url, **kwargs):
+    """Paylaşılan oturumla istek yapar. `timeout` verilmezse varsayılan zaman aşımları kullanılır."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return get_session().request(method, url, **kwargs)
+
+
+def conditional_headers(validators):
+    """Saklanan doğrulayıcılardan If-None-Match / If-Modified-Since başlıklarını üretir."""
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def update_validators(validators, response):
+    """Yanıttaki ETag / Last-Modified değerlerini doğrulayıcı sözlüğüne yazar (requests ve httpx yanıtlarıyla çalışır)."""
+    for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+        value = response.headers.get(header)
+        if value:
+            validators[key] = value
+        else:
+            validators.pop(key, None)
+    return validators
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+# --- Asenkron istemci ---
+
+def _get_loop():
+    """Arka plan olay döngüsünü (ilk çağrıda ayrı bir daemon iş parçacığında başlatarak) döndürür."""
+    global _loop, _loop_thread
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                _loop_thread = threading.Thread(target=loop.run_forever, name="http-client-loop", daemon=True)
+                _loop_thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_async(coro, timeout=None):
+    """
+    Coroutine'i paylaşılan olay döngüsünde çalıştırır ve sonucunu bekler.
+    Herhangi bir iş parçacığından çağrılabilir; aynı anda gönderilen coroutine'ler
+    aynı döngüde eşzamanlı ilerler.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout)
+
+
+def _get_async_client():
+    """Paylaşılan AsyncClient'ı döndürür. Yalnızca olay döngüsü içinden çağrılır."""
+    global _async_client
+    if _async_client is None:
+        # h2 paketi kuruluysa HTTP/2 kullanılır; aynı sunucuya giden istekler tek bağlantıda çoğullanır.
+        http2 = importlib.util.find_spec("h2") is not None
+        _async_client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(config.HTTP_READ_TIMEOUT, connect=config.HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=config.HTTP_POOL_CONNECTIONS * config.HTTP_MAX_CONCURRENCY_PER_HOST,
+                max_keepalive_connections=config.HTTP_POOL_CONNECTIONS,
+            ),
+            follow_redirects=True,
+            headers={"User-Agent": config.HTTP_USER_AGENT},
+        )
+    return _async_client
+
+
+def _host_semaphore(url):
+    host = urlsplit(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(config.HTTP_MAX_CONCURRENCY_PER_HOST)
+    return _host_semaphores[host]
+
+
+def _retry_delay(response, attempt):
+    """Retry-After başlığı varsa ona, yoksa artan bekleme katsayısına göre bekleme süresi."""
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return config.HTTP_RETRY_BACKOFF * (2 ** attempt)
+
+
+async def async_request(method, url, **kwargs):
+    """
+    Paylaşılan AsyncClient ile istek yapar. Senkron request() ile aynı şekilde geçici
+    hatalarda (bağlantı hatası, 429, 5xx) yalnızca idempotent yöntemlerde yeniden dener
+    ve son yanıtı döndürür.
+    """
+    client = _get_async_client()
+    retries = config.HTTP_RETRY_TOTAL if method.upper() in RETRY_METHODS else 0
+    async with _host_semaphore(url):
+        for attempt in range(retries + 1):
+            is_last = attempt == retries
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if is_last:
+                    raise
+                await asyncio.sleep(_retry_delay(None, attempt))
+                continue
+            if response.status_code not in RETRY_STATUS_CODES or is_last:
+                return response
+            await asyncio.sleep(_retry_delay(response, attempt))
+
+
+async def async_get(url, **kwargs):
+    return await async_request("GET", url, **kwargs)
+
+
+async def async_post(url, **kwargs):
+    return await async_request("POST", url, **kwargs)
+
+
+async def _aclose_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    _host_semaphores.clear()
+
+
+def close():
+    """Paylaşılan istemcileri kapatır ve arka plan olay döngüsünü durdurur."""
+    global _session, _loop, _loop_thread
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+    with _loop_lock:
+        if _loop is not None:
+            future = asyncio.run_coroutine_threadsafe(_aclose_async_client(), _loop)
+            try:
+                future.result(10)
+            except Exception as e:
+                print(f"⚠️ Asenkron HTTP istemcisi kapatılırken hata: {e}")
+            _loop.call_soon_threadsafe(_loop.stop)
+            _loop_thread.join(timeout=10)
+            _loop.close()
+            _loop, _loop_thread = None, None
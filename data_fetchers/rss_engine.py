@@ -0,0 +1,200 @@
+# data_fetchers/rss_engine.py
+"""
+RSS/Atom akışlarını hızlı ve zaman sınırlı okuyan motor.
+
+- Akışlar http_client'ın paylaşılan asenkron istemcisiyle indirilir; her akışın toplam
+  süresi (yeniden denemeler dahil) config.RSS_FEED_TIMEOUT ile sınırlıdır. Takılan bir
+  akış diğerlerini bekletmez.
+- Baytlar lxml.etree.iterparse ile akış halinde ayrıştırılır; bozuk XML'de mümkün olduğunca
+  devam edilir (recover). İşlenen her girdinin düğümü hemen bellekten atılır.
+- Başlık ve özetlerdeki HTML, her girdi için BeautifulSoup ağacı kurmadan düzenli ifadeyle temizlenir.
+- Sonuçlar akışlar bittikçe (tamamlanma sırasıyla) üretilir.
+
+Akış durumu (koşullu istek, girdi indeksi, yoklama takvimi) feed_store'dan gelir; girdi
+anahtarları ve haber sözlükleri api_fetchers.fetch_rss_feed ile aynıdır.
+"""
+import asyncio
+import html
+import io
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from lxml import etree
+
+# Ana dizindeki config dosyasını import ediyoruz
+import config
+from data_fetchers import feed_store, http_client
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+# RSS 2.0 / RSS 1.0 girdileri <item>, Atom girdileri <entry> düğümündedir.
+_ENTRY_TAGS = {"item", "entry"}
+_FEED_TAGS = {"channel", "feed"}
+_SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+_DATE_TAGS = ("pubDate", "published", "date", "updated")
+
+
+def _local_name(tag):
+    # "{namespace}tag" -> "tag"
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def strip_html(text):
+    """Karakter referanslarını çözer, HTML etiketlerini kaldırır ve boşlukları sadeleştirir."""
+    if not text:
+        return ""
+    # Önce referanslar çözülür: kaçışlı etiketler (&lt;b&gt;) de metinde kalmaz.
+    return _SPACE_RE.sub(" ", _TAG_RE.sub(" ", html.unescape(text))).strip()
+
+
+def parse_date(value):
+    """RFC 822 (RSS) veya ISO 8601 (Atom) tarihini UTC datetime'a çevirir; çevrilemezse None."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _entry_fields(elem):
+    """Girdi düğümünün çocuklarından ilgili alanları {yerel_ad: metin} olarak toplar."""
+    fields = {}
+    for child in elem:
+        name = _local_name(child.tag)
+        if name == "link":
+            # Atom: <link rel="alternate" href="..."/>, RSS: <link>...</link>
+            href = child.get("href")
+            if href and child.get("rel", "alternate") != "alternate":
+                continue
+            value = href or (child.text or "").strip()
+        else:
+            value = child.text
+        if value and name not in fields:
+            fields[name] = value
+    return fields
+
+
+def parse_feed(content, known_items=None):
+    """
+    Akış baytlarını ayrıştırır ve [(guid, haber), ...] listesi döndürür.
+    known_items ({guid: haber}) içindeki girdiler yeniden işlenmez, saklanan haliyle kullanılır.
+    """
+    known_items = known_items or {}
+    source_name = None
+    parsed_entries = []
+    new_count = 0
+
+    try:
+        for _, elem in etree.iterparse(io.BytesIO(content), events=("end",), recover=True, resolve_entities=False):
+            name = _local_name(elem.tag)
+            if name == "title" and source_name is None:
+                parent = elem.getparent()
+                if parent is not None and _local_name(parent.tag) in _FEED_TAGS:
+                    source_name = (elem.text or "").strip()
+                continue
+            if name not in _ENTRY_TAGS:
+                continue
+
+            fields = _entry_fields(elem)
+            # Bellek kullanımını sabit tutmak için işlenen düğüm ve önceki kardeşleri atılır.
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+            # Anahtar, feedparser'daki entry.id / link / title sırasıyla aynıdır.
+            guid = fields.get("guid") or fields.get("id") or fields.get("link") or fields.get("title", "")
+            if guid in known_items:
+                parsed_entries.append((guid, known_items[guid]))
+                continue
+
+            raw_date = next((fields[tag] for tag in _DATE_TAGS if tag in fields), None)
+            parsed_date = parse_date(raw_date) or datetime.now(timezone.utc)
+            summary = next((fields[tag] for tag in _SUMMARY_TAGS if tag in fields), "")
+
+            parsed_entries.append((guid, {
+                'source': source_name or "",
+                'title': strip_html(fields.get("title", "")),
+                'link': fields.get("link", ""),
+                'summary': strip_html(summary),
+                'pub_date': raw_date or 'Tarih yok',
+                'pub_date_parsed': parsed_date,
+            }))
+            new_count += 1
+    except etree.XMLSyntaxError as e:
+        raise ValueError(f"RSS formatı bozuk - {e}") from e
+
+    if source_name is None and not parsed_entries:
+        raise ValueError("RSS formatı bozuk - akışta kanal veya girdi bulunamadı")
+    print(f"✅ {source_name}: {len(parsed_entries)} girdi ({new_count} yeni).")
+    return parsed_entries
+
+
+async def _fetch_feed(url):
+    state = await asyncio.to_thread(feed_store.load_feed_state, url)
+    cached_items = feed_store.items_if_not_due(url, state)
+    if cached_items is not None:
+        return cached_items
+
+    print(f"📰 RSS okunuyor: {url}")
+    response = await http_client.async_get(url, headers=feed_store.request_headers(state))
+    if response.status_code == 304:
+        return await asyncio.to_thread(feed_store.reuse_unchanged, url, state)
+    response.raise_for_status()
+    parsed_entries = await asyncio.to_thread(parse_feed, response.content, feed_store.known_items(state))
+    return await asyncio.to_thread(feed_store.store_response, url, state, parsed_entries, response)
+
+
+async def fetch_feed(url, timeout=None):
+    """
+    Tek bir akışı okur ve haber listesini döndürür; hata veya zaman aşımında None döner.
+    timeout, indirme ve ayrıştırma dahil toplam süredir (varsayılan config.RSS_FEED_TIMEOUT).
+    """
+    try:
+        return await asyncio.wait_for(_fetch_feed(url), timeout or config.RSS_FEED_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"⏱️ RSS zaman aşımı ({url}): {timeout or config.RSS_FEED_TIMEOUT} sn içinde tamamlanamadı.")
+        return None
+    except Exception as e:
+        print(f"❌ RSS okuma hatası ({url}): {e}")
+        return None
+
+
+async def iter_feeds(feeds, timeout=None):
+    """
+    {kategori: [url, ...]} sözlüğündeki akışları eşzamanlı okur ve her akış bittiğinde
+    (kategori, url, haberler) üretir. Sıra, akışların tamamlanma sırasıdır.
+    """
+    async def run(category, url):
+        return category, url, await fetch_feed(url, timeout)
+
+    tasks = [asyncio.ensure_future(run(category, url)) for category, urls in feeds.items() for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def fetch_all_feeds(feeds, timeout=None):
+    """
+    Tüm akışları okur ve {kategori: [haber, ...]} döndürür. Akışlar bittikçe toplanır;
+    sonuç yine de her kategoride config'deki akış sırasıyla birleştirilir.
+    """
+    items_by_url = {}
+    async for category, url, items in iter_feeds(feeds, timeout):
+        items_by_url[url] = items or []
+
+    return {
+        category: [item for url in urls for item in items_by_url.get(url, [])]
+        for category, urls in feeds.items()
+    }
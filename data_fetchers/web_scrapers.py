@@ -6,9 +6,11 @@ fonksiyonları içerir.
 import time
 import re
 import traceback
+import functools
+import threading
 from pathlib import Path
 #import pandas as pd
-import requests # get_trending_topics_trends24 için gerekli
+import requests # Hata türleri (requests.exceptions) için gerekli
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -27,42 +29,247 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 # Ana dizindeki config dosyasını import ediyoruz
 import config
+from data_fetchers import http_client
 
+HTTP_SCRAPE_HEADERS = {
+    "User-Agent": config.HTTP_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "tr-TR,tr;q=0.9,en;q=0.8",
+}
+
+
+def _get_soup(url, timeout=10):
+    """Sayfayı tarayıcı olmadan düz HTTP isteğiyle indirip BeautifulSoup nesnesi döndürür."""
+    response = http_client.get(url, headers=HTTP_SCRAPE_HEADERS, timeout=timeout)
+    response.raise_for_status()
+    return BeautifulSoup(response.content, "html.parser")
+
+
+def http_first(http_fetcher, enabled=None):
+    """
+    Selenium kazıyıcısına hafif bir HTTP çıkarım yolu tanımlayan dekoratör.
+
+    Önce `http_fetcher` kazıyıcıyla aynı argümanlarla (sürücü hariç) çağrılır. Hata
+    verirse veya hiç satır döndürmezse paylaşılan WebDriver ile asıl kazıyıcıya düşülür.
+    Sürücü tembel (lazy) bir tutamaç olduğundan, HTTP yolu başarılı olduğunda Chrome
+    hiç başlatılmaz. `enabled` verilirse ve yanlış döndürürse (örn. gerekli adres
+    ayarlanmamışsa) HTTP yolu hiç denenmez.
+    """
+    def decorator(browser_scraper):
+        @functools.wraps(browser_scraper)
+        def wrapper(driver, *args, **kwargs):
+            name = browser_scraper.__name__
+            if enabled is not None and not enabled():
+                return browser_scraper(driver, *args, **kwargs)
+            try:
+                rows = http_fetcher(*args, **kwargs)
+                if rows:
+                    print(f"✅ {name}: HTTP ile {len(rows)} kayıt alındı, tarayıcı kullanılmadı.")
+                    return rows
+                print(f"ℹ️ {name}: HTTP yolu sonuç döndürmedi, tarayıcıya geçiliyor.")
+            except Exception as e:
+                print(f"ℹ️ {name}: HTTP yolu başarısız oldu ({e}), tarayıcıya geçiliyor.")
+            return browser_scraper(driver, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- BEKLEME KATMANI ---
+# Sabit time.sleep() çağrıları yerine, içerik hazır olur olmaz dönen koşullu beklemeler.
+# Her bekleme gerçekte ne kadar sürdüğünü WAIT_TIMINGS listesine kaydeder:
+# (etiket, süre_sn, koşul_sağlandı_mı). Liste report_wait_timings() ile raporlanıp boşaltılır.
+WAIT_TIMINGS = []
+_wait_timings_lock = threading.Lock()
+
+# Sayfanın tamamlanan kaynak (XHR, script vb.) sayısını döndürür. Tarayıcının varsayılan
+# 250 kayıtlık zamanlama tamponu dolunca sayı artmayı bırakacağı için tampon büyütülür.
+_RESOURCE_COUNT_SCRIPT = """
+if (!window.__waitBufferSet) { performance.setResourceTimingBufferSize(10000); window.__waitBufferSet = true; }
+return [document.readyState, performance.getEntriesByType('resource').length];
+"""
+
+
+def wait_until(driver, label, condition, timeout=10, required=False, poll_frequency=0.1):
+    """
+    `condition(driver)` doğru bir değer döndürene kadar bekler ve bu değeri döndürür.
+
+    Süre WAIT_TIMINGS'e kaydedilir. `required=True` ise zaman aşımında TimeoutException
+    fırlatılır; aksi halde None döndürülür ve kazıyıcı eldeki içerikle devam eder.
+    """
+    start = time.time()
+    result = None
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+        return result
+    except TimeoutException:
+        if required:
+            raise
+        print(f"ℹ️ Bekleme zaman aşımına uğradı ({label}, {timeout} sn), mevcut içerikle devam ediliyor.")
+        return None
+    finally:
+        with _wait_timings_lock:
+            WAIT_TIMINGS.append((label, time.time() - start, bool(result)))
+
+
+def network_idle(idle_ms=500):
+    """Sayfa yüklenmiş ve `idle_ms` boyunca yeni bir ağ isteği tamamlanmamışsa doğru döner."""
+    state = {"count": None, "changed_at": time.time()}
+
+    def condition(driver):
+        ready_state, resource_count = driver.execute_script(_RESOURCE_COUNT_SCRIPT)
+        now = time.time()
+        if resource_count != state["count"]:
+            state["count"], state["changed_at"] = resource_count, now
+            return False
+        return ready_state != "loading" and (now - state["changed_at"]) * 1000 >= idle_ms
+
+    return condition
+
+
+def row_count_stable(css_selector, stable_ms=300, min_rows=1):
+    """Seçiciyle eşleşen satır sayısı en az `min_rows` olup `stable_ms` boyunca değişmemişse satır sayısını döndürür."""
+    state = {"count": None, "changed_at": time.time()}
+
+    def condition(driver):
+        row_count = len(driver.find_elements(By.CSS_SELECTOR, css_selector))
+        now = time.time()
+        if row_count != state["count"]:
+            state["count"], state["changed_at"] = row_count, now
+            return False
+        if row_count >= min_rows and (now - state["changed_at"]) * 1000 >= stable_ms:
+            return row_count
+        return False
+
+    return condition
+
+
+def element_text_not_empty(css_selector):
+    """Seçiciyle eşleşen ilk elementin metni boş değilse o elementi döndürür."""
+    def condition(driver):
+        elements = driver.find_elements(By.CSS_SELECTOR, css_selector)
+        if elements and elements[0].text.strip():
+            return elements[0]
+        return False
+
+    return condition
+
+
+def report_wait_timings():
+    """Son rapordan bu yana yapılan beklemelerin sürelerini özetler ve kayıtları temizler."""
+    with _wait_timings_lock:
+        timings = list(WAIT_TIMINGS)
+        WAIT_TIMINGS.clear()
+    if not timings:
+        return
+    print("\n--- Kazıyıcı Bekleme Süreleri ---")
+    for label, duration, satisfied in timings:
+        status = "✅" if satisfied else "⌛"
+        print(f"{status} {label}: {duration:.2f} sn")
+    print(f"⏱️  Toplam bekleme: {sum(duration for _, duration, _ in timings):.2f} sn")
+
+
+# Sayfadaki tüm satırların (kartların) alanlarını tek bir WebDriver çağrısıyla toplayan betik.
+# arguments[0]: satır seçicisi, arguments[1]: {alan_adı: [css_seçici, nitelik]} sözlüğü.
+# Seçici boşsa satırın kendisi, nitelik boşsa elementin görünen metni kullanılır.
+_EXTRACT_ROWS_SCRIPT = """
+const [rowSelector, fields] = arguments;
+const clean = (text) => (text || '').replace(/\\s+/g, ' ').trim();
+return Array.from(document.querySelectorAll(rowSelector)).map((row) => {
+    const record = {};
+    for (const [name, [selector, attribute]] of Object.entries(fields)) {
+        const el = selector ? row.querySelector(selector) : row;
+        if (!el) {
+            record[name] = null;
+        } else if (attribute) {
+            record[name] = el.getAttribute(attribute) || '';
+        } else {
+            record[name] = clean(el.innerText || el.textContent);
+        }
+    }
+    return record;
+});
+"""
+
+
+def extract_rows_with_script(driver, row_selector, fields):
+    """
+    Sayfadaki `row_selector` ile eşleşen her satır için `fields` içinde tanımlanan alanları
+    tek bir enjekte edilmiş betikle toplar ve sözlük listesi olarak döndürür. Satır başına
+    ayrı find_element çağrıları veya tüm page_source'un aktarılması yerine tek bir IPC
+    çağrısı yapılır. Element bulunamazsa alan None, nitelik yoksa "" olur.
+    """
+    return driver.execute_script(_EXTRACT_ROWS_SCRIPT, row_selector, fields) or []
+
+
+def extract_rows_with_soup(soup, row_selector, fields):
+    """extract_rows_with_script'in BeautifulSoup karşılığı; HTTP yolunda aynı alan tanımlarıyla kullanılır."""
+    rows = []
+    for row in soup.select(row_selector):
+        record = {}
+        for name, (selector, attribute) in fields.items():
+            el = row.select_one(selector) if selector else row
+            if el is None:
+                record[name] = None
+            elif attribute:
+                record[name] = el.get(attribute) or ''
+            else:
+                record[name] = " ".join(el.get_text(" ", strip=True).split())
+        rows.append(record)
+    return rows
+
+
+BOOK_FIELDS = {
+    "title": (config.KITAP_TITLE_SELECTOR, None),
+    "href": (config.KITAP_TITLE_SELECTOR, "href"),
+    "author": (config.KITAP_AUTHOR_SELECTOR, None),
+    "image_data_src": (config.KITAP_IMAGE_SELECTOR, "data-src"),
+    "image_src": (config.KITAP_IMAGE_SELECTOR, "src"),
+}
+
+
+def _build_books(rows, limit):
+    """Kitap kartlarından toplanan alanları kitap sözlüklerine dönüştürür."""
+    books = []
+    for row in rows[:limit]:
+        if row["title"] is not None and row["image_src"] is not None:
+            book_link = row["href"]
+            if not book_link.startswith("http"):
+                book_link = "https://www.istanbulkitapcisi.com" + book_link
+
+            books.append({
+                "title": row["title"],
+                "author": row["author"] if row["author"] is not None else "Yazar Belirtilmemiş",
+                "image_url": row["image_data_src"] or row["image_src"] or None,
+                "link": book_link
+            })
+    return books
+
+
+def _fetch_books_http(limit=10):
+    """Çok satanlar listesini tarayıcı olmadan, sunucunun döndürdüğü statik HTML'den okur."""
+    soup = _get_soup(config.ISTANBUL_KITAPCISI_URL)
+    return _build_books(extract_rows_with_soup(soup, config.KITAP_WAIT_SELECTOR, BOOK_FIELDS), limit)
+
+
+@http_first(_fetch_books_http)
 def fetch_books(driver, limit=10):
     """İstanbul Kitapçısı'nın "Çok Satanlar" listesinden kitapları çeker."""
     url = config.ISTANBUL_KITAPCISI_URL
-    books = []
     print(f"ℹ️ İstanbul Kitapçısı verileri çekiliyor: {url}")
     try:
         driver.get(url)
         WebDriverWait(driver, 20).until(
             EC.presence_of_all_elements_located((By.CSS_SELECTOR, config.KITAP_WAIT_SELECTOR))
         )
-        time.sleep(1)
+        # Liste tamamen oluşana kadar (kart sayısı sabitlenene kadar) bekle
+        wait_until(driver, "kitap kartları", row_count_stable(config.KITAP_WAIT_SELECTOR), timeout=5)
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        book_elements = soup.select(config.KITAP_WAIT_SELECTOR)
-
-        if not book_elements:
+        rows = extract_rows_with_script(driver, config.KITAP_WAIT_SELECTOR, BOOK_FIELDS)
+        if not rows:
             print("⚠️ Kitap elementleri bulunamadı.")
             return []
 
-        for book_el in book_elements[:limit]:
-            title_el = book_el.select_one(config.KITAP_TITLE_SELECTOR)
-            author_el = book_el.select_one(config.KITAP_AUTHOR_SELECTOR)
-            image_el = book_el.select_one(config.KITAP_IMAGE_SELECTOR)
-
-            if title_el and image_el:
-                book_link = title_el.get('href')
-                if not book_link.startswith("http"):
-                    book_link = "https://www.istanbulkitapcisi.com" + book_link
-
-                books.append({
-                    "title": title_el.get_text(strip=True),
-                    "author": author_el.get_text(strip=True) if author_el else "Yazar Belirtilmemiş",
-                    "image_url": image_el.get('data-src') or image_el.get('src'),
-                    "link": book_link
-                })
+        books = _build_books(rows, limit)
         print(f"✅ {len(books)} adet kitap bilgisi (İstanbul Kitapçısı) başarıyla çekildi.")
         return books
     except Exception as e:
@@ -80,62 +287,76 @@ def _parse_zorlu_date_from_text(date_text):
         return day, month
     return None, None
 
+ZORLU_EVENT_FIELDS = {
+    "title": (config.ZORLU_TITLE_LINK_SELECTOR, None),
+    "href": (config.ZORLU_TITLE_LINK_SELECTOR, "href"),
+    "image_src": (config.ZORLU_IMAGE_SELECTOR, "src"),
+    "image_data_src": (config.ZORLU_IMAGE_SELECTOR, "data-src"),
+    "date": (config.ZORLU_DATE_SELECTOR, None),
+    "time": (config.ZORLU_TIME_SELECTOR, None),
+    "venue": (config.ZORLU_VENUE_SELECTOR, None),
+    "category": (config.ZORLU_CATEGORY_SELECTOR, None),
+}
+
+
+def _build_zorlu_events(rows):
+    """Zorlu PSM etkinlik kartlarından toplanan alanları etkinlik sözlüklerine dönüştürür."""
+    events = []
+    for row in rows:
+        try:
+            title = row["title"]
+            if not title:
+                continue
+
+            link_detail = row["href"] or '#'
+            final_link = f"https://www.zorlupsm.com{link_detail}" if link_detail and not link_detail.startswith('http') else link_detail
+
+            image_url_relative = (row["image_src"] or row["image_data_src"]) if row["image_src"] is not None else ''
+            image_url = f"https://www.zorlupsm.com{image_url_relative}" if image_url_relative and not image_url_relative.startswith('http') else image_url_relative
+
+            day, month = _parse_zorlu_date_from_text(row["date"])
+
+            events.append({
+                "title": title,
+                "date_str": f"{day} {month}" if day and month else "Belirtilmemiş",
+                "time_str": row["time"] or "",
+                "venue": row["venue"] if row["venue"] is not None else "Zorlu PSM",
+                "link": final_link,
+                "image_url": image_url,
+                "category": row["category"] if row["category"] is not None else "Genel"
+            })
+        except Exception as e_item:
+            print(f"⚠️ Zorlu PSM'de bir etkinlik detayı işlenirken hata: {e_item}")
+    return events
+
+
+def _fetch_istanbul_events_http():
+    """Zorlu PSM etkinlik kartlarını, sayfa sunucuda oluşturulmuşsa düz HTTP ile okur."""
+    soup = _get_soup(config.ZORLU_PSM_URL)
+    return _build_zorlu_events(extract_rows_with_soup(soup, config.ZORLU_EVENT_CARD_SELECTOR, ZORLU_EVENT_FIELDS))
+
+
+@http_first(_fetch_istanbul_events_http)
 def fetch_istanbul_events(driver):
     """Zorlu PSM web sitesinden etkinlikleri çeker."""
     url = config.ZORLU_PSM_URL
-    events = []
     print(f"ℹ️ Zorlu PSM etkinlikleri çekiliyor: {url}")
     try:
         driver.get(url)
-        # Gerekirse çerez kabul etme ve sayfa kaydırma işlemleri buraya eklenebilir.
-        # Örnek: time.sleep() yerine WebDriverWait kullanmak daha sağlıklıdır.
-        time.sleep(2) # Sayfanın ilk yüklenmesi için kısa bir bekleme
+        # Sabit beklemeler yerine: ilk kartlar gelene kadar bekle, sayfayı kaydır ve
+        # tembel yüklenen kartların ağ istekleri bitip kart sayısı sabitlenene kadar bekle.
+        wait_until(driver, "Zorlu PSM ilk kartlar", EC.presence_of_element_located((By.CSS_SELECTOR, config.ZORLU_EVENT_CARD_SELECTOR)), timeout=30, required=True)
         driver.find_element(By.TAG_NAME, "body").send_keys(Keys.PAGE_DOWN)
-        time.sleep(1)
+        wait_until(driver, "Zorlu PSM ağ sessizliği", network_idle(idle_ms=500), timeout=5)
+        wait_until(driver, "Zorlu PSM kart sayısı", row_count_stable(config.ZORLU_EVENT_CARD_SELECTOR), timeout=5)
+        event_rows = extract_rows_with_script(driver, config.ZORLU_EVENT_CARD_SELECTOR, ZORLU_EVENT_FIELDS)
 
-        WebDriverWait(driver, 30).until(
-            EC.visibility_of_all_elements_located((By.CSS_SELECTOR, config.ZORLU_EVENT_CARD_SELECTOR))
-        )
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        event_elements = soup.select(config.ZORLU_EVENT_CARD_SELECTOR)
-
-        if not event_elements:
+        if not event_rows:
             print(f"❌ KRİTİK HATA: Zorlu PSM sayfasında '{config.ZORLU_EVENT_CARD_SELECTOR}' ile eşleşen etkinlik bulunamadı.")
             return []
 
-        print(f"✅ Zorlu PSM: {len(event_elements)} potansiyel etkinlik bulundu.")
-        for event_element in event_elements:
-            try:
-                title_link_element = event_element.select_one(config.ZORLU_TITLE_LINK_SELECTOR)
-                title = title_link_element.get_text(strip=True) if title_link_element else None
-                if not title:
-                    continue
-
-                link_detail = title_link_element.get('href') if title_link_element else '#'
-                final_link = f"https://www.zorlupsm.com{link_detail}" if link_detail and not link_detail.startswith('http') else link_detail
-
-                image_el = event_element.select_one(config.ZORLU_IMAGE_SELECTOR)
-                image_url_relative = image_el.get('src') or image_el.get('data-src') if image_el else ''
-                image_url = f"https://www.zorlupsm.com{image_url_relative}" if image_url_relative and not image_url_relative.startswith('http') else image_url_relative
-
-                date_el = event_element.select_one(config.ZORLU_DATE_SELECTOR)
-                day, month = _parse_zorlu_date_from_text(date_el.text) if date_el else (None, None)
-                
-                time_el = event_element.select_one(config.ZORLU_TIME_SELECTOR)
-                venue_el = event_element.select_one(config.ZORLU_VENUE_SELECTOR)
-                category_el = event_element.select_one(config.ZORLU_CATEGORY_SELECTOR)
-
-                events.append({
-                    "title": title,
-                    "date_str": f"{day} {month}" if day and month else "Belirtilmemiş",
-                    "time_str": time_el.text.strip() if time_el else "",
-                    "venue": venue_el.text.strip() if venue_el else "Zorlu PSM",
-                    "link": final_link,
-                    "image_url": image_url,
-                    "category": category_el.get_text(strip=True) if category_el else "Genel"
-                })
-            except Exception as e_item:
-                print(f"⚠️ Zorlu PSM'de bir etkinlik detayı işlenirken hata: {e_item}")
+        print(f"✅ Zorlu PSM: {len(event_rows)} potansiyel etkinlik bulundu.")
+        events = _build_zorlu_events(event_rows)
         print(f"✅ Toplam {len(events)} etkinlik Zorlu PSM'den başarıyla çekildi.")
         return events
     except Exception as e:
@@ -143,6 +364,44 @@ def fetch_istanbul_events(driver):
         return []
     
 
+def _parse_rating_rows(soup, limit):
+    """Reyting tablosunun HTML'inden [sıra, program, kanal, reyting] satırlarını ayıklar."""
+    final_list = []
+    table_rows = soup.select('tbody tr')
+
+    # DÜZELTME 1: Başlık satırını atlamak için döngüye ikinci satırdan başlıyoruz ([1:]).
+    for row in table_rows[1:]:
+        if len(final_list) >= limit:
+            break
+
+        cols = row.find_all('td')
+        # DÜZELTME 2: Yeterli sütun olup olmadığını kontrol ediyoruz (en az 6).
+        if len(cols) >= 6:
+            try:
+                sira = int(cols[0].get_text(strip=True))
+                program = cols[1].get_text(strip=True)
+                kanal = cols[2].get_text(strip=True)
+                # DÜZELTME 3: Reytingi doğru sütundan alıyoruz (6. sütun, index 5).
+                rating_str = cols[5].get_text(strip=True).replace(',', '.')
+                rating_percent = float(rating_str)
+
+                final_list.append([sira, program, kanal, rating_percent])
+            except (ValueError, IndexError):
+                # Bir veri satırı hatalıysa görmezden gel ve devam et.
+                continue
+    return final_list
+
+
+def _fetch_daily_ratings_http(limit=10):
+    """
+    Reyting tablosunu tarayıcı olmadan, tablo HTML'ini config.TIAK_TABLE_AJAX_URL uç
+    noktasından alarak okur. Ana sayfadaki #tablo AJAX ile doldurulduğu için statik
+    sayfada satır yoktur; uç nokta tanımlı değilse bu yol denenmez.
+    """
+    return _parse_rating_rows(_get_soup(config.TIAK_TABLE_AJAX_URL), limit)
+
+
+@http_first(_fetch_daily_ratings_http, enabled=lambda: bool(config.TIAK_TABLE_AJAX_URL))
 def get_daily_ratings(driver, limit=10):
     """
     TIAK sitesinden reyting verilerini çeker. Bu versiyon pandas kütüphanesini kullanmaz.
@@ -164,35 +423,14 @@ def get_daily_ratings(driver, limit=10):
         tablo_konteyneri = wait.until(
             EC.visibility_of_element_located((By.ID, "tablo"))
         )
-        time.sleep(2)
+        # Tablo satırları AJAX ile dolarken sayı sabitlenene kadar bekle
+        wait_until(driver, "TIAK tablo satırları", row_count_stable("#tablo tbody tr", min_rows=2), timeout=10)
         print("✅ Reyting tablosu yüklendi.")
 
         page_source = tablo_konteyneri.get_attribute('innerHTML')
         soup = BeautifulSoup(page_source, 'html.parser')
 
-        final_list = []
-        table_rows = soup.select('tbody tr')
-
-        # DÜZELTME 1: Başlık satırını atlamak için döngüye ikinci satırdan başlıyoruz ([1:]).
-        for row in table_rows[1:]:
-            if len(final_list) >= limit:
-                break
-            
-            cols = row.find_all('td')
-            # DÜZELTME 2: Yeterli sütun olup olmadığını kontrol ediyoruz (en az 6).
-            if len(cols) >= 6:
-                try:
-                    sira = int(cols[0].get_text(strip=True))
-                    program = cols[1].get_text(strip=True)
-                    kanal = cols[2].get_text(strip=True)
-                    # DÜZELTME 3: Reytingi doğru sütundan alıyoruz (6. sütun, index 5).
-                    rating_str = cols[5].get_text(strip=True).replace(',', '.')
-                    rating_percent = float(rating_str)
-                    
-                    final_list.append([sira, program, kanal, rating_percent])
-                except (ValueError, IndexError):
-                    # Bir veri satırı hatalıysa görmezden gel ve devam et.
-                    continue
+        final_list = _parse_rating_rows(soup, limit)
         
         if not final_list:
             raise ValueError("HTML içeriği analiz edildi ama içinden geçerli veri satırı bulunamadı.")
@@ -218,7 +456,7 @@ def get_trending_topics_trends24(limit=10):
     print(f"ℹ️ Twitter trendleri çekiliyor: {url}")
     try:
         # Bu işlem için Selenium'a gerek yok, requests daha hızlıdır.
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response = http_client.get(url)
         response.raise_for_status()
         response.encoding = 'utf-8'
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -244,6 +482,41 @@ def get_trending_topics_trends24(limit=10):
         print(f"⚠️ Trends24 trend çekme hatası: {e}")
         return []
 
+def _convert_flashscore_time(time_str_raw):
+    """Flashscore'un UTC zaman metnini UTC+3'e çevirir; çevrilemezse orijinal metni döndürür."""
+    converted_time_str = time_str_raw  # Hata durumunda orijinali kullan
+
+    # Zamanı UTC+3'e dönüştürmeyi dene
+    try:
+        # Durum 1: "DD.MM. HH:MM" formatı (örn: "18.06. 22:00")
+        if '.' in time_str_raw and ':' in time_str_raw:
+            parts = time_str_raw.split()
+            date_part = parts[0]
+            time_part = parts[1]
+
+            current_year = datetime.now().year
+            full_date_str = f"{date_part}{current_year} {time_part}"
+
+            utc_time = datetime.strptime(full_date_str, "%d.%m.%Y %H:%M")
+            local_time = utc_time + timedelta(hours=config.TIME_OFFSET_HOURS)
+            converted_time_str = local_time.strftime("%d.%m. %H:%M")
+
+        # Durum 2: "HH:MM" formatı (örn: "21:45")
+        elif ':' in time_str_raw and '.' not in time_str_raw:
+            hour, minute = map(int, time_str_raw.split(':'))
+
+            now_utc = datetime.now(timezone.utc)
+            utc_time = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+            local_time = utc_time + timedelta(hours=config.TIME_OFFSET_HOURS)
+            converted_time_str = local_time.strftime("%H:%M")
+
+    except (ValueError, IndexError) as e:
+        print(f"ℹ️ Flashscore zamanı ({time_str_raw}) dönüştürülemedi, orijinal kullanılıyor. Hata: {e}")
+        converted_time_str = time_str_raw
+    return converted_time_str
+
+
 def get_flashscore_sport_fixtures(driver, combined_path, league_name, max_fixtures=7):
     """Flashscore'dan fikstür bilgilerini çeker."""
     path_parts = combined_path.split('/', 1)
@@ -254,84 +527,57 @@ def get_flashscore_sport_fixtures(driver, combined_path, league_name, max_fixtur
     print(f"ℹ️ {league_name} fikstürü çekiliyor...")
     try:
         driver.get(url)
-        # Çerezleri kabul etme
+        WebDriverWait(driver, 20).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, config.FLASHSCORE_MATCH_ELEMENT_SELECTOR)))
+
+        # Çerezleri kabul etme. Kalıcı profilde onay çerezi saklandığı için bant çoğu
+        # zaman hiç çıkmaz; bu yüzden butonu uzun süre beklemek yerine yalnızca varsa tıklıyoruz.
         try:
-            WebDriverWait(driver, 7).until(EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))).click()
-            time.sleep(0.5)
+            cookie_buttons = driver.find_elements(By.ID, "onetrust-accept-btn-handler")
+            if cookie_buttons and cookie_buttons[0].is_displayed():
+                cookie_buttons[0].click()
+                wait_until(driver, f"{league_name} çerez bandı", EC.invisibility_of_element_located((By.ID, "onetrust-banner-sdk")), timeout=3)
         except Exception:
-            pass # Popup çıkmazsa devam et
+            pass # Popup çıkmazsa veya tıklanamazsa devam et
+        # Satırlar DOM'a eklendikten sonra takım/saat metinleri de dolmuş olmalı
+        wait_until(driver, f"{league_name} maç satırları", element_text_not_empty(config.FLASHSCORE_MATCH_ELEMENT_SELECTOR), timeout=5)
+
+        if sport_path == "basketbol":
+            home_team_class = config.FLASHSCORE_BASKETBOL_HOME_TEAM_CLASS
+            away_team_class = config.FLASHSCORE_BASKETBOL_AWAY_TEAM_CLASS
+        else:  # Varsayılan olarak futbol
+            home_team_class = config.FLASHSCORE_FUTBOL_HOME_TEAM_CLASS
+            away_team_class = config.FLASHSCORE_FUTBOL_AWAY_TEAM_CLASS
+
+        # Tüm maç satırlarının saat ve takım bilgileri tek bir betik çağrısıyla alınır.
+        match_rows = extract_rows_with_script(driver, config.FLASHSCORE_MATCH_ELEMENT_SELECTOR, {
+            "time": (f".{config.FLASHSCORE_TIME_CLASS}", None),
+            "home": (f".{home_team_class}", None),
+            "away": (f".{away_team_class}", None),
+        })
 
-        WebDriverWait(driver, 20).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, config.FLASHSCORE_MATCH_ELEMENT_SELECTOR)))
-        
-        matches = driver.find_elements(By.CSS_SELECTOR, config.FLASHSCORE_MATCH_ELEMENT_SELECTOR)
         fixtures = []
-        for match_element in matches:
+        for match_row in match_rows:
             if len(fixtures) >= max_fixtures:
                 break
-            try:
-                time_str_raw = match_element.find_element(By.CLASS_NAME, config.FLASHSCORE_TIME_CLASS).text.strip()
-                converted_time_str = time_str_raw  # Hata durumunda orijinali kullan
-
-                # Zamanı UTC+3'e dönüştürmeyi dene
-                try:
-                    # Durum 1: "DD.MM. HH:MM" formatı (örn: "18.06. 22:00")
-                    if '.' in time_str_raw and ':' in time_str_raw:
-                        parts = time_str_raw.split()
-                        date_part = parts[0]
-                        time_part = parts[1]
-                        
-                        current_year = datetime.now().year
-                        full_date_str = f"{date_part}{current_year} {time_part}"
-                        
-                        utc_time = datetime.strptime(full_date_str, "%d.%m.%Y %H:%M")
-                        local_time = utc_time + timedelta(hours=config.TIME_OFFSET_HOURS)
-                        converted_time_str = local_time.strftime("%d.%m. %H:%M")
-
-                    # Durum 2: "HH:MM" formatı (örn: "21:45")
-                    elif ':' in time_str_raw and '.' not in time_str_raw:
-                        hour, minute = map(int, time_str_raw.split(':'))
-                        
-                        now_utc = datetime.now(timezone.utc)
-                        utc_time = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        
-                        local_time = utc_time + timedelta(hours=config.TIME_OFFSET_HOURS)
-                        converted_time_str = local_time.strftime("%H:%M")
-
-                except (ValueError, IndexError) as e:
-                    print(f"ℹ️ Flashscore zamanı ({time_str_raw}) dönüştürülemedi, orijinal kullanılıyor. Hata: {e}")
-                    converted_time_str = time_str_raw
-
-                if sport_path == "basketbol":
-                    home_team_class = config.FLASHSCORE_BASKETBOL_HOME_TEAM_CLASS
-                    away_team_class = config.FLASHSCORE_BASKETBOL_AWAY_TEAM_CLASS
-                else:  # Varsayılan olarak futbol
-                    home_team_class = config.FLASHSCORE_FUTBOL_HOME_TEAM_CLASS
-                    away_team_class = config.FLASHSCORE_FUTBOL_AWAY_TEAM_CLASS
-
-                home_team = match_element.find_element(By.CLASS_NAME, home_team_class).text.strip()
-                away_team = match_element.find_element(By.CLASS_NAME, away_team_class).text.strip()
-                
-                if not home_team or not away_team:
-                    continue
-
-                fixtures.append(f"{converted_time_str}: {home_team} vs {away_team}")
-            except Exception:
-                continue  # Tek bir maçta hata olursa atla
+            # Saat veya takım elementi olmayan ya da takım adı boş olan satırları atla
+            if match_row["time"] is None or not match_row["home"] or not match_row["away"]:
+                continue
+
+            converted_time_str = _convert_flashscore_time(match_row["time"])
+            fixtures.append(f"{converted_time_str}: {match_row['home']} vs {match_row['away']}")
 
         print(f"✅ {league_name}: {len(fixtures)} maç bulundu.")
         return league_name, fixtures
     except Exception as e:
         print(f"❌ {league_name} ({combined_path}) Flashscore verisi alınamadı: {e}")
-        return league_name, []
+        # None dönülür ki boş sonuç önbelleğe yazılmasın ve ligin son geçerli verisi kullanılsın.
+        return league_name, None
     
 
 def fetch_article_snippet(url, timeout=7):
     """Verilen URL'den makalenin meta açıklamasını veya ilk birkaç paragrafını çeker."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = http_client.get(url, timeout=timeout)
         response.raise_for_status()
         soup = BeautifulSoup(response.content, 'html.parser')
 
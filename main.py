@@ -3,16 +3,14 @@
 import time
 import shutil
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
-import undetected_chromedriver as uc
-import hashlib # <- BURAYI EKLEDİK
 
 # Proje modüllerini import et
 import config
-from analysis.news_analyzer import group_similar_news
-from data_fetchers import api_fetchers, web_scrapers
+from analysis.news_analyzer import group_into_stories
+from data_fetchers import api_fetchers, http_client, rss_engine, web_scrapers
+from data_fetchers.browser import DriverPool
 from data_fetchers.web_scrapers import fetch_article_snippet
 from analysis.summarizer import (
     generate_abstractive_summary,
@@ -21,33 +19,11 @@ from analysis.summarizer import (
     generate_dynamic_headline_for_trends,
     generate_comparative_news_analysis
 )
+import cache_manager
 from cache_manager import get_cached_data
+from pipeline import Stage, run_stages
 
 
-def setup_driver():
-    """Paylaşılan ve tespit edilemeyen Selenium WebDriver'ı kurar."""
-    print("ℹ️ Undetected Chrome WebDriver kuruluyor...")
-    try:
-        chrome_options = uc.ChromeOptions()
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-        # GitHub Actions ortamında belirli bir sürüm belirtmek stabiliteyi artırabilir.
-        # Eğer yerel makinede çalışıyorsanız bu satırı yorum satırı yapabilirsiniz.
-        # print("ℹ️ Tarayıcı sürümü 137 olarak ayarlanıyor.")
-        # driver = uc.Chrome(options=chrome_options, version_main=137) CHROME ESKİ SÜRÜME GERİ DÖNMEK GEREKİRSE VERSİYON 137
-        driver = uc.Chrome(options=chrome_options, version_main=145)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        print("✅ Undetected Chrome WebDriver başarıyla başlatıldı.")
-        return driver
-    except Exception as e:
-        import traceback
-        print(f"❌ Undetected Chrome WebDriver başlatılamadı: {e}")
-        traceback.print_exc()
-        return None
-
 def generate_output_files(context):
     """Toplanan verileri ve statik dosyaları kullanarak 'output' klasörünü oluşturur."""
     print("\n--- Çıktı Dosyaları Oluşturuluyor ---")
@@ -79,186 +55,251 @@ def generate_output_files(context):
 
 
 
+def build_weather_commentary(weather):
+    """Hava durumu verisinden Gemini ile kısa bir yorum metni oluşturur."""
+    weather_commentary_fetcher = lambda: generate_weather_commentary(weather)
+    return get_cached_data("ai_weather_commentary.json", weather_commentary_fetcher, expiry_minutes=120) or "Hava durumu yorumu alınamadı."
+
+
+def build_top_headlines(news):
+    """En yeni 5 haberden Gemini ile günün önemli başlıklarını oluşturur."""
+    def fetch_daily_summary():
+        all_news_flat = [item for sublist in (news or {}).values() for item in sublist]
+        # En yeni 5 haberi al
+        sorted_news = sorted(all_news_flat, key=lambda x: x['pub_date_parsed'], reverse=True)[:5]
+        if not sorted_news: return None
+
+        # Haber içeriklerini çekmek için string oluştur
+        news_content_for_prompt = ""
+        for news_item in sorted_news:
+            # Başlık ve özet bilgisini birleştirerek prompt'a ekle
+            news_content_for_prompt += f"Başlık: {news_item['title']}\nÖzet: {news_item['summary']}\n\n"
+
+        if news_content_for_prompt:
+            return generate_abstractive_summary(news_content_for_prompt)
+        return None
+
+    print("🔄 Günlük haber özeti (önemli başlıklar) oluşturuluyor...")
+    time.sleep(5) # AI kotası için 5 saniye bekle
+    summary_data = get_cached_data("ai_top_headlines.json", fetch_daily_summary, expiry_minutes=60)
+    top_headlines = summary_data if summary_data else []
+    if top_headlines: print("✅ Günlük haber özeti başarıyla oluşturuldu.")
+    else: print("⚠️ Günlük haber özeti oluşturulamadı veya veri bulunamadı.")
+    return top_headlines
+
+
+def build_daily_briefing(weather_commentary, top_headlines, exchange_rates):
+    """Hava durumu yorumu, önemli başlıklar ve döviz kurlarından günün brifingini oluşturur."""
+    print("🔄 Günlük brifing metni (günün özeti) oluşturuluyor...")
+    time.sleep(5) # AI kotası için 5 saniye bekle
+    briefing_input = {
+        'weather_commentary': weather_commentary,
+        'top_headlines': top_headlines,
+        'exchange_rates': exchange_rates,
+    }
+    briefing_fetcher = lambda: generate_daily_briefing(briefing_input)
+    daily_briefing = get_cached_data(
+        "ai_daily_briefing.json",
+        briefing_fetcher,
+        expiry_minutes=120
+    ) or "Günün özeti alınamadı." # Önbellek boşsa ve API de çalışmazsa gösterilecek mesaj.
+
+    if daily_briefing and "alınamadı" not in daily_briefing:
+        print("✅ Günlük brifing metni başarıyla oluşturuldu (önbellek kullanıldı).")
+    else:
+        print("⚠️ Günlük brifing oluşturulamadı veya veri bulunamadı.")
+    return daily_briefing
+
+
+def build_news_analyses(news):
+    """Benzer haberleri gruplar ve en kalabalık gruplar için karşılaştırmalı analiz üretir."""
+    # =========================================================================
+    # ===== KOTA SORUNUNU ÇÖZEN VE HABERLERİ FİLTRELEYEN NİHAİ BLOK =====
+    # =========================================================================
+    all_news_list = [item for category_news in (news or {}).values() for item in category_news]
+    haber_analizleri = []
+
+    if all_news_list:
+        print("\n--- Benzer Haberler Gruplanıyor ve Analiz Ediliyor (Tekilleştirme ve Filtreleme Aktif) ---")
+
+        # YENİ ADIM 1: Haberleri linklerine göre tekilleştirme
+        seen_links = set()
+        unique_news_list = []
+        for news_item in all_news_list:
+            if news_item['link'] not in seen_links:
+                unique_news_list.append(news_item)
+                seen_links.add(news_item['link'])
+        print(f"✅ Mükerrer kayıtlar temizlendi. {len(all_news_list)} haberden {len(unique_news_list)} tekil habere düşüldü.")
+
+        # YENİ ADIM 2: İstenmeyen konuları (yemek tarifi, astroloji vb.) filtreleme
+        BLACKLISTED_KEYWORDS = (
+            'tarifi', 'yemek', 'mutfak', 'malzemeler', 'nasıl yapılır',
+            'burç', 'astroloji', 'fal', 'günlük yorum', 'burçlar',
+            'magazin', 'dedikodu', 'ünlü'
+        )
+        filtered_news_list = [
+            news_item for news_item in unique_news_list
+            if not any(keyword in news_item['title'].lower() for keyword in BLACKLISTED_KEYWORDS)
+        ]
+        print(f"✅ İstenmeyen konular filtrelendi. Analiz için {len(filtered_news_list)} haber kaldı.")
+
+        # Filtrelenmiş haberler, çalışmalar arasında kimliği korunan hikâyelere atanır.
+        hikayeler = group_into_stories(filtered_news_list)
+
+        if hikayeler:
+            # --- YENİ EKLENEN KISIM: KOTA KORUMASI ---
+            hikayeler.sort(key=lambda story: len(story['items']), reverse=True) # En çok haber olan grupları öne al
+            analiz_sayaci = 0 # Kotayı korumak için sayaç
+
+            for story in hikayeler:
+                group = story['items']
+                if len(group) > 1:
+                    if analiz_sayaci >= 6: # Tek seferde en fazla 6 grubu analiz et
+                        break
+
+                    # Analiz hikâye kimliği ve revizyonuyla anahtarlanır: hikâyeye tek bir yeni
+                    # başlık katılması analizi yeniletmez, yalnızca revizyon artınca yenilenir.
+                    cache_key = f"analysis_story_{story['id']}_r{story['revision']}.json"
+
+                    analysis_result = get_cached_data(
+                        cache_key,
+                        lambda g=group: generate_comparative_news_analysis(g),
+                        expiry_minutes=config.STORY_ANALYSIS_CACHE_MINUTES
+                    )
+
+                    if analysis_result:
+                        haber_analizleri.extend(analysis_result)
+                        analiz_sayaci += 1
+                        time.sleep(5) # API sınırına takılmamak için 5 saniye bekle
+
+        if haber_analizleri:
+            print(f"✅ Toplam {len(haber_analizleri)} adet olay analizi başarıyla oluşturuldu (önbellek kullanıldı).")
+        else:
+            print("⚠️ Analiz edilecek yeterli haber grubu bulunamadı veya analiz sırasında hata oluştu.")
+    # =================== DEĞİŞİKLİĞİN SONU ===================
+    return haber_analizleri
+
+
+def fetch_all_news():
+    """Tüm RSS akışlarını eşzamanlı olarak çeker ve kategorilere göre gruplar."""
+    print("\n--- RSS Akışları Eşzamanlı Olarak Çekiliyor ---")
+    return http_client.run_async(rss_engine.fetch_all_feeds(config.RSS_FEEDS))
+
+
+def league_cache_minutes(league_name, now=None):
+    """Ligin önbellek süresini döndürür; ligin maç günlerinde daha kısa süre kullanılır."""
+    policy = {**config.SPORT_LEAGUE_CACHE_DEFAULTS, **config.SPORT_LEAGUE_CACHE_POLICIES.get(league_name, {})}
+    today = (now or datetime.now(config.TZ)).weekday()
+    return policy["matchday_ttl"] if today in policy["matchdays"] else policy["ttl"]
+
+
+def merge_istanbul_events(zorlu_events, ticketmaster_events):
+    """Zorlu PSM ve Ticketmaster etkinliklerini tek listede birleştirir."""
+    istanbul_events = (zorlu_events or []) + (ticketmaster_events or [])
+    print(f"✅ Toplam {len(istanbul_events)} adet etkinlik birleştirildi.")
+    return istanbul_events
+
+
+# API kaynakları: aşama adı -> (önbellek dosyası, süre (dk), koşullu istek, coroutine fonksiyonu, boş değer)
+API_SOURCES = {
+    "ticketmaster_events": ("ticketmaster_events.json", 20, False, lambda: api_fetchers.fetch_ticketmaster_events_async(limit=10, city='Istanbul', get_popular_and_sort_by_date=True), []),
+    "weather": ("weather.json", 15, False, api_fetchers.get_hourly_weather_async, {}),
+    "exchange_rates": ("exchange_rates.json", 30, False, api_fetchers.get_exchange_rates_async, {}),
+    "movies": ("movies.json", 60, True, lambda validators: api_fetchers.fetch_movies_async(validators=validators), []),
+    "spotify_tracks": ("spotify.json", 60, False, api_fetchers.get_new_turkish_rap_tracks_embed_async, []),
+}
+
+
+def fetch_api_data():
+    """Tüm API kaynaklarını tek aşamada, ortak olay döngüsünde eşzamanlı çeker (her biri kendi önbellek kaydıyla)."""
+    print("\n--- API Kaynakları Eşzamanlı Olarak Çekiliyor ---")
+
+    def cached(name, fetch):
+        cache_file, expiry_minutes, conditional, _, empty = API_SOURCES[name]
+        return get_cached_data(cache_file, fetch, expiry_minutes=expiry_minutes, conditional=conditional) or empty
+
+    sources = {name: source[3] for name, source in API_SOURCES.items()}
+    return http_client.run_async(api_fetchers.fetch_all_async(sources, cached=cached))
+
+
 def gather_all_data():
     """Tüm kaynaklardan verileri (önbelleği kontrol ederek) toplayan ana fonksiyon."""
-    
-    context = {}
-    driver = setup_driver() # WebDriver'ı bir kere başlat
-    if not driver:
-        print("❌ WebDriver başlatılamadığı için program durduruluyor.")
-        return None
+
+    # Selenium kazıyıcıları paralel çalışabilsin diye sınırlı bir tarayıcı havuzu kullanıyoruz.
+    # Tarayıcılar yalnızca bayatlamış bir önbellek kaydı için gerçekten gerektiğinde başlatılır.
+    pool = DriverPool(config.BROWSER_POOL_SIZE)
 
     try:
         print("--- Veri Toplama İşlemi Başladı (Önbellek Kontrolü Aktif) ---")
-        
-        # --- Selenium ile çekilen ve önbelleğe alınan veriler ---
-        books_fetcher = lambda: web_scrapers.fetch_books(driver)
-        context['books'] = get_cached_data("books.json", books_fetcher, expiry_minutes=120) or []
-
-        ratings_fetcher = lambda: web_scrapers.get_daily_ratings(driver)
-        context['ratings'] = get_cached_data("ratings.json", ratings_fetcher, expiry_minutes=180) or []
-
-        zorlu_events_fetcher = lambda: web_scrapers.fetch_istanbul_events(driver)
-        zorlu_events = get_cached_data("zorlu_events.json", zorlu_events_fetcher, expiry_minutes=60) or []
-
-        def fetch_all_fixtures():
-            fixtures_all = {}
-            for path, name in config.SPORT_LEAGUES_CONFIG:
-                _, fixtures = web_scrapers.get_flashscore_sport_fixtures(driver, path, name)
-                fixtures_all[name] = fixtures
-            return fixtures_all
-        context['fixtures'] = get_cached_data("fixtures.json", fetch_all_fixtures, expiry_minutes=120) or {}
-
-        # --- API ve Diğer Veriler (Önbellekli) ---
-        print("\n--- API ve Diğer Veriler Çekiliyor (Önbellek Kontrolü Aktif) ---")
-        
-        ticketmaster_fetcher = lambda: api_fetchers.fetch_ticketmaster_events(limit=10, city='Istanbul', get_popular_and_sort_by_date=True)
-        ticketmaster_events = get_cached_data("ticketmaster_events.json", ticketmaster_fetcher, expiry_minutes=20) or []
-        
-        context['istanbul_events'] = zorlu_events + ticketmaster_events
-        print(f"✅ Toplam {len(context['istanbul_events'])} adet etkinlik birleştirildi.")
-        
-        context['weather'] = get_cached_data("weather.json", api_fetchers.get_hourly_weather, expiry_minutes=15) or {}
-        context['exchange_rates'] = get_cached_data("exchange_rates.json", api_fetchers.get_exchange_rates, expiry_minutes=30) or {}
-        context['movies'] = get_cached_data("movies.json", api_fetchers.fetch_movies, expiry_minutes=60) or []
-        context['spotify_tracks'] = get_cached_data("spotify.json", api_fetchers.get_new_turkish_rap_tracks_embed, expiry_minutes=60) or []
-        context['twitter_trends'] = get_cached_data("trends.json", web_scrapers.get_trending_topics_trends24, expiry_minutes=10) or []
-
-        # --- RSS Akışları (Genellikle önbelleksiz veya çok kısa süreli) ---
-        print("\n--- RSS Akışları Paralel Olarak Çekiliyor ---")
-        news_results = {category: [] for category in config.RSS_FEEDS}
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_url = {executor.submit(api_fetchers.fetch_rss_feed, url): category for category, urls in config.RSS_FEEDS.items() for url in urls}
-            for future in future_to_url:
-                category = future_to_url[future]
-                try:
-                    result = future.result()
-                    if result: news_results[category].extend(result)
-                except Exception as e:
-                    print(f"⚠️ RSS görevi hatası: {e}")
-        context['news'] = news_results
-        
-        # --- Yapay Zeka ile İçerik Üretimi (Önbellek Kontrolü Aktif) ---
-        print("\n--- Yapay Zeka ile İçerik Üretimi Başladı ---")
-
-        weather_commentary_fetcher = lambda: generate_weather_commentary(context.get('weather'))
-        context['weather_commentary'] = get_cached_data("ai_weather_commentary.json", weather_commentary_fetcher, expiry_minutes=120) or "Hava durumu yorumu alınamadı."
-
-        def fetch_daily_summary():
-            all_news_flat = [item for sublist in news_results.values() for item in sublist]
-            # En yeni 5 haberi al
-            sorted_news = sorted(all_news_flat, key=lambda x: x['pub_date_parsed'], reverse=True)[:5]
-            if not sorted_news: return None
-            
-            # Haber içeriklerini çekmek için string oluştur
-            news_content_for_prompt = ""
-            for news_item in sorted_news:
-                # Başlık ve özet bilgisini birleştirerek prompt'a ekle
-                news_content_for_prompt += f"Başlık: {news_item['title']}\nÖzet: {news_item['summary']}\n\n"
-            
-            if news_content_for_prompt:
-                return generate_abstractive_summary(news_content_for_prompt)
-            return None
-
-        print("🔄 Günlük haber özeti (önemli başlıklar) oluşturuluyor...")
-        time.sleep(5) # AI kotası için 5 saniye bekle
-        summary_data = get_cached_data("ai_top_headlines.json", fetch_daily_summary, expiry_minutes=60)
-        context['top_headlines'] = summary_data if summary_data else []
-        if context['top_headlines']: print("✅ Günlük haber özeti başarıyla oluşturuldu.")
-        else: print("⚠️ Günlük haber özeti oluşturulamadı veya veri bulunamadı.")
-
-        print("🔄 Günlük brifing metni (günün özeti) oluşturuluyor...")
-        time.sleep(5) # AI kotası için 5 saniye bekle
-        briefing_fetcher = lambda: generate_daily_briefing(context)
-        context['daily_briefing'] = get_cached_data(
-            "ai_daily_briefing.json",
-            briefing_fetcher,
-            expiry_minutes=120
-        ) or "Günün özeti alınamadı." # Önbellek boşsa ve API de çalışmazsa gösterilecek mesaj.
-
-        if context.get('daily_briefing') and "alınamadı" not in context['daily_briefing']:
-            print("✅ Günlük brifing metni başarıyla oluşturuldu (önbellek kullanıldı).")
-        else:
-            print("⚠️ Günlük brifing oluşturulamadı veya veri bulunamadı.")
-
-        # =========================================================================
-        # ===== KOTA SORUNUNU ÇÖZEN VE HABERLERİ FİLTRELEYEN NİHAİ BLOK =====
-        # =========================================================================
-        all_news_list = [item for category_news in context.get('news', {}).values() for item in category_news]
-        context['haber_analizleri'] = [] 
-
-        if all_news_list:
-            print("\n--- Benzer Haberler Gruplanıyor ve Analiz Ediliyor (Tekilleştirme ve Filtreleme Aktif) ---")
-            
-            # YENİ ADIM 1: Haberleri linklerine göre tekilleştirme
-            seen_links = set()
-            unique_news_list = []
-            for news_item in all_news_list:
-                if news_item['link'] not in seen_links:
-                    unique_news_list.append(news_item)
-                    seen_links.add(news_item['link'])
-            print(f"✅ Mükerrer kayıtlar temizlendi. {len(all_news_list)} haberden {len(unique_news_list)} tekil habere düşüldü.")
-
-            # YENİ ADIM 2: İstenmeyen konuları (yemek tarifi, astroloji vb.) filtreleme
-            BLACKLISTED_KEYWORDS = (
-                'tarifi', 'yemek', 'mutfak', 'malzemeler', 'nasıl yapılır',
-                'burç', 'astroloji', 'fal', 'günlük yorum', 'burçlar',
-                'magazin', 'dedikodu', 'ünlü'
-            )
-            filtered_news_list = [
-                news for news in unique_news_list
-                if not any(keyword in news['title'].lower() for keyword in BLACKLISTED_KEYWORDS)
-            ]
-            print(f"✅ İstenmeyen konular filtrelendi. Analiz için {len(filtered_news_list)} haber kaldı.")
-            
-            # Eski `group_similar_news` fonksiyonunu filtrelenmiş liste ile çağırıyoruz
-            haber_gruplari = group_similar_news(filtered_news_list)
-            
-            if haber_gruplari:
-                cached_haber_analizleri = []
-                
-                # --- YENİ EKLENEN KISIM: KOTA KORUMASI ---
-                haber_gruplari.sort(key=len, reverse=True) # En çok haber olan grupları öne al
-                analiz_sayaci = 0 # Kotayı korumak için sayaç
-                
-                for group in haber_gruplari:
-                    if len(group) > 1:
-                        if analiz_sayaci >= 6: # Tek seferde en fazla 6 grubu analiz et
-                            break
-                            
-                        group_headlines = sorted([haber['title'] for haber in group])
-                        headlines_str = "".join(group_headlines)
-                        cache_key = f"analysis_{hashlib.md5(headlines_str.encode()).hexdigest()}.json"
-
-                        analysis_result = get_cached_data(
-                            cache_key,
-                            lambda g=group: generate_comparative_news_analysis(g),
-                            expiry_minutes=180 
-                        )
-                        
-                        if analysis_result:
-                            cached_haber_analizleri.extend(analysis_result)
-                            analiz_sayaci += 1
-                            time.sleep(5) # API sınırına takılmamak için 5 saniye bekle
-                
-
-                context['haber_analizleri'] = cached_haber_analizleri
-            
-            if context['haber_analizleri']:
-                print(f"✅ Toplam {len(context['haber_analizleri'])} adet olay analizi başarıyla oluşturuldu (önbellek kullanıldı).")
-            else:
-                print("⚠️ Analiz edilecek yeterli haber grubu bulunamadı veya analiz sırasında hata oluştu.")
-        # =================== DEĞİŞİKLİĞİN SONU ===================
 
+        def league_fixtures_stage(path, name):
+            # Her lig ayrı bir önbellek kaydıdır; yalnızca bayatlamış ligler yeniden kazınır.
+            def fetch_league_fixtures():
+                result = pool.run(web_scrapers.get_flashscore_sport_fixtures, path, name)
+                return result[1] if result else None
+            cache_key = f"fixtures_{path.replace('/', '_')}.json"
+            return lambda: get_cached_data(cache_key, fetch_league_fixtures, expiry_minutes=league_cache_minutes(name)) or []
+
+        league_stage_names = {name: f"fixtures:{name}" for _, name in config.SPORT_LEAGUES_CONFIG}
+        fixture_stages = [
+            Stage(league_stage_names[name], league_fixtures_stage(path, name))
+            for path, name in config.SPORT_LEAGUES_CONFIG
+        ]
+
+        # Her aşama, girdi olarak kullandığı aşamaları (deps) bildirir. Bağımsız aşamalar
+        # paralel çalışır; Gemini kotası "resource" ile sıraya sokulur, tarayıcıları ise havuz sınırlar.
+        stages = [
+            # --- Selenium ile çekilen ve önbelleğe alınan veriler ---
+            Stage("books", lambda: get_cached_data("books.json", lambda: pool.run(web_scrapers.fetch_books), expiry_minutes=120) or []),
+            Stage("ratings", lambda: get_cached_data("ratings.json", lambda: pool.run(web_scrapers.get_daily_ratings), expiry_minutes=180) or []),
+            Stage("zorlu_events", lambda: get_cached_data("zorlu_events.json", lambda: pool.run(web_scrapers.fetch_istanbul_events), expiry_minutes=60) or []),
+            *fixture_stages,
+            Stage("fixtures", lambda **leagues: {name: leagues[stage_name] or [] for name, stage_name in league_stage_names.items()}, deps=tuple(league_stage_names.values())),
+
+            # --- API ve Diğer Veriler (Önbellekli) ---
+            # API istekleri tek aşamada, http_client'ın ortak olay döngüsünde eşzamanlı çekilir;
+            # her kaynağın sonucu kendi adıyla ayrı bir aşama olarak sunulur.
+            Stage("api", fetch_api_data),
+            *[
+                Stage(name, lambda api, name=name: (api or {}).get(name) or API_SOURCES[name][4], deps=("api",))
+                for name in API_SOURCES
+            ],
+            Stage("istanbul_events", merge_istanbul_events, deps=("zorlu_events", "ticketmaster_events")),
+            Stage("twitter_trends", lambda: get_cached_data("trends.json", web_scrapers.get_trending_topics_trends24, expiry_minutes=10) or []),
+
+            # --- RSS Akışları (Genellikle önbelleksiz veya çok kısa süreli) ---
+            Stage("news", fetch_all_news),
+
+            # --- Yapay Zeka ile İçerik Üretimi (Önbellek Kontrolü Aktif) ---
+            Stage("weather_commentary", build_weather_commentary, deps=("weather",), resource="gemini"),
+            Stage("top_headlines", build_top_headlines, deps=("news",), resource="gemini"),
+            Stage("daily_briefing", build_daily_briefing, deps=("weather_commentary", "top_headlines", "exchange_rates"), resource="gemini"),
+            Stage("haber_analizleri", build_news_analyses, deps=("news",), resource="gemini"),
+        ]
+
+        results = run_stages(stages, max_workers=10, resource_limits={"gemini": 1})
+        web_scrapers.report_wait_timings()
+
+        context = {
+            name: value for name, value in results.items()
+            if name not in ("api", "zorlu_events", "ticketmaster_events") and not name.startswith("fixtures:")
+        }
         # Son güncelleme zamanını ekle
         context['last_update'] = datetime.now(config.TZ).strftime('%d %B %Y, %H:%M:%S')
 
         print("--- Tüm Veri Toplama ve İşleme Adımları Tamamlandı ---")
         return context
     finally:
-        if driver:
-            driver.quit()
-            print("✅ WebDriver kapatıldı.")
+        # Arka plan yenilemeleri tarayıcı havuzunu ve HTTP istemcisini kullanabilir; önce onlar biter.
+        cache_manager.wait_for_background_refreshes()
+        pool.close()
+        http_client.close()
+        cache_manager.report_cache_metrics()
+        try:
+            cache_manager.sweep()
+        except Exception as e:
+            print(f"⚠️ Önbellek temizliği başarısız: {e}")
+        cache_manager.close()
 
 
 # --- DÜZELTİLMİŞ ANA ÇALIŞTIRMA BLOĞU ---
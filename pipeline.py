@@ -0,0 +1,130 @@
+# pipeline.py
+"""
+Veri toplama adımlarını (stage) bağımlılık grafiği olarak çalıştıran küçük zamanlayıcı.
+
+Her aşama bir isim, bir fonksiyon ve girdi olarak kullandığı aşamaların isimlerini
+(deps) bildirir. Birbirinden bağımsız aşamalar paralel çalışır; bağımlı bir aşama,
+girdileri hazır olduğu anda başlar. Böylece toplam süre, tüm adımların toplamı
+yerine yaklaşık olarak en uzun bağımlılık zincirinin (kritik yol) süresine iner.
+"""
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# name: Aşamanın adı (sonuç sözlüğündeki anahtar)
+# func: Bağımlılıkların sonuçlarını isimli argüman olarak alan fonksiyon
+# deps: Girdi olarak kullanılan aşamaların isimleri
+# resource: Aynı anda sınırlı sayıda kullanılabilen paylaşımlı kaynak (örn. "gemini")
+Stage = namedtuple("Stage", ["name", "func", "deps", "resource"], defaults=((), None))
+
+
+def _validate_stages(stages):
+    """Aşama isimlerinin tekil olduğunu, bağımlılıkların var olduğunu ve döngü olmadığını kontrol eder."""
+    by_name = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Aşama iki kez tanımlanmış: {stage.name}")
+        by_name[stage.name] = stage
+
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"'{stage.name}' aşaması tanımsız bir aşamaya bağlı: {dep}")
+
+    # Kahn algoritması ile döngü kontrolü
+    remaining = {stage.name: set(stage.deps) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Aşamalar arasında döngüsel bağımlılık var: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return by_name
+
+
+def _critical_path(by_name, durations):
+    """Ölçülen sürelere göre en uzun bağımlılık zincirini (kritik yol) döndürür."""
+    finish = {}
+
+    def longest(name):
+        if name not in finish:
+            stage = by_name[name]
+            best_dep = max(stage.deps, key=lambda dep: longest(dep)[0], default=None)
+            base_time, base_path = longest(best_dep) if best_dep else (0.0, [])
+            finish[name] = (base_time + durations.get(name, 0.0), base_path + [name])
+        return finish[name]
+
+    return max((longest(name) for name in by_name), key=lambda item: item[0], default=(0.0, []))
+
+
+def run_stages(stages, max_workers=8, resource_limits=None):
+    """
+    Aşamaları bağımlılık sırasına uyarak mümkün olduğunca paralel çalıştırır.
+
+    Args:
+        stages (list): Stage nesnelerinin listesi. Hazır olan aşamalar bu listedeki
+                       sıraya göre başlatılır.
+        max_workers (int): Aynı anda çalışabilecek en fazla aşama sayısı.
+        resource_limits (dict): {"kaynak_adı": eşzamanlı_kullanım_sınırı}. Tanımlanmamış
+                                kaynaklar için sınır 1 kabul edilir.
+
+    Returns:
+        dict: {aşama_adı: sonuç}. Hata veren bir aşamanın sonucu None olur; ona bağlı
+              aşamalar yine de çalıştırılır ve girdi olarak None alır.
+    """
+    by_name = _validate_stages(stages)
+    resource_limits = resource_limits or {}
+    resources_in_use = {}
+
+    results = {}
+    durations = {}
+    pending = list(stages)
+    running = {}
+    started_at = time.time()
+
+    def run_one(stage):
+        inputs = {dep: results[dep] for dep in stage.deps}
+        stage_start = time.time()
+        try:
+            return stage.func(**inputs)
+        except Exception as e:
+            print(f"❌ '{stage.name}' aşamasında hata oluştu: {e}")
+            traceback.print_exc()
+            return None
+        finally:
+            durations[stage.name] = time.time() - stage_start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for stage in list(pending):
+                if any(dep not in results for dep in stage.deps):
+                    continue
+                if stage.resource:
+                    limit = resource_limits.get(stage.resource, 1)
+                    if resources_in_use.get(stage.resource, 0) >= limit:
+                        continue
+                    resources_in_use[stage.resource] = resources_in_use.get(stage.resource, 0) + 1
+                pending.remove(stage)
+                running[executor.submit(run_one, stage)] = stage
+
+            if not running:
+                # Doğrulamadan geçen bir grafikte buraya düşülmemeli.
+                raise RuntimeError(f"Çalıştırılabilir aşama kalmadı: {[stage.name for stage in pending]}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                results[stage.name] = future.result()
+                if stage.resource:
+                    resources_in_use[stage.resource] -= 1
+
+    total = time.time() - started_at
+    critical_time, critical_names = _critical_path(by_name, durations)
+    print("\n--- Aşama Süreleri ---")
+    for name, duration in sorted(durations.items(), key=lambda item: item[1], reverse=True):
+        print(f"⏱️  {name}: {duration:.2f} sn")
+    print(f"⏱️  Toplam: {total:.2f} sn | Kritik yol ({critical_time:.2f} sn): {' → '.join(critical_names)}")
+    return results